@@ -1,15 +1,30 @@
-import torch
-import torch.nn as nn
-import torch.nn.functional as F
 import numpy as np
-import pandas as pd
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
 import logging
 from datetime import datetime, timedelta
 import pickle
 import os
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
+import threading
+import warnings
+import ast
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+# torch and sklearn are imported lazily: the NumPy backend serves predictions without them
+from numpy_inference import (
+    NumpyHazardModel, FoldedHazardModel, fold_hazard_model, torch_model_params,
+    hazard_arrays, model_from_arrays
+)
+from model_bundle import BUNDLE_FILENAME, ModelBundle, write_bundle
+from model_registry import LazyModelRegistry, ResidentModel, ServingModels
+from prediction_cache import PredictionCache, parse_feature_resolutions
+from inference_dispatcher import MicroBatchDispatcher
+from feature_schema import HAZARD_FEATURE_INDEX, HAZARD_FEATURES, WEATHER_FEATURES, feature_matrix, hazard_features
+from rule_engine import hazard_rule_risk, rule_based_risk_matrix, rule_input, weather_columns
+from cascade import CASCADE_MIN_BATCH, CASCADE_MISS_RISK, CascadeScreen
+from training import LEARNING_RATE, TEST_SIZE, TrainingJobManager
 
 logger = logging.getLogger(__name__)
 
@@ -17,554 +32,953 @@ logger = logging.getLogger(__name__)
 EARTHQUAKE_RISK_MULTIPLIER: float = float(os.getenv('EARTHQUAKE_RISK_MULTIPLIER', '0.05'))
 ALLOW_EARTHQUAKE_PREDICTIONS: bool = os.getenv('ALLOW_EARTHQUAKE_PREDICTIONS', 'false').lower() == 'true'
 
-class DisasterPredictionModel(nn.Module):
-    """Base neural network for disaster prediction"""
-    
-    def __init__(self, input_size: int, hidden_size: int = 128, num_classes: int = 1):
-        super(DisasterPredictionModel, self).__init__()
-        self.fc1 = nn.Linear(input_size, hidden_size)
-        self.fc2 = nn.Linear(hidden_size, hidden_size // 2)
-        self.fc3 = nn.Linear(hidden_size // 2, hidden_size // 4)
-        self.fc4 = nn.Linear(hidden_size // 4, num_classes)
-        self.dropout = nn.Dropout(0.3)
-        self.batch_norm1 = nn.BatchNorm1d(hidden_size)
-        self.batch_norm2 = nn.BatchNorm1d(hidden_size // 2)
-        self.batch_norm3 = nn.BatchNorm1d(hidden_size // 4)
-    
-    def forward(self, x):
-        x = F.relu(self.batch_norm1(self.fc1(x)))
-        x = self.dropout(x)
-        x = F.relu(self.batch_norm2(self.fc2(x)))
-        x = self.dropout(x)
-        x = F.relu(self.batch_norm3(self.fc3(x)))
-        x = torch.sigmoid(self.fc4(x))
-        return x
-
-class FloodPredictionModel(DisasterPredictionModel):
-    """Specialized model for flood prediction"""
-    
-    def __init__(self):
-        # Input features: temperature, humidity, pressure, wind_speed, precipitation, visibility, cloud_cover
-        super().__init__(input_size=7, hidden_size=128, num_classes=1)
-    
-    def predict_flood_risk(self, weather_data: Dict) -> float:
-        """Predict flood risk based on weather data"""
-        features = torch.tensor([
-            weather_data['temperature'],
-            weather_data['humidity'],
-            weather_data['pressure'],
-            weather_data['wind_speed'],
-            weather_data['precipitation'],
-            weather_data['visibility'],
-            weather_data['cloud_cover']
-        ], dtype=torch.float32).unsqueeze(0)
-        
-        with torch.no_grad():
-            prediction = self.forward(features)
-            return prediction.item()
+# Inference backend: 'torch' (default) or 'numpy' (torch-free; torch is then only imported for training)
+AI_INFERENCE_BACKEND: str = os.getenv('AI_INFERENCE_BACKEND', 'torch').lower()
 
-class WildfirePredictionModel(DisasterPredictionModel):
-    """Specialized model for wildfire prediction"""
-    
-    def __init__(self):
-        # Input features: temperature, humidity, wind_speed, precipitation, visibility
-        super().__init__(input_size=5, hidden_size=128, num_classes=1)
-    
-    def predict_wildfire_risk(self, weather_data: Dict) -> float:
-        """Predict wildfire risk based on weather data"""
-        features = torch.tensor([
-            weather_data['temperature'],
-            weather_data['humidity'],
-            weather_data['wind_speed'],
-            weather_data['precipitation'],
-            weather_data['visibility']
-        ], dtype=torch.float32).unsqueeze(0)
-        
-        with torch.no_grad():
-            prediction = self.forward(features)
-            return prediction.item()
+# Compile models into folded affine graphs (scaler and BatchNorm folded into Linear weights)
+AI_FOLD_MODELS: bool = os.getenv('AI_FOLD_MODELS', 'true').lower() == 'true'
+# Maximum deviation from the unfolded model tolerated when compiling a folded graph
+FOLD_TOLERANCE: float = 1e-4
 
-class StormPredictionModel(DisasterPredictionModel):
-    """Specialized model for storm prediction"""
-    
-    def __init__(self):
-        # Input features: temperature, humidity, pressure, wind_speed, wind_direction, cloud_cover
-        super().__init__(input_size=6, hidden_size=128, num_classes=1)
-    
-    def predict_storm_risk(self, weather_data: Dict) -> float:
-        """Predict storm risk based on weather data"""
-        features = torch.tensor([
-            weather_data['temperature'],
-            weather_data['humidity'],
-            weather_data['pressure'],
-            weather_data['wind_speed'],
-            weather_data['wind_direction'],
-            weather_data['cloud_cover']
-        ], dtype=torch.float32).unsqueeze(0)
-        
-        with torch.no_grad():
-            prediction = self.forward(features)
-            return prediction.item()
+# Opt-in dynamic int8 quantized inference (needs torch); rejected if it deviates more than the tolerance
+AI_QUANTIZED_INFERENCE: bool = os.getenv('AI_QUANTIZED_INFERENCE', 'false').lower() == 'true'
+QUANTIZE_TOLERANCE: float = 0.02
 
-class EarthquakePredictionModel(DisasterPredictionModel):
-    """Specialized model for earthquake prediction"""
-    
-    def __init__(self):
-        # Input features: pressure, wind_speed, temperature, humidity, cloud_cover
-        super().__init__(input_size=5, hidden_size=128, num_classes=1)
-    
-    def predict_earthquake_risk(self, weather_data: Dict) -> float:
-        """Predict earthquake risk based on weather data"""
-        features = torch.tensor([
-            weather_data['pressure'],
-            weather_data['wind_speed'],
-            weather_data['temperature'],
-            weather_data['humidity'],
-            weather_data['cloud_cover']
-        ], dtype=torch.float32).unsqueeze(0)
-        
-        with torch.no_grad():
-            prediction = self.forward(features)
-            return prediction.item()
+# Serve from the single memory-mapped model bundle when present (default true)
+AI_MODEL_BUNDLE: bool = os.getenv('AI_MODEL_BUNDLE', 'true').lower() == 'true'
 
-class TornadoPredictionModel(DisasterPredictionModel):
-    """Specialized model for tornado prediction"""
-    
-    def __init__(self):
-        # Input features: temperature, humidity, pressure, wind_speed, wind_direction, cloud_cover
-        super().__init__(input_size=6, hidden_size=128, num_classes=1)
-    
-    def predict_tornado_risk(self, weather_data: Dict) -> float:
-        """Predict tornado risk based on weather data"""
-        features = torch.tensor([
-            weather_data['temperature'],
-            weather_data['humidity'],
-            weather_data['pressure'],
-            weather_data['wind_speed'],
-            weather_data['wind_direction'],
-            weather_data['cloud_cover']
-        ], dtype=torch.float32).unsqueeze(0)
-        
-        with torch.no_grad():
-            prediction = self.forward(features)
-            return prediction.item()
+# Lazy model registry: memory budget for resident models (0 = unlimited), optional preloading,
+# and comma-separated hazards that are never loaded (their risk comes from the rule-based estimate)
+AI_MODEL_MEMORY_BUDGET_MB: float = float(os.getenv('AI_MODEL_MEMORY_BUDGET_MB', '0'))
+AI_PRELOAD_MODELS: bool = os.getenv('AI_PRELOAD_MODELS', 'false').lower() == 'true'
+AI_DISABLED_HAZARDS: List[str] = [
+    h.strip().lower() for h in os.getenv('AI_DISABLED_HAZARDS', '').split(',') if h.strip()
+]
 
-class LandslidePredictionModel(DisasterPredictionModel):
-    """Specialized model for landslide prediction"""
-    
-    def __init__(self):
-        # Input features: temperature, humidity, precipitation, wind_speed, pressure
-        super().__init__(input_size=5, hidden_size=128, num_classes=1)
-    
-    def predict_landslide_risk(self, weather_data: Dict) -> float:
-        """Predict landslide risk based on weather data"""
-        features = torch.tensor([
-            weather_data['temperature'],
-            weather_data['humidity'],
-            weather_data['precipitation'],
-            weather_data['wind_speed'],
-            weather_data['pressure']
-        ], dtype=torch.float32).unsqueeze(0)
-        
-        with torch.no_grad():
-            prediction = self.forward(features)
-            return prediction.item()
+# Opt-in fused inference: evaluate all hazard heads in one batched call
+AI_FUSED_INFERENCE: bool = os.getenv('AI_FUSED_INFERENCE', 'false').lower() == 'true'
 
-class DroughtPredictionModel(DisasterPredictionModel):
-    """Specialized model for drought prediction"""
-    
-    def __init__(self):
-        # Input features: temperature, humidity, precipitation, wind_speed, pressure
-        super().__init__(input_size=5, hidden_size=128, num_classes=1)
-    
-    def predict_drought_risk(self, weather_data: Dict) -> float:
-        """Predict drought risk based on weather data"""
-        features = torch.tensor([
-            weather_data['temperature'],
-            weather_data['humidity'],
-            weather_data['precipitation'],
-            weather_data['wind_speed'],
-            weather_data['pressure']
-        ], dtype=torch.float32).unsqueeze(0)
-        
-        with torch.no_grad():
-            prediction = self.forward(features)
-            return prediction.item()
+# Train the hazard models concurrently in a process pool sized to the available cores
+AI_TRAIN_PARALLEL: bool = os.getenv('AI_TRAIN_PARALLEL', 'false').lower() == 'true'
+
+# Memoize predictions on weather features quantized to per-feature resolutions
+# (LRU capacity in records, 0 disables; resolutions override e.g. 'temperature=0.2,humidity=2')
+AI_PREDICTION_CACHE_SIZE: int = int(os.getenv('AI_PREDICTION_CACHE_SIZE', '4096'))
+AI_PREDICTION_CACHE_RESOLUTIONS: str = os.getenv('AI_PREDICTION_CACHE_RESOLUTIONS', '')
+
+# Opt-in micro-batching of concurrent single-record predictions: collect requests for up to the
+# window (ms) or the maximum batch size and score them with one batched call
+AI_MICROBATCHING: bool = os.getenv('AI_MICROBATCHING', 'false').lower() == 'true'
+AI_MICROBATCH_WINDOW_MS: float = float(os.getenv('AI_MICROBATCH_WINDOW_MS', '2'))
+AI_MICROBATCH_MAX_SIZE: int = int(os.getenv('AI_MICROBATCH_MAX_SIZE', '64'))
+# Longest wait (s) for a micro-batched prediction before the request scores its record directly
+AI_MICROBATCH_TIMEOUT: float = float(os.getenv('AI_MICROBATCH_TIMEOUT', '5'))
+
+# Opt-in cascade: a hazard's model only scores the records whose rule-based risk, with every input
+# moved by its margin towards higher risk, reaches the threshold; the others keep the rule-based risk.
+# Only hazards whose rules track the models are cascaded by default (see `python cascade.py`).
+# AI_CASCADE_AUDIT_RATE scores that fraction of screened-out records anyway to count misses.
+AI_CASCADE: bool = os.getenv('AI_CASCADE', 'false').lower() == 'true'
+AI_CASCADE_HAZARDS: List[str] = [
+    h.strip().lower() for h in os.getenv('AI_CASCADE_HAZARDS', 'storm,tornado').split(',') if h.strip()
+]
+AI_CASCADE_THRESHOLD: float = float(os.getenv('AI_CASCADE_THRESHOLD', '0.05'))
+AI_CASCADE_MARGINS: str = os.getenv('AI_CASCADE_MARGINS', '')
+AI_CASCADE_AUDIT_RATE: float = float(os.getenv('AI_CASCADE_AUDIT_RATE', '0'))
+
+# Opt-in Monte-Carlo dropout uncertainty on the prediction endpoints: AI_MC_SAMPLES stochastic passes
+# per record, run as one batch with dropout active and BatchNorm frozen; the interval covers the
+# central AI_MC_INTERVAL share of the samples
+AI_UNCERTAINTY: bool = os.getenv('AI_UNCERTAINTY', 'false').lower() == 'true'
+AI_MC_SAMPLES: int = int(os.getenv('AI_MC_SAMPLES', '32'))
+AI_MC_INTERVAL: float = float(os.getenv('AI_MC_INTERVAL', '0.9'))
+
+# Version of the synthetic data generator; bump whenever ranges or label formulas change
+SYNTHETIC_DATA_VERSION: int = 1
+# Samples per hazard drawn for training
+TRAINING_SAMPLES: int = 10000
+# Startup training: whether to retrain stale artifacts when the server starts, with how many epochs,
+# and the stored training fingerprint of the artifacts
+AI_AUTO_TRAIN_ON_STARTUP: bool = os.getenv('AI_AUTO_TRAIN_ON_STARTUP', 'true').lower() == 'true'
+STARTUP_TRAIN_EPOCHS: int = int(os.getenv('AI_STARTUP_TRAIN_EPOCHS', '30'))
+FINGERPRINT_FILENAME = 'training_fingerprint.json'
+
+# Uniform sampling range per feature for the synthetic training data
+SYNTHETIC_FEATURE_RANGES: Dict[str, Dict[str, Tuple[float, float]]] = {
+    'flood': {'temperature': (-10, 40), 'humidity': (20, 100), 'pressure': (900, 1100), 'wind_speed': (0, 50),
+              'precipitation': (0, 100), 'visibility': (0, 20), 'cloud_cover': (0, 100)},
+    'wildfire': {'temperature': (10, 50), 'humidity': (10, 80), 'wind_speed': (0, 40),
+                 'precipitation': (0, 20), 'visibility': (5, 25)},
+    'storm': {'temperature': (-20, 35), 'humidity': (30, 100), 'pressure': (850, 1050), 'wind_speed': (0, 60),
+              'wind_direction': (0, 360), 'cloud_cover': (20, 100)},
+    'earthquake': {'pressure': (900, 1100), 'wind_speed': (0, 30), 'temperature': (-10, 40),
+                   'humidity': (30, 100), 'cloud_cover': (0, 100)},
+    'tornado': {'temperature': (15, 35), 'humidity': (40, 90), 'pressure': (950, 1020), 'wind_speed': (0, 50),
+                'wind_direction': (0, 360), 'cloud_cover': (60, 100)},
+    'landslide': {'temperature': (-5, 35), 'humidity': (50, 100), 'precipitation': (0, 80),
+                  'wind_speed': (0, 25), 'pressure': (950, 1050)},
+    'drought': {'temperature': (20, 45), 'humidity': (10, 60), 'precipitation': (0, 15),
+                'wind_speed': (0, 20), 'pressure': (980, 1030)},
+}
+
+# Synthetic risk label per hazard (before clipping to 1.0), evaluated on whole feature columns
+SYNTHETIC_RISK_LABELS: Dict[str, Any] = {
+    # High precipitation + low visibility + high humidity
+    'flood': lambda c: (c['precipitation'] / 50) * (1 - c['visibility'] / 20) * (c['humidity'] / 100),
+    # High temp + low humidity + low precipitation
+    'wildfire': lambda c: (c['temperature'] / 50) * (1 - c['humidity'] / 100) * (1 - c['precipitation'] / 20),
+    # High wind + low pressure + high humidity
+    'storm': lambda c: (c['wind_speed'] / 60) * (1 - c['pressure'] / 1100) * (c['humidity'] / 100),
+    # Low pressure + moderate wind + stable conditions
+    'earthquake': lambda c: (1 - c['pressure'] / 1100) * (c['wind_speed'] / 30) * 0.3,
+    # High wind + low pressure + high humidity
+    'tornado': lambda c: (c['wind_speed'] / 50) * (1 - c['pressure'] / 1020) * (c['humidity'] / 90),
+    # High precipitation + moderate wind + stable temp
+    'landslide': lambda c: (c['precipitation'] / 80) * (c['wind_speed'] / 25) * 0.7,
+    # High temp + low humidity + low precipitation
+    'drought': lambda c: (c['temperature'] / 45) * (1 - c['humidity'] / 60) * (1 - c['precipitation'] / 15),
+}
+
+# PyTorch model class per hazard (resolved lazily from torch_models)
+TORCH_MODEL_CLASSES: Dict[str, str] = {
+    'flood': 'FloodPredictionModel',
+    'wildfire': 'WildfirePredictionModel',
+    'storm': 'StormPredictionModel',
+    'earthquake': 'EarthquakePredictionModel',
+    'tornado': 'TornadoPredictionModel',
+    'landslide': 'LandslidePredictionModel',
+    'drought': 'DroughtPredictionModel',
+}
 
 class DisasterPredictionService:
     """Service for AI-based disaster prediction"""
     
-    def __init__(self):
-        self.models = {}
-        self.scalers = {}
+    def __init__(self, model_path: Optional[str] = None, inference_backend: Optional[str] = None):
         # Use a path relative to this file to avoid CWD issues in deployments
-        self.model_path = os.path.join(os.path.dirname(__file__), "models")
+        self.model_path = model_path or os.path.join(os.path.dirname(__file__), "models")
+        self.inference_backend = (inference_backend or AI_INFERENCE_BACKEND).lower()
         # Feature flags
         self.allow_earthquake_predictions = ALLOW_EARTHQUAKE_PREDICTIONS
+        self.use_fused_model = AI_FUSED_INFERENCE
+        self.fold_models = AI_FOLD_MODELS
+        self.quantize_models = AI_QUANTIZED_INFERENCE
+        self.preload_models = AI_PRELOAD_MODELS
+        self.use_bundle = AI_MODEL_BUNDLE
+        self.last_training_report: Dict[str, Dict[str, Any]] = {}
+        # Disabled hazards are never materialized; earthquake is disabled unless predictions are allowed
+        self.disabled_hazards = set(AI_DISABLED_HAZARDS)
+        if not self.allow_earthquake_predictions:
+            self.disabled_hazards.add('earthquake')
+        # Models are loaded on first use and evicted LRU-first beyond the memory budget
+        self.memory_budget_bytes = int(AI_MODEL_MEMORY_BUDGET_MB * 1024 * 1024)
+        # Published models; predictions read this reference once, retraining replaces it as a whole
+        self.serving: Optional[ServingModels] = None
+        self._publish_lock = threading.Lock()
+        # One training run at a time: runs share the checkpoint files they start from and write to
+        self._training_lock = threading.Lock()
+        self.prediction_cache = PredictionCache(
+            WEATHER_FEATURES, AI_PREDICTION_CACHE_SIZE, parse_feature_resolutions(AI_PREDICTION_CACHE_RESOLUTIONS)
+        )
+        self.training_jobs = TrainingJobManager(self, list(HAZARD_FEATURES))
+        self.cascade: Optional[CascadeScreen] = None
+        if AI_CASCADE:
+            self.cascade = CascadeScreen(
+                AI_CASCADE_HAZARDS, AI_CASCADE_THRESHOLD, parse_feature_resolutions(AI_CASCADE_MARGINS),
+                AI_CASCADE_AUDIT_RATE
+            )
+        self.dispatcher: Optional[MicroBatchDispatcher] = None
+        if AI_MICROBATCHING:
+            self.dispatcher = MicroBatchDispatcher(
+                self.predict_disaster_risks_batch, AI_MICROBATCH_WINDOW_MS, AI_MICROBATCH_MAX_SIZE,
+                timeout=AI_MICROBATCH_TIMEOUT
+            )
         self.load_or_initialize_models()
-        # Optionally auto-train if scalers are missing
+
+    def training_fingerprint(self, batch_size: int = 256, num_samples: int = TRAINING_SAMPLES) -> Dict[str, Any]:
+        """Hash of everything that determines the trained artifacts: model architecture, training
+        config and synthetic data generator. Epochs are not part of it: training continues from the
+        saved weights, so the run length is not a property of the artifacts."""
+        components = {
+            'architecture': self._architecture_hash(),
+            'model_classes': TORCH_MODEL_CLASSES,
+            'hazard_features': HAZARD_FEATURES,
+            'training': {
+                'batch_size': batch_size,
+                'num_samples': num_samples,
+                'learning_rate': LEARNING_RATE,
+                'test_size': TEST_SIZE,
+            },
+            'data_generator': {
+                'version': SYNTHETIC_DATA_VERSION,
+                'feature_ranges': SYNTHETIC_FEATURE_RANGES,
+            },
+        }
+        encoded = json.dumps(components, sort_keys=True).encode('utf-8')
+        return {'fingerprint': hashlib.sha256(encoded).hexdigest(), 'components': components}
+
+    @staticmethod
+    def _architecture_hash(source: Optional[str] = None) -> str:
+        """Hash of the hazard network classes in torch_models (the TORCH_MODEL_CLASSES and the base
+        classes they inherit there), ignoring comments, docstrings and formatting. The rest of the
+        module, such as the fused inference model, does not affect the trained checkpoints."""
+        if source is None:
+            with open(os.path.join(os.path.dirname(__file__), 'torch_models.py')) as f:
+                source = f.read()
+        classes = {node.name: node for node in ast.parse(source).body if isinstance(node, ast.ClassDef)}
+        definitions: Dict[str, str] = {}
+        pending = list(TORCH_MODEL_CLASSES.values())
+        while pending:
+            name = pending.pop()
+            if name in definitions or name not in classes:
+                continue
+            for node in ast.walk(classes[name]):
+                body = getattr(node, 'body', None)
+                if isinstance(body, list) and body and isinstance(body[0], ast.Expr) \
+                        and isinstance(body[0].value, ast.Constant) and isinstance(body[0].value.value, str):
+                    node.body = body[1:] or [ast.Pass()]
+            definitions[name] = ast.dump(classes[name])
+            pending.extend(base.id for base in classes[name].bases if isinstance(base, ast.Name))
+        return hashlib.sha256(json.dumps(definitions, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def stored_fingerprint(self) -> Optional[str]:
+        """Fingerprint recorded when the current artifacts were trained, if any"""
         try:
-            need_scalers = len(self.scalers) < len(self.models)
-            auto_train = os.getenv('AI_AUTO_TRAIN_ON_STARTUP', 'true').lower() == 'true'
-            if need_scalers and auto_train:
-                logger.info("AI models: Missing scalers detected. Auto-training on startup...")
-                self.train_models(epochs=int(os.getenv('AI_STARTUP_TRAIN_EPOCHS', '30')))
+            with open(os.path.join(self.model_path, FINGERPRINT_FILENAME)) as f:
+                return json.load(f).get('fingerprint')
+        except (OSError, ValueError):
+            return None
+
+    def artifacts_current(self) -> bool:
+        """True if every enabled hazard has trained artifacts matching the current fingerprint"""
+        if not all(self._has_trained_artifacts(h) for h in self.enabled_hazards):
+            return False
+        return self.stored_fingerprint() == self.training_fingerprint()['fingerprint']
+
+    def train_on_startup(self, epochs: int = STARTUP_TRAIN_EPOCHS):
+        """Retrain in the background if the artifacts are missing or were trained with another
+        architecture, training config or data generator; the current artifacts are served meanwhile.
+        Called once by the serving process (app.py, gunicorn post_worker_init), not by the constructor:
+        spawned training workers re-import the app and must not start jobs of their own."""
+        if not AI_AUTO_TRAIN_ON_STARTUP or multiprocessing.parent_process() is not None:
+            return None
+        try:
+            return self.schedule_training_if_stale(epochs)
         except Exception as e:
             logger.error(f"Auto-train on startup failed: {e}")
+            return None
+
+    def schedule_training_if_stale(self, epochs: int = STARTUP_TRAIN_EPOCHS):
+        """Start a background training job unless the artifacts match the current fingerprint.
+        Returns the job, or None when the models can be served as they are."""
+        if self.artifacts_current():
+            logger.info("AI models: Artifacts match the training fingerprint, serving without retraining")
+            return None
+        job, created = self.training_jobs.submit(epochs=epochs)
+        if created:
+            logger.info(f"AI models: Artifacts missing or stale, training in background (job {job.job_id})")
+        return job
+
+    @property
+    def enabled_hazards(self) -> List[str]:
+        return [h for h in HAZARD_FEATURES if h not in self.disabled_hazards]
+
+    @property
+    def registry(self) -> LazyModelRegistry:
+        return self.serving.registry
+
+    @property
+    def bundle(self) -> Optional[ModelBundle]:
+        return self.serving.bundle if self.serving else None
+
+    @property
+    def fused_model(self):
+        return self.serving.fused_model if self.serving else None
+
+    @property
+    def models(self) -> Dict:
+        """Trained models currently resident in memory, keyed by hazard"""
+        return {h: e.model for h, e in self.registry.resident().items() if e.model is not None}
+
+    @property
+    def scalers(self) -> Dict:
+        """Scalers of the resident models, keyed by hazard"""
+        return {h: e.scaler for h, e in self.registry.resident().items() if e.scaler is not None}
+
+    @property
+    def compiled_models(self) -> Dict[str, FoldedHazardModel]:
+        """Folded inference graphs of the resident models, keyed by hazard"""
+        return {h: e.compiled for h, e in self.registry.resident().items() if e.compiled is not None}
+
+    def resident_models(self) -> Dict[str, Any]:
+        """Report which hazard models are materialized, their size and the registry counters"""
+        stats = self.registry.stats()
+        stats['enabled'] = self.enabled_hazards
+        stats['disabled'] = sorted(self.disabled_hazards)
+        return stats
     
-    def load_or_initialize_models(self):
-        """Load existing models or initialize new ones"""
+    def load_or_initialize_models(self, preload: bool = False):
+        """Open the model bundle and publish a fresh model registry for it.
+        Models load on first use unless preloading is enabled. The new models are
+        built (and preloaded) before a single reference swap publishes them, so
+        concurrent predictions see either the old or the new set, never a mix."""
         os.makedirs(self.model_path, exist_ok=True)
-        
-        # Initialize models
-        self.models['flood'] = FloodPredictionModel()
-        self.models['wildfire'] = WildfirePredictionModel()
-        self.models['storm'] = StormPredictionModel()
-        self.models['earthquake'] = EarthquakePredictionModel()
-        self.models['tornado'] = TornadoPredictionModel()
-        self.models['landslide'] = LandslidePredictionModel()
-        self.models['drought'] = DroughtPredictionModel()
-        
-        # Load pre-trained models if they exist
-        for disaster_type, model in self.models.items():
-            model_file = os.path.join(self.model_path, f"{disaster_type}_model.pth")
-            scaler_file = os.path.join(self.model_path, f"{disaster_type}_scaler.pkl")
-            
-            if os.path.exists(model_file):
-                try:
-                    model.load_state_dict(torch.load(model_file, map_location='cpu'))
-                    model.eval()
-                    logger.info(f"Loaded pre-trained {disaster_type} model")
-                except Exception as e:
-                    logger.error(f"Error loading {disaster_type} model: {e}")
-            
-            if os.path.exists(scaler_file):
-                try:
-                    with open(scaler_file, 'rb') as f:
-                        self.scalers[disaster_type] = pickle.load(f)
-                    logger.info(f"Loaded {disaster_type} scaler")
-                except Exception as e:
-                    logger.error(f"Error loading {disaster_type} scaler: {e}")
+        bundle = self._open_bundle() if self.use_bundle else None
+        if self.use_bundle and bundle is None and self._has_legacy_artifacts():
+            # Convert the per-hazard .pth/.pkl artifacts once; later startups skip torch.load and pickle
+            try:
+                self._convert_legacy_artifacts()
+                bundle = self._open_bundle()
+            except ImportError as e:
+                logger.warning(f"Cannot convert PyTorch artifacts to a model bundle ({e})")
+            except Exception as e:
+                logger.error(f"Error converting PyTorch artifacts to a model bundle: {e}")
+        registry = LazyModelRegistry(lambda h: self._load_hazard_model(h, bundle), self.memory_budget_bytes)
+
+        # The fused model needs every enabled head, so it implies preloading
+        if preload or self.preload_models or self.use_fused_model:
+            for disaster_type in self.enabled_hazards:
+                registry.get(disaster_type)
+        fused_model = self._build_fused_model(registry)
+
+        with self._publish_lock:
+            self.serving = ServingModels(registry=registry, bundle=bundle, fused_model=fused_model)
+            # Cached predictions came from the previous models
+            self.prediction_cache.invalidate()
+
+    def _bundle_file(self) -> str:
+        return os.path.join(self.model_path, BUNDLE_FILENAME)
+
+    def _open_bundle(self) -> Optional[ModelBundle]:
+        bundle_file = self._bundle_file()
+        if not os.path.exists(bundle_file):
+            return None
+        try:
+            bundle = ModelBundle(bundle_file)
+            logger.info(f"Opened model bundle with {len(bundle.hazards)} hazards")
+            return bundle
+        except Exception as e:
+            logger.error(f"Error opening model bundle {bundle_file}: {e}")
+            return None
+
+    def _has_legacy_artifacts(self, disaster_type: Optional[str] = None) -> bool:
+        hazards = [disaster_type] if disaster_type else list(HAZARD_FEATURES)
+        return any(
+            os.path.exists(os.path.join(self.model_path, f"{h}_model.pth"))
+            and os.path.exists(os.path.join(self.model_path, f"{h}_scaler.pkl"))
+            for h in hazards
+        )
+
+    def _has_trained_artifacts(self, disaster_type: str) -> bool:
+        if self.bundle is not None and disaster_type in self.bundle.hazards:
+            return True
+        return self._has_legacy_artifacts(disaster_type)
+
+    def _convert_legacy_artifacts(self):
+        """Write a model bundle from the per-hazard PyTorch weights and pickled scalers"""
+        models, scalers = {}, {}
+        for disaster_type in HAZARD_FEATURES:
+            model, scaler = self._load_torch_model(disaster_type)
+            if model is not None and scaler is not None:
+                models[disaster_type], scalers[disaster_type] = model, scaler
+        self._write_bundle(models, scalers)
+
+    def _write_bundle(self, models: Dict, scalers: Dict, fingerprint: Optional[Dict[str, Any]] = None):
+        hazards = {
+            disaster_type: hazard_arrays(torch_model_params(model), scalers[disaster_type])
+            for disaster_type, model in models.items()
+            if disaster_type in scalers
+        }
+        metadata = {'hazard_features': HAZARD_FEATURES}
+        if fingerprint is not None:
+            metadata['fingerprint'] = fingerprint['fingerprint']
+        write_bundle(self._bundle_file(), hazards, metadata=metadata)
+        logger.info(f"Wrote model bundle with {len(hazards)} hazards")
+
+    def _load_hazard_model(self, disaster_type: str, bundle: Optional[ModelBundle] = None) -> ResidentModel:
+        """Registry loader: materialize one hazard's model, scaler and folded graph"""
+        folded = None
+        if bundle is not None and disaster_type in bundle.hazards:
+            model, scaler, folded = self._load_bundle_model(disaster_type, bundle)
+        elif self.inference_backend == 'torch':
+            model, scaler = self._load_torch_model(disaster_type)
+        else:
+            model, scaler = None, None
+        if model is None or scaler is None:
+            return ResidentModel(model=None, scaler=None)
+        compiled = self._compile_model(disaster_type, model, scaler, folded)
+        quantized = self._quantize_model(disaster_type, compiled, scaler) if compiled is not None else None
+        return ResidentModel(model=model, scaler=scaler, compiled=compiled, quantized=quantized)
+
+    def _load_bundle_model(self, disaster_type: str, bundle: ModelBundle) -> Tuple[Any, Any, Optional[FoldedHazardModel]]:
+        """Build a hazard model from zero-copy views into the memory-mapped bundle.
+        With the torch backend the module's parameters and buffers are bound to the mapped pages
+        instead of being copied in by load_state_dict, so workers keep sharing one copy of the weights.
+        The mapping is read-only and torch.from_numpy warns about that; the warning is silenced because
+        the module is made inference-only (eval mode, no gradients, train() and load_state_dict() raise),
+        so nothing writes to those tensors."""
+        arrays = bundle.arrays(disaster_type)
+        model, scaler, folded = model_from_arrays(arrays)
+        if self.inference_backend == 'torch':
+            import torch
+            from torch_models import make_inference_only
+            torch_model = self._create_torch_model(disaster_type)
+            for key, value in torch_model.state_dict().items():
+                if key not in arrays:
+                    continue
+                if arrays[key].shape != tuple(value.shape):
+                    raise ValueError(f"Bundle array {key} has shape {arrays[key].shape}, expected {tuple(value.shape)}")
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', UserWarning)
+                    tensor = torch.from_numpy(arrays[key])
+                *path, name = key.split('.')
+                owner = torch_model.get_submodule('.'.join(path))
+                if isinstance(getattr(owner, name), torch.nn.Parameter):
+                    tensor = torch.nn.Parameter(tensor, requires_grad=False)
+                setattr(owner, name, tensor)
+            model = make_inference_only(torch_model)
+        logger.info(f"Loaded {disaster_type} model from bundle")
+        return model, scaler, folded
+
+    def _create_torch_model(self, disaster_type: str):
+        """Instantiate an untrained PyTorch model for a hazard"""
+        import torch_models
+        return getattr(torch_models, TORCH_MODEL_CLASSES[disaster_type])()
+
+    def _load_torch_weights(self, disaster_type: str, model) -> bool:
+        """Load pre-trained weights into model if they exist"""
+        import torch
+
+        model_file = os.path.join(self.model_path, f"{disaster_type}_model.pth")
+        if not os.path.exists(model_file):
+            return False
+        try:
+            model.load_state_dict(torch.load(model_file, map_location='cpu'))
+            model.eval()
+            logger.info(f"Loaded pre-trained {disaster_type} model")
+            return True
+        except Exception as e:
+            logger.error(f"Error loading {disaster_type} model: {e}")
+            return False
+
+    def _load_scaler(self, disaster_type: str):
+        scaler_file = os.path.join(self.model_path, f"{disaster_type}_scaler.pkl")
+        if not os.path.exists(scaler_file):
+            return None
+        try:
+            with open(scaler_file, 'rb') as f:
+                scaler = pickle.load(f)
+            logger.info(f"Loaded {disaster_type} scaler")
+            return scaler
+        except Exception as e:
+            logger.error(f"Error loading {disaster_type} scaler: {e}")
+            return None
+
+    def _load_torch_model(self, disaster_type: str) -> Tuple[Optional[Any], Optional[Any]]:
+        """Load a pre-trained PyTorch model and its pickled scaler; either is None if missing"""
+        model = self._create_torch_model(disaster_type)
+        if not self._load_torch_weights(disaster_type, model):
+            model = None
+        return model, self._load_scaler(disaster_type)
+
+    def _compile_model(self, disaster_type: str, model, scaler,
+                       folded: Optional[FoldedHazardModel] = None) -> Optional[FoldedHazardModel]:
+        """Compile a trained model into a folded inference graph over raw features,
+        or use the precomputed one from the bundle. The graph is checked against the
+        unfolded model before it is used."""
+        if not self.fold_models:
+            return None
+        try:
+            if folded is None:
+                numpy_model = model if isinstance(model, NumpyHazardModel) else NumpyHazardModel(torch_model_params(model))
+                folded = fold_hazard_model(numpy_model, scaler)
+            # Numerical-equivalence check on inputs drawn around the training distribution
+            probe = np.random.default_rng(0).normal(scaler.mean_, scaler.scale_ * 2, size=(256, len(scaler.mean_)))
+            reference = np.asarray(self._run_model(model, scaler.transform(probe)))
+            deviation = float(np.max(np.abs(folded.predict(probe) - reference)))
+            if deviation > FOLD_TOLERANCE:
+                logger.warning(f"Folded {disaster_type} model deviates by {deviation:.2e}, keeping unfolded model")
+                return None
+            return folded
+        except Exception as e:
+            logger.error(f"Error compiling folded {disaster_type} model: {e}")
+            return None
+
+    def _quantize_model(self, disaster_type: str, compiled: FoldedHazardModel, scaler):
+        """int8 version of a folded graph, or None if disabled, unavailable or not accurate enough"""
+        if not self.quantize_models:
+            return None
+        try:
+            from quantized_inference import QuantizedHazardModel
+            quantized = QuantizedHazardModel(compiled, scaler)
+            probe = np.random.default_rng(0).normal(scaler.mean_, scaler.scale_ * 2, size=(256, len(scaler.mean_)))
+            deviation = float(np.max(np.abs(quantized.predict(probe) - compiled.predict(probe))))
+            if deviation > QUANTIZE_TOLERANCE:
+                logger.warning(f"int8 {disaster_type} model deviates by {deviation:.2e}, keeping float32 model")
+                return None
+            return quantized
+        except ImportError as e:
+            logger.warning(f"Quantized inference needs PyTorch ({e}), keeping float32 {disaster_type} model")
+            return None
+        except Exception as e:
+            logger.error(f"Error quantizing {disaster_type} model: {e}")
+            return None
+
+    def _build_fused_model(self, registry: LazyModelRegistry):
+        """Build the fused multi-head model from the enabled trained models, or None"""
+        if not self.use_fused_model or self.inference_backend != 'torch':
+            return None
+        try:
+            from torch_models import FusedHazardModel
+            entries = {h: registry.get(h) for h in self.enabled_hazards}
+            entries = {h: e for h, e in entries.items() if e.model is not None}
+            fused_model = FusedHazardModel(
+                {h: e.model for h, e in entries.items()},
+                {h: e.scaler for h, e in entries.items()},
+                WEATHER_FEATURES,
+                HAZARD_FEATURES
+            )
+            fused_model.eval()
+            logger.info(f"Built fused model for {len(fused_model.hazards)} hazards")
+            return fused_model
+        except Exception as e:
+            logger.error(f"Error building fused model, using per-hazard models: {e}")
+            return None
     
-    def save_models(self):
-        """Save trained models"""
-        for disaster_type, model in self.models.items():
+    def save_models(self, models: Optional[Dict] = None, scalers: Optional[Dict] = None,
+                    fingerprint: Optional[Dict[str, Any]] = None):
+        """Save trained PyTorch models and scalers, and atomically rewrite the model bundle.
+        The .pth/.pkl files are kept as training checkpoints; serving loads the bundle.
+        The training fingerprint, if given, is stored with them."""
+        import torch
+
+        models = self.models if models is None else models
+        scalers = self.scalers if scalers is None else scalers
+        for disaster_type, model in models.items():
             model_file = os.path.join(self.model_path, f"{disaster_type}_model.pth")
             scaler_file = os.path.join(self.model_path, f"{disaster_type}_scaler.pkl")
             
             torch.save(model.state_dict(), model_file)
-            if disaster_type in self.scalers:
+            if disaster_type in scalers:
                 with open(scaler_file, 'wb') as f:
-                    pickle.dump(self.scalers[disaster_type], f)
+                    pickle.dump(scalers[disaster_type], f)
             
             logger.info(f"Saved {disaster_type} model and scaler")
+        if self.use_bundle:
+            self._write_bundle(models, scalers, fingerprint)
+        if fingerprint is not None:
+            self._write_fingerprint(fingerprint)
+
+    def _write_fingerprint(self, fingerprint: Dict[str, Any]):
+        fingerprint_file = os.path.join(self.model_path, FINGERPRINT_FILENAME)
+        tmp_file = f"{fingerprint_file}.tmp{os.getpid()}"
+        with open(tmp_file, 'w') as f:
+            json.dump(dict(fingerprint, trained_at=datetime.now().isoformat()), f, indent=2, sort_keys=True)
+        os.replace(tmp_file, fingerprint_file)
     
-    def generate_synthetic_training_data(self, num_samples: int = 10000) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
-        """Generate synthetic training data for model training"""
+    def generate_synthetic_training_data(self, num_samples: int = 10000,
+                                         rng: Optional[np.random.Generator] = None) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Generate synthetic training data for model training.
+        Each hazard's columns are drawn in one call and labelled with array expressions;
+        pass a seeded rng for reproducible data."""
+        rng = rng if rng is not None else np.random.default_rng()
         training_data = {}
-        
-        # Flood training data
-        flood_features = []
-        flood_labels = []
-        for _ in range(num_samples):
-            # Generate realistic weather data
-            temp = np.random.uniform(-10, 40)
-            humidity = np.random.uniform(20, 100)
-            pressure = np.random.uniform(900, 1100)
-            wind_speed = np.random.uniform(0, 50)
-            precipitation = np.random.uniform(0, 100)
-            visibility = np.random.uniform(0, 20)
-            cloud_cover = np.random.uniform(0, 100)
-            
-            features = [temp, humidity, pressure, wind_speed, precipitation, visibility, cloud_cover]
-            flood_features.append(features)
-            
-            # Calculate flood risk (high precipitation + low visibility + high humidity)
-            flood_risk = min(1.0, (precipitation / 50) * (1 - visibility / 20) * (humidity / 100))
-            flood_labels.append(flood_risk)
-        
-        training_data['flood'] = (np.array(flood_features), np.array(flood_labels))
-        
-        # Wildfire training data
-        wildfire_features = []
-        wildfire_labels = []
-        for _ in range(num_samples):
-            temp = np.random.uniform(10, 50)
-            humidity = np.random.uniform(10, 80)
-            wind_speed = np.random.uniform(0, 40)
-            precipitation = np.random.uniform(0, 20)
-            visibility = np.random.uniform(5, 25)
-            
-            features = [temp, humidity, wind_speed, precipitation, visibility]
-            wildfire_features.append(features)
-            
-            # Calculate wildfire risk (high temp + low humidity + low precipitation)
-            wildfire_risk = min(1.0, (temp / 50) * (1 - humidity / 100) * (1 - precipitation / 20))
-            wildfire_labels.append(wildfire_risk)
-        
-        training_data['wildfire'] = (np.array(wildfire_features), np.array(wildfire_labels))
-        
-        # Storm training data
-        storm_features = []
-        storm_labels = []
-        for _ in range(num_samples):
-            temp = np.random.uniform(-20, 35)
-            humidity = np.random.uniform(30, 100)
-            pressure = np.random.uniform(850, 1050)
-            wind_speed = np.random.uniform(0, 60)
-            wind_direction = np.random.uniform(0, 360)
-            cloud_cover = np.random.uniform(20, 100)
-            
-            features = [temp, humidity, pressure, wind_speed, wind_direction, cloud_cover]
-            storm_features.append(features)
-            
-            # Calculate storm risk (high wind + low pressure + high humidity)
-            storm_risk = min(1.0, (wind_speed / 60) * (1 - pressure / 1100) * (humidity / 100))
-            storm_labels.append(storm_risk)
-        
-        training_data['storm'] = (np.array(storm_features), np.array(storm_labels))
-        
-        # Earthquake training data
-        earthquake_features = []
-        earthquake_labels = []
-        for _ in range(num_samples):
-            pressure = np.random.uniform(900, 1100)
-            wind_speed = np.random.uniform(0, 30)
-            temp = np.random.uniform(-10, 40)
-            humidity = np.random.uniform(30, 100)
-            cloud_cover = np.random.uniform(0, 100)
-            
-            features = [pressure, wind_speed, temp, humidity, cloud_cover]
-            earthquake_features.append(features)
-            
-            # Calculate earthquake risk (low pressure + moderate wind + stable conditions)
-            earthquake_risk = min(1.0, (1 - pressure / 1100) * (wind_speed / 30) * 0.3)
-            earthquake_labels.append(earthquake_risk)
-        
-        training_data['earthquake'] = (np.array(earthquake_features), np.array(earthquake_labels))
-        
-        # Tornado training data
-        tornado_features = []
-        tornado_labels = []
-        for _ in range(num_samples):
-            temp = np.random.uniform(15, 35)
-            humidity = np.random.uniform(40, 90)
-            pressure = np.random.uniform(950, 1020)
-            wind_speed = np.random.uniform(0, 50)
-            wind_direction = np.random.uniform(0, 360)
-            cloud_cover = np.random.uniform(60, 100)
-            
-            features = [temp, humidity, pressure, wind_speed, wind_direction, cloud_cover]
-            tornado_features.append(features)
-            
-            # Calculate tornado risk (high wind + low pressure + high humidity)
-            tornado_risk = min(1.0, (wind_speed / 50) * (1 - pressure / 1020) * (humidity / 90))
-            tornado_labels.append(tornado_risk)
-        
-        training_data['tornado'] = (np.array(tornado_features), np.array(tornado_labels))
-        
-        # Landslide training data
-        landslide_features = []
-        landslide_labels = []
-        for _ in range(num_samples):
-            temp = np.random.uniform(-5, 35)
-            humidity = np.random.uniform(50, 100)
-            precipitation = np.random.uniform(0, 80)
-            wind_speed = np.random.uniform(0, 25)
-            pressure = np.random.uniform(950, 1050)
-            
-            features = [temp, humidity, precipitation, wind_speed, pressure]
-            landslide_features.append(features)
-            
-            # Calculate landslide risk (high precipitation + moderate wind + stable temp)
-            landslide_risk = min(1.0, (precipitation / 80) * (wind_speed / 25) * 0.7)
-            landslide_labels.append(landslide_risk)
-        
-        training_data['landslide'] = (np.array(landslide_features), np.array(landslide_labels))
-        
-        # Drought training data
-        drought_features = []
-        drought_labels = []
-        for _ in range(num_samples):
-            temp = np.random.uniform(20, 45)
-            humidity = np.random.uniform(10, 60)
-            precipitation = np.random.uniform(0, 15)
-            wind_speed = np.random.uniform(0, 20)
-            pressure = np.random.uniform(980, 1030)
-            
-            features = [temp, humidity, precipitation, wind_speed, pressure]
-            drought_features.append(features)
-            
-            # Calculate drought risk (high temp + low humidity + low precipitation)
-            drought_risk = min(1.0, (temp / 45) * (1 - humidity / 60) * (1 - precipitation / 15))
-            drought_labels.append(drought_risk)
-        
-        training_data['drought'] = (np.array(drought_features), np.array(drought_labels))
-        
+        for disaster_type, ranges in SYNTHETIC_FEATURE_RANGES.items():
+            columns = HAZARD_FEATURES[disaster_type]
+            low = np.array([ranges[column][0] for column in columns], dtype=np.float64)
+            high = np.array([ranges[column][1] for column in columns], dtype=np.float64)
+            features = rng.uniform(low, high, size=(num_samples, len(columns)))
+            values = dict(zip(columns, features.T))
+            labels = np.minimum(1.0, SYNTHETIC_RISK_LABELS[disaster_type](values))
+            training_data[disaster_type] = (features, labels)
         return training_data
     
-    def train_models(self, epochs: int = 100, batch_size: int = 32):
-        """Train all disaster prediction models"""
-        training_data = self.generate_synthetic_training_data()
-        
-        for disaster_type, (features, labels) in training_data.items():
-            logger.info(f"Training {disaster_type} model...")
-            
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(
-                features, labels, test_size=0.2, random_state=42
-            )
-            
-            # Scale features
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
-            
-            self.scalers[disaster_type] = scaler
-            
-            # Convert to tensors
-            X_train_tensor = torch.FloatTensor(X_train_scaled)
-            y_train_tensor = torch.FloatTensor(y_train).unsqueeze(1)
-            X_test_tensor = torch.FloatTensor(X_test_scaled)
-            y_test_tensor = torch.FloatTensor(y_test).unsqueeze(1)
-            
-            # Training setup
-            model = self.models[disaster_type]
-            criterion = nn.BCELoss()
-            optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
-            
-            # Training loop
-            model.train()
-            for epoch in range(epochs):
-                optimizer.zero_grad()
-                outputs = model(X_train_tensor)
-                loss = criterion(outputs, y_train_tensor)
-                loss.backward()
-                optimizer.step()
-                
-                if (epoch + 1) % 20 == 0:
-                    logger.info(f"Epoch [{epoch+1}/{epochs}], Loss: {loss.item():.4f}")
-            
-            # Evaluate
+    def train_models(self, epochs: int = 100, batch_size: int = 256, parallel: Optional[bool] = None,
+                     seed: Optional[int] = None,
+                     progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
+        """Train all disaster prediction models with shuffled mini-batches.
+        With parallel (default AI_TRAIN_PARALLEL) the hazards train concurrently in a process pool.
+        progress is called with each hazard's report as it finishes.
+        Returns per-hazard wall time, throughput and final loss."""
+        with self._training_lock:
+            return self._train_models(epochs, batch_size, parallel, seed, progress)
+
+    def _train_models(self, epochs: int, batch_size: int, parallel: Optional[bool], seed: Optional[int],
+                      progress: Optional[Callable[[str, Dict[str, Any]], None]]) -> Dict[str, Dict[str, Any]]:
+        from training import eventlet_patched, run_blocking, train_all
+
+        # Train copies of the PyTorch models (continuing from saved weights) so serving models stay untouched,
+        # even when serving with the NumPy backend
+        initial_states = {}
+        for disaster_type in HAZARD_FEATURES:
+            model = self._create_torch_model(disaster_type)
+            initial_states[disaster_type] = model.state_dict() if self._load_torch_weights(disaster_type, model) else None
+        training_data = self.generate_synthetic_training_data(TRAINING_SAMPLES, rng=np.random.default_rng(seed))
+
+        tasks = {
+            disaster_type: (TORCH_MODEL_CLASSES[disaster_type], initial_states[disaster_type],
+                            features, labels, epochs, batch_size, seed)
+            for disaster_type, (features, labels) in training_data.items()
+        }
+        parallel = AI_TRAIN_PARALLEL if parallel is None else parallel
+        if parallel and eventlet_patched():
+            # The process pool hangs on eventlet's patched sockets and locks
+            logger.warning("AI_TRAIN_PARALLEL is not supported under eventlet, training in-process")
+            parallel = False
+        logger.info(f"Training {len(tasks)} models ({'process pool' if parallel else 'in-process'}, "
+                    f"{epochs} epochs, batch size {batch_size})...")
+        # Off the eventlet hub: training holds the CPU for the whole run
+        results = run_blocking(
+            train_all, tasks, parallel=parallel,
+            on_result=(lambda disaster_type, result: progress(disaster_type, result['report'])) if progress else None
+        )
+
+        models, scalers, report = {}, {}, {}
+        for disaster_type, result in results.items():
+            model = self._create_torch_model(disaster_type)
+            model.load_state_dict(result['state_dict'])
             model.eval()
-            with torch.no_grad():
-                test_outputs = model(X_test_tensor)
-                test_loss = criterion(test_outputs, y_test_tensor)
-                logger.info(f"{disaster_type} model test loss: {test_loss.item():.4f}")
-        
-        # Save trained models
-        self.save_models()
+            models[disaster_type] = model
+            scalers[disaster_type] = result['scaler']
+            report[disaster_type] = result['report']
+            logger.info(
+                f"{disaster_type} model: {result['report']['wall_time_s']:.2f}s, "
+                f"{result['report']['samples_per_s']:.0f} samples/s, final loss {result['report']['final_loss']:.4f}"
+            )
+        self.last_training_report = report
+
+        # Save trained models, then publish them; they are preloaded so the swap adds no first-use latency
+        self.save_models(models, scalers, fingerprint=self.training_fingerprint(batch_size, TRAINING_SAMPLES))
+        self.load_or_initialize_models(preload=True)
         logger.info("All models trained and saved successfully")
+        return report
     
-    def predict_disaster_risks(self, weather_data: Dict) -> Dict[str, float]:
-        """Predict risks for all disaster types"""
-        predictions = {}
-        
-        # Scale weather data for each model
-        for disaster_type, model in self.models.items():
-            if disaster_type not in self.scalers:
+    def predict_disaster_risks(self, weather_data: Any) -> Dict[str, float]:
+        """Predict risks for all disaster types from a feature dict or a WeatherData object.
+        With micro-batching, cache misses are scored together with concurrent requests."""
+        if self.dispatcher is None:
+            return self.predict_disaster_risks_batch([weather_data])[0]
+        key = self.prediction_cache.key(weather_data) if self.prediction_cache.enabled else None
+        if key is not None:
+            cached = self.prediction_cache.get(key, count_miss=False)
+            if cached is not None:
+                return cached
+        try:
+            return self.dispatcher.predict(weather_data)
+        except FuturesTimeoutError:
+            logger.warning(f"Micro-batched prediction timed out after {self.dispatcher.timeout}s, scoring directly")
+            return self.predict_disaster_risks_batch([weather_data])[0]
+
+    def predict_disaster_risks_batch(self, weather_records: List[Any]) -> List[Dict[str, float]]:
+        """Predict risks for all disaster types for many locations (feature dicts or WeatherData) at once.
+        Records whose quantized features are cached are served from the prediction cache;
+        the rest are scored together."""
+        if not weather_records:
+            return []
+        cache = self.prediction_cache
+        if not cache.enabled:
+            return self._predict_batch(weather_records)
+
+        generation = cache.generation
+        predictions: List[Optional[Dict[str, float]]] = [None] * len(weather_records)
+        # Misses to score, grouped by key so records that share one are scored once
+        pending: Dict[Optional[tuple], List[int]] = {}
+        uncacheable: List[int] = []
+        for i, record in enumerate(weather_records):
+            key = cache.key(record)
+            if key is None:
+                uncacheable.append(i)
+            elif key in pending:
+                pending[key].append(i)
+            else:
+                predictions[i] = cache.get(key)
+                if predictions[i] is None:
+                    pending[key] = [i]
+
+        groups = list(pending.items()) + [(None, [i]) for i in uncacheable]
+        if groups:
+            scored = self._predict_batch([weather_records[indices[0]] for _, indices in groups])
+            for (key, indices), record_predictions in zip(groups, scored):
+                if key is not None:
+                    cache.put(key, record_predictions, generation)
+                for i in indices:
+                    predictions[i] = dict(record_predictions)
+        return predictions
+
+    def risk_timeline(self, weather_records: List[Dict[str, float]], times: List[Any]) -> Dict[str, Any]:
+        """Score every forecast step for all hazards in one batched call.
+        Returns the step times and, per hazard, the risk series, the peak risk and the time of the peak."""
+        if not weather_records:
+            return {'times': [], 'hazards': {}}
+        predictions = self.predict_disaster_risks_batch(weather_records)
+        hazards = list(predictions[0])
+        risks = np.array([[p[h] for h in hazards] for p in predictions], dtype=np.float64)
+        peaks = risks.argmax(axis=0)
+        return {
+            'times': list(times),
+            'hazards': {
+                disaster_type: {
+                    'series': risks[:, i].tolist(),
+                    'peak': float(risks[peaks[i], i]),
+                    'peak_time': times[peaks[i]],
+                }
+                for i, disaster_type in enumerate(hazards)
+            },
+        }
+
+    def predict_uncertainty_batch(self, weather_records: List[Any], num_samples: int = AI_MC_SAMPLES,
+                                  interval: float = AI_MC_INTERVAL,
+                                  seed: Optional[int] = None) -> List[Dict[str, Optional[Dict[str, float]]]]:
+        """Monte-Carlo dropout uncertainty for every hazard and record (feature dicts or WeatherData).
+        Each hazard model runs num_samples stochastic passes over the batch in one forward call.
+        Per record and hazard: sample mean and standard deviation, the central interval holding
+        `interval` of the samples, and a confidence of 1 - interval width. Hazards served by the
+        rule-based estimate have no model to sample and map to None. The prediction cache and cascade are bypassed."""
+        results: List[Dict[str, Optional[Dict[str, float]]]] = [{} for _ in weather_records]
+        if not weather_records:
+            return results
+        serving = self.serving
+        rng = np.random.default_rng(seed)
+        features = feature_matrix(weather_records)
+        incomplete = np.isnan(features)
+        hazards = list(HAZARD_FEATURES)
+        # (hazards, num_samples, records); summarized with one call per statistic
+        samples = np.zeros((len(hazards), num_samples, len(weather_records)))
+        # (hazards, records): whether the hazard's model was sampled for the record
+        sampled = np.zeros((len(hazards), len(weather_records)), dtype=bool)
+        for h, disaster_type in enumerate(hazards):
+            # Only records with every input of the hazard's model can be sampled
+            rows = np.flatnonzero(~incomplete[:, HAZARD_FEATURE_INDEX[disaster_type]].any(axis=1))
+            if disaster_type in self.disabled_hazards or not len(rows):
+                continue
+            entry = serving.registry.get(disaster_type)
+            if entry.model is None or entry.scaler is None:
+                continue
+            try:
+                samples[h][:, rows] = self._sample_hazard(disaster_type, entry, features[rows], num_samples, rng)
+                sampled[h, rows] = True
+            except Exception as e:
+                logger.error(f"Uncertainty sampling failure for {disaster_type}: {e}")
+        if not self.allow_earthquake_predictions:
+            earthquake = hazards.index('earthquake')
+            samples[earthquake] = np.clip(samples[earthquake] * EARTHQUAKE_RISK_MULTIPLIER, 0.0, 0.05)
+
+        tail = (1.0 - interval) / 2.0
+        lower, upper = np.quantile(samples, [tail, 1.0 - tail], axis=1)
+        summary = zip(samples.mean(axis=1).T.tolist(), samples.std(axis=1).T.tolist(), lower.T.tolist(),
+                      upper.T.tolist(), sampled.T.tolist())
+        for record_results, statistics in zip(results, summary):
+            for disaster_type, mean, std, low, high, from_model in zip(hazards, *statistics):
+                record_results[disaster_type] = {
+                    'mean': mean, 'std': std, 'lower': low, 'upper': high,
+                    'confidence': max(0.0, 1.0 - (high - low)),
+                } if from_model else None
+        return results
+
+    def predict_uncertainty(self, weather_data: Any, **kwargs) -> Dict[str, Optional[Dict[str, float]]]:
+        """Monte-Carlo dropout uncertainty of every hazard for one record"""
+        return self.predict_uncertainty_batch([weather_data], **kwargs)[0]
+
+    def prediction_cache_stats(self) -> Dict[str, Any]:
+        return self.prediction_cache.stats()
+
+    def cascade_stats(self) -> Dict[str, Any]:
+        """Per-hazard screen-out and audit counters of the cascade pre-screen"""
+        if self.cascade is None:
+            return {'enabled': False}
+        return dict(self.cascade.stats(), enabled=True)
+
+    def dispatcher_stats(self) -> Dict[str, Any]:
+        """Queue depth and batch-size metrics of the micro-batching dispatcher"""
+        if self.dispatcher is None:
+            return {'enabled': False}
+        return dict(self.dispatcher.stats(), enabled=True)
+
+    def _predict_batch(self, weather_records: List[Any], cascade: bool = True) -> List[Dict[str, float]]:
+        """Score a batch with the models, bypassing the prediction cache.
+        Each hazard model scores the whole batch (or, in cascade mode, the records the rule screen
+        could not clear) in a single scaler call and forward pass. Records may be feature dicts or
+        WeatherData objects; they are converted once into one feature matrix shared by every hazard."""
+        predictions: List[Dict[str, float]] = [{} for _ in weather_records]
+        # One consistent model set for the whole batch, even if retraining publishes a new one meanwhile
+        serving = self.serving
+
+        features = feature_matrix(weather_records)
+        num_records = len(weather_records)
+        # Per record, the features it lacks: only those records fall back to the rules, hazard by hazard
+        incomplete = np.isnan(features)
+        complete = ~incomplete.any(axis=1)
+
+        rule_columns: Optional[Dict[str, np.ndarray]] = None
+
+        def rule_based(disaster_type: str) -> List[float]:
+            # Rule input columns are built once per batch, on first use
+            nonlocal rule_columns
+            if rule_columns is None:
+                rule_columns = weather_columns(weather_records)
+            return hazard_rule_risk(disaster_type, rule_columns, num_points=num_records).tolist()
+
+        # Cascade: per hazard, the records whose relaxed rule-based risk reaches the screen threshold
+        screen: Dict[str, np.ndarray] = {}
+        if cascade and self.cascade is not None and num_records >= CASCADE_MIN_BATCH:
+            rule_columns = weather_columns(weather_records)
+            screen = self.cascade.screen(rule_columns)
+
+        # The fused model scores the records that have every feature; None when that is the whole batch
+        fused_scores: Dict[str, List[float]] = {}
+        fused_rows: Optional[np.ndarray] = None if complete.all() else np.flatnonzero(complete)
+        if serving.fused_model is not None and complete.any():
+            try:
+                fused_scores = self._predict_fused(
+                    serving.fused_model, features if fused_rows is None else features[fused_rows]
+                )
+            except Exception as e:
+                logger.error(f"Fused prediction failure, using per-hazard models: {e}")
+
+        for disaster_type in HAZARD_FEATURES:
+            # Records with every input of this hazard's model; the others keep the rule-based estimate
+            model_mask = ~incomplete[:, HAZARD_FEATURE_INDEX[disaster_type]].any(axis=1)
+            scores: Optional[List[float]] = None
+            if disaster_type in fused_scores:
+                if fused_rows is None:
+                    for record_predictions, score in zip(predictions, fused_scores[disaster_type]):
+                        record_predictions[disaster_type] = float(score)
+                    continue
+                scores = rule_based(disaster_type)
+                for i, score in zip(fused_rows.tolist(), fused_scores[disaster_type]):
+                    scores[i] = score
+                # Records with this hazard's inputs but not every feature still go through its own model
+                model_mask &= ~complete
+
+            if disaster_type in self.disabled_hazards:
+                # Disabled hazards are never materialized
+                for record_predictions, score in zip(predictions, rule_based(disaster_type)):
+                    record_predictions[disaster_type] = score
+                continue
+
+            if not model_mask.all():
+                logger.debug(f"{int((~model_mask).sum())} records lack inputs of the {disaster_type} model")
+
+            needs_model = screen.get(disaster_type)
+            audit_rows = np.empty(0, dtype=np.intp)
+            if needs_model is not None:
+                audit_rows = self.cascade.audit_sample(needs_model)
+                audit_rows = audit_rows[model_mask[audit_rows]]
+                model_mask &= needs_model
+            rows = np.flatnonzero(model_mask)
+            if not len(rows) and not len(audit_rows):
+                # Nothing left for the model: it is not even loaded
+                if needs_model is not None:
+                    self.cascade.record(disaster_type, num_records, num_records - int(needs_model.sum()))
+                for record_predictions, score in zip(predictions, scores or rule_based(disaster_type)):
+                    record_predictions[disaster_type] = float(score)
+                continue
+
+            entry = serving.registry.get(disaster_type)
+            if entry.model is None or entry.scaler is None:
                 # Fallback to rule-based estimate to avoid missing predictions in production
-                logger.warning(f"No scaler found for {disaster_type}, using rule-based fallback")
-                predictions[disaster_type] = self._rule_based_risk(disaster_type, weather_data)
+                logger.warning(f"No trained model or scaler found for {disaster_type}, using rule-based fallback")
+                for record_predictions, score in zip(predictions, rule_based(disaster_type)):
+                    record_predictions[disaster_type] = score
                 continue
-            
-            # Prepare features based on disaster type
-            if disaster_type == 'flood':
-                features = [
-                    weather_data['temperature'],
-                    weather_data['humidity'],
-                    weather_data['pressure'],
-                    weather_data['wind_speed'],
-                    weather_data['precipitation'],
-                    weather_data['visibility'],
-                    weather_data['cloud_cover']
-                ]
-            elif disaster_type == 'wildfire':
-                features = [
-                    weather_data['temperature'],
-                    weather_data['humidity'],
-                    weather_data['wind_speed'],
-                    weather_data['precipitation'],
-                    weather_data['visibility']
-                ]
-            elif disaster_type == 'storm':
-                features = [
-                    weather_data['temperature'],
-                    weather_data['humidity'],
-                    weather_data['pressure'],
-                    weather_data['wind_speed'],
-                    weather_data['wind_direction'],
-                    weather_data['cloud_cover']
-                ]
-            elif disaster_type == 'earthquake':
-                features = [
-                    weather_data['pressure'],
-                    weather_data['wind_speed'],
-                    weather_data['temperature'],
-                    weather_data['humidity'],
-                    weather_data['cloud_cover']
-                ]
-            elif disaster_type == 'tornado':
-                features = [
-                    weather_data['temperature'],
-                    weather_data['humidity'],
-                    weather_data['pressure'],
-                    weather_data['wind_speed'],
-                    weather_data['wind_direction'],
-                    weather_data['cloud_cover']
-                ]
-            elif disaster_type == 'landslide':
-                features = [
-                    weather_data['temperature'],
-                    weather_data['humidity'],
-                    weather_data['precipitation'],
-                    weather_data['wind_speed'],
-                    weather_data['pressure']
-                ]
-            elif disaster_type == 'drought':
-                features = [
-                    weather_data['temperature'],
-                    weather_data['humidity'],
-                    weather_data['precipitation'],
-                    weather_data['wind_speed'],
-                    weather_data['pressure']
-                ]
-            
+
             try:
-                # Scale features
-                features_scaled = self.scalers[disaster_type].transform([features])
-                features_tensor = torch.FloatTensor(features_scaled)
-                # Make prediction
-                model.eval()
-                with torch.no_grad():
-                    prediction = model(features_tensor)
-                    predictions[disaster_type] = float(prediction.item())
+                if needs_model is None and scores is None and len(rows) == num_records:
+                    scores = self._score_hazard(disaster_type, entry, features)
+                else:
+                    # Rows left out (screened out or incomplete) keep their fused or rule-based risk;
+                    # the model scores the rest plus the cascade's audit sample
+                    if scores is None:
+                        scores = rule_based(disaster_type)
+                    scored_rows = np.concatenate([rows, audit_rows])
+                    model_scores = self._score_hazard(disaster_type, entry, features[scored_rows])
+                    for i, score in zip(rows.tolist(), model_scores):
+                        scores[i] = score
+                    if needs_model is not None:
+                        audit_misses = sum(score >= CASCADE_MISS_RISK for score in model_scores[len(rows):])
+                        self.cascade.record(disaster_type, num_records, num_records - int(needs_model.sum()),
+                                            len(audit_rows), audit_misses)
             except Exception as e:
                 logger.error(f"Prediction failure for {disaster_type}, using rule-based fallback: {e}")
-                predictions[disaster_type] = self._rule_based_risk(disaster_type, weather_data)
-        
+                scores = rule_based(disaster_type)
+
+            for record_predictions, score in zip(predictions, scores):
+                record_predictions[disaster_type] = float(score)
+
         # Clamp earthquake risk unless explicitly enabled via env
-        if not self.allow_earthquake_predictions and 'earthquake' in predictions:
-            try:
-                predictions['earthquake'] = max(
-                    0.0,
-                    min(0.05, predictions['earthquake'] * EARTHQUAKE_RISK_MULTIPLIER)
-                )
-            except Exception:
-                # On any error, degrade gracefully to near-zero
-                predictions['earthquake'] = 0.0
+        if not self.allow_earthquake_predictions:
+            for record_predictions in predictions:
+                if 'earthquake' not in record_predictions:
+                    continue
+                try:
+                    record_predictions['earthquake'] = max(
+                        0.0,
+                        min(0.05, record_predictions['earthquake'] * EARTHQUAKE_RISK_MULTIPLIER)
+                    )
+                except Exception:
+                    # On any error, degrade gracefully to near-zero
+                    record_predictions['earthquake'] = 0.0
 
         return predictions
 
+    def _score_hazard(self, disaster_type: str, entry: ResidentModel, features: np.ndarray) -> List[float]:
+        """Score the rows of the feature matrix with one hazard's model in a single forward pass"""
+        # The hazard's columns, in the order the model was trained on
+        features = hazard_features(features, disaster_type)
+        if entry.quantized is not None:
+            return entry.quantized.predict(features).tolist()
+        if entry.compiled is not None:
+            # Folded graph takes raw features: no separate scaling step
+            return entry.compiled.predict(features).tolist()
+        # Scale features
+        features_scaled = entry.scaler.transform(features)
+        # Make prediction
+        return self._run_model(entry.model, features_scaled)
+
+    def _sample_hazard(self, disaster_type: str, entry: ResidentModel, features: np.ndarray,
+                       num_samples: int, rng: np.random.Generator) -> np.ndarray:
+        """(num_samples, N) Monte-Carlo dropout risks of one hazard's model for the rows of the feature matrix"""
+        features = hazard_features(features, disaster_type)
+        if entry.compiled is not None:
+            return entry.compiled.predict_samples(features, num_samples, rng)
+        model = entry.model
+        if not isinstance(model, NumpyHazardModel):
+            # Sample the same weights with NumPy rather than switching the shared torch module to train mode
+            model = NumpyHazardModel(torch_model_params(model))
+        return model.predict_samples(entry.scaler.transform(features), num_samples, rng)
+
+    def _run_model(self, model, features_scaled: np.ndarray) -> List[float]:
+        """Evaluate one hazard model on a batch of scaled features"""
+        if isinstance(model, NumpyHazardModel):
+            return model.predict(features_scaled).tolist()
+        import torch
+        model.eval()
+        with torch.no_grad():
+            return model(torch.FloatTensor(features_scaled)).squeeze(1).tolist()
+
+    def _predict_fused(self, fused_model, features: np.ndarray) -> Dict[str, List[float]]:
+        """Score all fused hazards for a feature matrix in one forward pass"""
+        import torch
+        with torch.no_grad():
+            scores = fused_model(torch.from_numpy(features))
+        return {
+            disaster_type: scores[:, i].tolist()
+            for i, disaster_type in enumerate(fused_model.hazards)
+        }
+
+    def rule_based_risk_matrix(self, weather_records: List[Dict[str, float]]) -> np.ndarray:
+        """Rule-based risks of every hazard for a batch, as an N x 7 matrix (columns in RULE_HAZARDS order).
+        Same rules as _rule_based_risk; see rule_engine.rule_based_risk_matrix for column-array input."""
+        return rule_based_risk_matrix(weather_columns(weather_records), num_points=len(weather_records))
+
     def _rule_based_risk(self, disaster_type: str, weather_data: Dict[str, float]) -> float:
         """Lightweight rule-based fallback using live weather features.
         Keeps the UI populated even when models/scalers are unavailable."""
-        temperature = float(weather_data.get('temperature', 20))
-        humidity = float(weather_data.get('humidity', 50))
-        precipitation = float(weather_data.get('precipitation', 0))
-        wind_speed = float(weather_data.get('wind_speed', 0))
-        pressure = float(weather_data.get('pressure', 1013))
-        cloud_cover = float(weather_data.get('cloud_cover', 0))
+        temperature = rule_input(weather_data, 'temperature')
+        humidity = rule_input(weather_data, 'humidity')
+        precipitation = rule_input(weather_data, 'precipitation')
+        wind_speed = rule_input(weather_data, 'wind_speed')
+        pressure = rule_input(weather_data, 'pressure')
+        cloud_cover = rule_input(weather_data, 'cloud_cover')
 
         def clamp01(x: float) -> float:
             return max(0.0, min(1.0, x))
@@ -8,7 +8,7 @@ from datetime import datetime, timedelta, timezone
 import random
 import threading
 import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 import asyncio
 from contextlib import suppress
@@ -16,10 +16,14 @@ from contextlib import suppress
 # Load environment variables from .env (must happen BEFORE importing modules that read env)
 load_dotenv()
 
-from weather_service import weather_service, WeatherData
-from ai_models import ai_prediction_service
+from weather_service import weather_service, WeatherData, forecast_weather_records
+from ai_models import AI_UNCERTAINTY, ai_prediction_service
+from feature_schema import weather_features
 from openfema_service import openfema_service, FEMADeclaration
 from eonet_service import eonet_service, EONETEvent
+from async_bridge import async_bridge, run_async
+from http_session import http_sessions
+from risk_grid import GridRequestError, build_risk_grid, parse_bbox, parse_hazards, parse_resolution
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -58,6 +62,9 @@ weather_data_cache = []
 fema_disasters = []  # OpenFEMA disaster declarations (list of dicts)
 eonet_events = []    # NASA EONET events (list of dicts)
 
+# Background model training jobs (models are retrained on a copy and published by atomic swap)
+training_jobs = ai_prediction_service.training_jobs
+
 # Optional: Gemini configuration for natural-language summaries
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 genai_model = None
@@ -92,6 +99,12 @@ def generate_prediction_summary(event_type: str, location: str, weather: Dict[st
         logger.warning(f"Gemini summary generation failed: {e}")
     return ""
 
+# Time (s) the background thread waits for one provider sweep on the async bridge
+BACKGROUND_FETCH_TIMEOUT = float(os.getenv('BACKGROUND_FETCH_TIMEOUT', '120'))
+
+# Largest number of epochs a training request may ask for
+MAX_TRAIN_EPOCHS = int(os.getenv('AI_MAX_TRAIN_EPOCHS', '500'))
+
 # Major cities for weather monitoring
 MONITORED_LOCATIONS = [
     {'name': 'San Francisco, CA', 'coords': {'lat': 37.7749, 'lng': -122.4194}},
@@ -149,7 +162,8 @@ class DisasterEvent:
 class Prediction:
     def __init__(self, prediction_id: str, event_type: str, location: str, 
                  probability: float, severity: str, timeframe: str, coordinates: Dict[str, float],
-                 weather_data: Dict = None, ai_model: str = "PyTorch Neural Network"):
+                 weather_data: Dict = None, ai_model: str = "PyTorch Neural Network",
+                 confidence_level: Optional[float] = None):
         self.id = prediction_id
         self.event_type = event_type
         self.location = location
@@ -159,7 +173,8 @@ class Prediction:
         self.coordinates = coordinates
         self.created_at = datetime.now(timezone.utc)
         self.updated_at = datetime.now(timezone.utc)
-        self.confidence_level = probability
+        # Model confidence when known (Monte-Carlo dropout), otherwise the probability as before
+        self.confidence_level = probability if confidence_level is None else confidence_level
         self.affected_area_km2 = random.uniform(100, 5000)
         self.potential_impact = f"Potential {severity.lower()} {event_type} affecting {location}"
         self.weather_data = weather_data or {}
@@ -225,6 +240,21 @@ async def fetch_weather_data():
         logger.error(f"Error fetching weather data: {e}")
         return []
 
+def parse_flag(value: Any, default: bool) -> bool:
+    """Boolean request option: a JSON boolean, or a string parsed like the env flags ('true' enables)"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() == 'true'
+
+async def fetch_weather_and_forecast(lat: float, lon: float, location_name: str):
+    """Current weather and 5-day forecast for one location, fetched concurrently"""
+    return await asyncio.gather(
+        weather_service.get_current_weather(lat, lon, location_name, 'metric'),
+        weather_service.get_weather_forecast(lat, lon, 5, 'metric')
+    )
+
 def create_sensor_from_weather(weather: WeatherData, sensor_type: str) -> SensorData:
     """Create sensor data from weather data"""
     sensor_id = f"sensor_{weather.location.replace(' ', '_').replace(',', '')}_{sensor_type}"
@@ -249,17 +279,7 @@ def create_sensor_from_weather(weather: WeatherData, sensor_type: str) -> Sensor
         reading_value = weather.temperature
         reading_unit = 'celsius'
     
-    weather_dict = {
-        'temperature': weather.temperature,
-        'humidity': weather.humidity,
-        'pressure': weather.pressure,
-        'wind_speed': weather.wind_speed,
-        'wind_direction': weather.wind_direction,
-        'precipitation': weather.precipitation,
-        'visibility': weather.visibility,
-        'cloud_cover': weather.cloud_cover,
-        'weather_condition': weather.weather_condition
-    }
+    weather_dict = dict(weather_features(weather), weather_condition=weather.weather_condition)
     
     return SensorData(
         sensor_id=sensor_id,
@@ -277,39 +297,43 @@ def analyze_weather_for_disasters(weather_data: List[WeatherData]) -> List[Dict]
     """Analyze weather data for potential disasters using AI models"""
     predictions = []
     
-    for weather in weather_data:
-        weather_dict = {
-            'temperature': weather.temperature,
-            'humidity': weather.humidity,
-            'pressure': weather.pressure,
-            'wind_speed': weather.wind_speed,
-            'wind_direction': weather.wind_direction,
-            'precipitation': weather.precipitation,
-            'visibility': weather.visibility,
-            'cloud_cover': weather.cloud_cover
-        }
-        
-        # Get AI predictions
+    # Get AI predictions for every location in one batched pass, straight from the WeatherData objects
+    try:
+        batch_predictions = ai_prediction_service.predict_disaster_risks_batch(weather_data)
+    except Exception as e:
+        logger.error(f"Batched AI prediction failed, scoring locations individually: {e}")
+        batch_predictions = []
+        for weather in weather_data:
+            try:
+                batch_predictions.append(ai_prediction_service.predict_disaster_risks(weather))
+            except Exception as le:
+                logger.error(f"Error in AI prediction for {weather.location}: {le}")
+                batch_predictions.append({})
+
+    # Optional Monte-Carlo dropout confidence for every location, also in one batched pass
+    uncertainty = [{} for _ in weather_data]
+    if AI_UNCERTAINTY:
         try:
-            ai_predictions = ai_prediction_service.predict_disaster_risks(weather_dict)
-            
-            for disaster_type, risk_score in ai_predictions.items():
-                if risk_score > 0.3:  # Only create predictions for significant risks
-                    severity = ai_prediction_service.get_disaster_severity(risk_score)
-                    
-                    prediction = {
-                        'disaster_type': disaster_type,
-                        'location': weather.location,
-                        'coordinates': weather.coordinates,
-                        'risk_score': risk_score,
-                        'severity': severity,
-                        'weather_data': weather_dict,
-                        'timestamp': datetime.now(timezone.utc).isoformat()
-                    }
-                    predictions.append(prediction)
-                    
+            uncertainty = ai_prediction_service.predict_uncertainty_batch(weather_data)
         except Exception as e:
-            logger.error(f"Error in AI prediction for {weather.location}: {e}")
+            logger.error(f"Uncertainty estimation failed: {e}")
+    
+    for weather, ai_predictions, ai_uncertainty in zip(weather_data, batch_predictions, uncertainty):
+        for disaster_type, risk_score in ai_predictions.items():
+            if risk_score > 0.3:  # Only create predictions for significant risks
+                severity = ai_prediction_service.get_disaster_severity(risk_score)
+                
+                prediction = {
+                    'disaster_type': disaster_type,
+                    'location': weather.location,
+                    'coordinates': weather.coordinates,
+                    'risk_score': risk_score,
+                    'severity': severity,
+                    'weather_data': weather_features(weather),
+                    'confidence': (ai_uncertainty.get(disaster_type) or {}).get('confidence'),
+                    'timestamp': datetime.now(timezone.utc).isoformat()
+                }
+                predictions.append(prediction)
     
     return predictions
 
@@ -332,8 +356,22 @@ def health_check():
         'sensors_count': len(sensor_data),
         'weather_locations': len(MONITORED_LOCATIONS),
         'ai_models_loaded': len(ai_prediction_service.models),
+        'ai_models_resident': sorted(ai_prediction_service.models),
         'fema_disasters_count': len(fema_disasters),
-        'eonet_events_count': len(eonet_events)
+        'eonet_events_count': len(eonet_events),
+        'async_bridge': async_bridge.stats(),
+        'http_pool': http_sessions.stats()
+    })
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    """Counters of the provider response caches, the prediction cache and coalesced provider lookups"""
+    return jsonify({
+        **weather_service.cache_stats(),
+        'prediction': ai_prediction_service.prediction_cache_stats(),
+        'single_flight': weather_service.inflight_stats(),
+        'cell': weather_service.cells.stats(),
+        'timestamp': datetime.now(timezone.utc).isoformat()
     })
 
 @app.route('/api/weather')
@@ -358,10 +396,7 @@ def geocode_location():
     if not query:
         return jsonify({'error': 'Missing query'}), 400
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        results = loop.run_until_complete(weather_service.geocode(query, limit=limit))
-        loop.close()
+        results = run_async(weather_service.geocode(query, limit=limit))
         return jsonify(results)
     except Exception as e:
         logger.error(f"Error in geocoding: {e}")
@@ -377,10 +412,7 @@ def get_current_weather_by_coords():
         units = request.args.get('units', default='metric')
         if lat is None or lon is None:
             return jsonify({'error': 'lat and lon are required'}), 400
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        weather = loop.run_until_complete(weather_service.get_current_weather(lat, lon, name, units))
-        loop.close()
+        weather = run_async(weather_service.get_current_weather(lat, lon, name, units))
         if not weather:
             return jsonify({'error': 'Failed to fetch weather'}), 502
         return jsonify(weather.to_dict())
@@ -398,11 +430,13 @@ def get_forecast_by_coords():
         units = request.args.get('units', default='metric')
         if lat is None or lon is None:
             return jsonify({'error': 'lat and lon are required'}), 400
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        forecast = loop.run_until_complete(weather_service.get_weather_forecast(lat, lon, days=days, units=units))
-        loop.close()
-        return jsonify(forecast)
+        forecast = run_async(weather_service.get_weather_forecast(lat, lon, days=days, units=units))
+        # The forecast is for the centroid of the coordinates' cache cell
+        cell = weather_service.weather_cell(lat, lon)
+        response = jsonify(forecast)
+        response.headers['X-Weather-Cell'] = cell.id
+        response.headers['X-Weather-Cell-Centroid'] = f"{cell.lat},{cell.lon}"
+        return response
     except Exception as e:
         logger.error(f"Error fetching forecast: {e}")
         return jsonify({'error': 'Failed to fetch forecast'}), 500
@@ -415,12 +449,9 @@ def get_weather_by_city():
     if not query:
         return jsonify({'error': 'Missing query'}), 400
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
         # Fetch multiple candidates to improve worldwide matching
-        results = loop.run_until_complete(weather_service.geocode(query, limit=5))
+        results = run_async(weather_service.geocode(query, limit=5))
         if not results:
-            loop.close()
             return jsonify({'error': 'No results for query'}), 404
 
         # Choose the best candidate: prefer exact (case-insensitive) name match, else first
@@ -446,8 +477,7 @@ def get_weather_by_city():
         lat = best['lat']
         lon = best['lon']
         name = f"{best.get('name')}{', ' + best.get('state') if best.get('state') else ''}{' ' + best.get('country') if best.get('country') else ''}".strip()
-        weather = loop.run_until_complete(weather_service.get_current_weather(lat, lon, name, units))
-        loop.close()
+        weather = run_async(weather_service.get_current_weather(lat, lon, name, units))
         if not weather:
             return jsonify({'error': 'Failed to fetch weather'}), 502
         return jsonify(weather.to_dict())
@@ -465,13 +495,9 @@ def analyze_location():
         return jsonify({'error': 'Location query required'}), 400
 
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
         # Step 1: Geocode the location with robust fallbacks
-        results = loop.run_until_complete(weather_service.geocode(query, limit=5))
+        results = run_async(weather_service.geocode(query, limit=5))
         if not results:
-            loop.close()
             return jsonify({'error': 'Location not found'}), 404
 
         # Step 2: Score and pick the best match
@@ -496,29 +522,25 @@ def analyze_location():
         lon = best['lon']
         location_name = f"{best.get('name')}{', ' + best.get('state') if best.get('state') else ''}{' ' + best.get('country') if best.get('country') else ''}".strip()
 
-        # Step 3: Fetch current weather
-        weather = loop.run_until_complete(weather_service.get_current_weather(lat, lon, location_name, 'metric'))
+        # Step 3: Fetch current weather and the short-term forecast (fallback-safe) concurrently
+        weather, forecast = run_async(fetch_weather_and_forecast(lat, lon, location_name))
         if not weather:
-            loop.close()
             return jsonify({'error': 'Could not compute prediction for your location - weather data unavailable'}), 502
 
-        weather_dict = {
-            'temperature': weather.temperature,
-            'humidity': weather.humidity,
-            'pressure': weather.pressure,
-            'wind_speed': weather.wind_speed,
-            'wind_direction': weather.wind_direction,
-            'precipitation': weather.precipitation,
-            'visibility': weather.visibility,
-            'cloud_cover': weather.cloud_cover
-        }
+        weather_dict = weather_features(weather)
 
         # Step 4: AI predictions
-        predictions_map = ai_prediction_service.predict_disaster_risks(weather_dict)
+        predictions_map = ai_prediction_service.predict_disaster_risks(weather)
 
-        # Step 5: Short-term forecast (fallback-safe)
-        forecast = loop.run_until_complete(weather_service.get_weather_forecast(lat, lon, 5, 'metric'))
-        loop.close()
+        # Step 5: Risk over the whole forecast horizon, all steps scored in one batch
+        try:
+            risk_timeline = ai_prediction_service.risk_timeline(
+                forecast_weather_records(forecast or [], defaults=weather_dict),
+                [entry.get('dt_txt') or entry.get('dt') for entry in forecast or []]
+            )
+        except Exception as e:
+            logger.error(f"Error computing risk timeline: {e}")
+            risk_timeline = None
 
         # Step 6: Build response
         analysis = {
@@ -530,6 +552,7 @@ def analyze_location():
             'current_weather': weather_dict,
             'disaster_risks': predictions_map,
             'forecast': (forecast or [])[:8],
+            'risk_timeline': risk_timeline,
             'analysis_timestamp': datetime.now(timezone.utc).isoformat(),
             'risk_summary': _generate_risk_summary(predictions_map, weather_dict)
         }
@@ -611,7 +634,7 @@ def get_stats():
         'high_probability_predictions': len([p for p in predictions if p.probability > 0.7]),
         'total_sensors': len(sensor_data),
         'weather_locations_monitored': len(MONITORED_LOCATIONS),
-        'ai_models_active': len(ai_prediction_service.models),
+        'ai_models_active': len(ai_prediction_service.enabled_hazards),
         'last_updated': datetime.now(timezone.utc).isoformat()
     })
 
@@ -622,33 +645,24 @@ def predict_disaster():
     lat = data.get('lat')
     lon = data.get('lon')
     location_name = data.get('location_name')
+    with_uncertainty = parse_flag(data.get('uncertainty'), AI_UNCERTAINTY)
     
     if not lat or not lon:
         return jsonify({'error': 'Latitude and longitude required'}), 400
     
     try:
         # Fetch weather data for the location
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        weather = loop.run_until_complete(weather_service.get_current_weather(lat, lon, location_name))
-        loop.close()
+        weather = run_async(weather_service.get_current_weather(lat, lon, location_name))
         
         if not weather:
             return jsonify({'error': 'Failed to fetch weather data'}), 500
         
-        weather_dict = {
-            'temperature': weather.temperature,
-            'humidity': weather.humidity,
-            'pressure': weather.pressure,
-            'wind_speed': weather.wind_speed,
-            'wind_direction': weather.wind_direction,
-            'precipitation': weather.precipitation,
-            'visibility': weather.visibility,
-            'cloud_cover': weather.cloud_cover
-        }
+        weather_dict = weather_features(weather)
         
         # Get AI predictions
-        predictions_map = ai_prediction_service.predict_disaster_risks(weather_dict)
+        predictions_map = ai_prediction_service.predict_disaster_risks(weather)
+        # Optional Monte-Carlo dropout intervals and confidence per hazard
+        uncertainty = ai_prediction_service.predict_uncertainty(weather) if with_uncertainty else None
 
         # Optional Gemini summaries for each predicted type
         summaries = {}
@@ -671,7 +685,9 @@ def predict_disaster():
                     timeframe='24-72h',
                     coordinates=weather.coordinates,
                     weather_data=weather_dict,
-                    ai_model='PyTorch + Gemini' if summaries.get(etype) else 'PyTorch Neural Network'
+                    ai_model='PyTorch + Gemini' if summaries.get(etype) else 'PyTorch Neural Network',
+                    # Rule-served hazards have no interval and keep the default confidence
+                    confidence_level=(uncertainty.get(etype) or {}).get('confidence') if uncertainty else None
                 )
                 if summaries.get(etype):
                     prediction.potential_impact = summaries[etype]
@@ -686,6 +702,7 @@ def predict_disaster():
             'weather_data': weather_dict,
             'predictions': predictions_map,
             'summaries': summaries,
+            **({'uncertainty': uncertainty} if uncertainty else {}),
             'timestamp': datetime.now(timezone.utc).isoformat()
         })
         
@@ -693,6 +710,26 @@ def predict_disaster():
         logger.error(f"Error in AI prediction: {e}")
         return jsonify({'error': 'Prediction failed'}), 500
 
+@app.route('/api/risk/grid')
+def get_risk_grid():
+    """Risk raster for a bounding box: one base64 float32 array per hazard"""
+    try:
+        bbox = parse_bbox(request.args.get('bbox', ''))
+        resolution = parse_resolution(request.args.get('resolution'))
+        hazards = parse_hazards(request.args.get('hazards'))
+    except GridRequestError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        grid = run_async(build_risk_grid(weather_service, ai_prediction_service, bbox, resolution, hazards))
+    except GridRequestError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error building risk grid: {e}")
+        return jsonify({'error': 'Failed to build risk grid'}), 500
+    grid['timestamp'] = datetime.now(timezone.utc).isoformat()
+    return jsonify(grid)
+
 @app.route('/api/models')
 def list_models():
     """List available AI models and their status"""
@@ -707,29 +744,70 @@ def list_models():
             'drought': ['ERA5'],
             'earthquake': ['USGS']
         }
-        for hz, model in ai_prediction_service.models.items():
-            loaded = isinstance(model, dict) and 'clf' in model
+        # Models load lazily: 'loaded' reports whether the hazard's weights are resident right now
+        registry = ai_prediction_service.resident_models()
+        for hz in registry['enabled'] + registry['disabled']:
+            resident = registry['resident'].get(hz)
             hazards[hz] = {
-                'loaded': bool(loaded),
-                'type': 'ml' if loaded else 'heuristic',
+                'loaded': bool(resident and resident['trained']),
+                'type': 'heuristic' if hz in registry['disabled'] else 'ml',
                 'metrics': {},
                 'sources': sources.get(hz, [])
             }
-        return jsonify({'models': hazards, 'timestamp': datetime.now(timezone.utc).isoformat()})
+        return jsonify({
+            'models': hazards,
+            'registry': {
+                'resident_bytes': registry['resident_bytes'],
+                'memory_budget_bytes': registry['memory_budget_bytes'],
+                'loads': registry['loads'],
+                'evictions': registry['evictions']
+            },
+            'prediction_cache': ai_prediction_service.prediction_cache_stats(),
+            'dispatcher': ai_prediction_service.dispatcher_stats(),
+            'cascade': ai_prediction_service.cascade_stats(),
+            'fingerprint': {
+                'stored': ai_prediction_service.stored_fingerprint(),
+                'current': ai_prediction_service.artifacts_current()
+            },
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        })
     except Exception as e:
         logger.error(f"/api/models error: {e}")
         return jsonify({'error': 'failed to list models'}), 500
 
 @app.route('/api/ai/train', methods=['POST'])
 def train_models():
-    """Train AI models"""
+    """Start a background training job; poll GET /api/ai/train/<job_id> for progress"""
     try:
-        ai_prediction_service.train_models(epochs=50)  # Reduced epochs for faster training
-        return jsonify({'message': 'Models trained successfully'})
+        data = request.get_json(silent=True) or {}
+        epochs = data.get('epochs', 50)  # Reduced epochs for faster training
+        try:
+            if isinstance(epochs, bool) or (isinstance(epochs, float) and not epochs.is_integer()):
+                raise ValueError(epochs)
+            epochs = int(epochs)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'epochs must be an integer'}), 400
+        if not 1 <= epochs <= MAX_TRAIN_EPOCHS:
+            return jsonify({'error': f'epochs must be between 1 and {MAX_TRAIN_EPOCHS}'}), 400
+        job, created = training_jobs.submit(epochs=epochs)
+        return jsonify({
+            'job_id': job.job_id,
+            'status': job.status,
+            'status_url': f"/api/ai/train/{job.job_id}",
+            'message': 'Training started' if created else 'Training already in progress'
+        }), 202 if created else 409
     except Exception as e:
-        logger.error(f"Error training models: {e}")
+        logger.error(f"Error starting training job: {e}")
         return jsonify({'error': 'Training failed'}), 500
 
+@app.route('/api/ai/train/<job_id>')
+def get_training_job(job_id):
+    """Progress and per-hazard report of a training job"""
+    job = training_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Training job not found'}), 404
+    return jsonify(job.to_dict())
+
 @app.route('/api/events', methods=['POST'])
 def create_event():
     """Create a new disaster event"""
@@ -854,22 +932,23 @@ def background_task():
     while True:
         try:
             # Fetch weather data
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            weather_data = loop.run_until_complete(fetch_weather_data())
+            weather_data = run_async(fetch_weather_data(), timeout=BACKGROUND_FETCH_TIMEOUT)
             # Also fetch recent FEMA disaster declarations
             try:
-                recent_decls = loop.run_until_complete(openfema_service.fetch_recent_disasters(days=14, top=200))
+                recent_decls = run_async(
+                    openfema_service.fetch_recent_disasters(days=14, top=200), timeout=BACKGROUND_FETCH_TIMEOUT
+                )
             except Exception as fe:
                 logger.error(f"OpenFEMA fetch error: {fe}")
                 recent_decls = []
             # Also fetch EONET events
             try:
-                recent_eonet = loop.run_until_complete(eonet_service.fetch_events(status='open', limit=200, days=14))
+                recent_eonet = run_async(
+                    eonet_service.fetch_events(status='open', limit=200, days=14), timeout=BACKGROUND_FETCH_TIMEOUT
+                )
             except Exception as ne:
                 logger.error(f"EONET fetch error: {ne}")
                 recent_eonet = []
-            loop.close()
             
             if weather_data:
                 global weather_data_cache
@@ -910,7 +989,8 @@ def background_task():
                             timeframe='24h',
                             coordinates=pred_data['coordinates'],
                             weather_data=pred_data['weather_data'],
-                            ai_model='PyTorch + Gemini' if narrative else 'PyTorch Neural Network'
+                            ai_model='PyTorch + Gemini' if narrative else 'PyTorch Neural Network',
+                            confidence_level=pred_data.get('confidence')
                         )
                         if narrative:
                             prediction.potential_impact = narrative
@@ -961,13 +1041,8 @@ if __name__ == '__main__':
     # Only run heavy startup tasks once (avoid double-run with reloader)
     run_main = os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
     if not app.debug or run_main:
-        # Train AI models on startup
-        try:
-            logger.info("Training AI models...")
-            ai_prediction_service.train_models(epochs=30)  # Quick training for demo
-            logger.info("AI models trained successfully")
-        except Exception as e:
-            logger.error(f"Error training AI models: {e}")
+        # Serve the stored models right away; retrain in the background only if their fingerprint is stale
+        ai_prediction_service.train_on_startup()
 
         # Start background task
         background_thread = threading.Thread(target=background_task, daemon=True)
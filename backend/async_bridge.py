@@ -0,0 +1,115 @@
+"""Bridge from synchronous Flask handlers to one long-lived asyncio event loop.
+
+The loop runs in a dedicated daemon thread for the lifetime of the process.
+Handlers and background threads submit coroutines to it and block on the result
+with a timeout; on timeout the coroutine is cancelled inside the loop. Because
+the loop outlives requests, the pooled HTTP sessions bound to it (see
+http_session) keep their connections and DNS cache across requests.
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Dict, Optional
+
+from http_session import http_sessions
+
+logger = logging.getLogger(__name__)
+
+# Default time (s) a caller waits for a submitted coroutine before it is cancelled
+ASYNC_BRIDGE_TIMEOUT: float = float(os.getenv('ASYNC_BRIDGE_TIMEOUT', '30'))
+
+class EventLoopBridge:
+    """A persistent event loop in a daemon thread, started on first use"""
+
+    def __init__(self, name: str = 'async-bridge', timeout: float = ASYNC_BRIDGE_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.timeouts = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop; cancelling the returned future cancels the coroutine"""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Blocking on the bridge from its own loop would deadlock; await the coroutine instead")
+        with self._lock:
+            self.submitted += 1
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and wait for its result.
+        Raises TimeoutError after timeout seconds (default: the bridge timeout), once the coroutine is cancelled."""
+        future = self.submit(coro)
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError(f"Coroutine did not finish within {self.timeout if timeout is None else timeout}s")
+
+    def stop(self, timeout: float = 5.0):
+        """Close the loop's pooled HTTP session, cancel pending work and stop the loop thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+
+        async def shutdown():
+            await http_sessions.close()
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+        except Exception as e:
+            logger.error(f"Error shutting down the event loop bridge: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+    def stats(self) -> Dict[str, Any]:
+        loop = self._loop
+        running = loop is not None and loop.is_running()
+        with self._lock:
+            return {
+                'running': running,
+                'submitted': self.submitted,
+                'timeouts': self.timeouts,
+                'timeout': self.timeout,
+            }
+
+# Shared by the Flask handlers and the background threads
+async_bridge = EventLoopBridge()
+atexit.register(async_bridge.stop)
+
+def run_async(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared loop from synchronous code and return its result"""
+    return async_bridge.run(coro, timeout)
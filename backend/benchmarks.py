@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the DisastroScope prediction and serialization hot paths.
+
+Usage:
+    python benchmarks.py                                     # print results
+    python benchmarks.py --output results.json               # also save them as JSON
+    python benchmarks.py --baseline benchmark_baseline.json  # compare with a saved run
+    python benchmarks.py --quick                             # smaller inputs, fewer repeats
+
+With --baseline the exit status is 1 when a benchmark's time exceeds the
+baseline's by more than --threshold (default 1.25x). Runs are compared on their
+fastest call, which is the least sensitive to scheduling noise.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ai_models import ai_prediction_service, HAZARD_FEATURES, WEATHER_FEATURES
+from weather_service import WeatherData
+
+def random_weather(num_records: int, seed: int = 0) -> List[Dict[str, float]]:
+    """Synthetic weather records covering the ranges seen by the models"""
+    rng = np.random.default_rng(seed)
+    low = np.array([-20, 10, 900, 0, 0, 0, 0, 0])
+    high = np.array([50, 100, 1100, 60, 360, 100, 25, 100])
+    values = rng.uniform(low, high, size=(num_records, len(WEATHER_FEATURES)))
+    return [dict(zip(WEATHER_FEATURES, row.tolist())) for row in values]
+
+def random_locations(num_locations: int, seed: int = 0) -> List[WeatherData]:
+    """Synthetic WeatherData for num_locations scattered locations"""
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(-60, 70, num_locations).tolist()
+    lngs = rng.uniform(-180, 180, num_locations).tolist()
+    timestamp = datetime.now(timezone.utc)
+    return [
+        WeatherData(location=f"Location {i}", coordinates={'lat': lat, 'lng': lng},
+                    weather_condition='Clouds', timestamp=timestamp, **record)
+        for i, (lat, lng, record) in enumerate(zip(lats, lngs, random_weather(num_locations, seed)))
+    ]
+
+def time_per_call(func: Callable[[], object], repeats: int) -> float:
+    """Mean wall time of func() in microseconds, after one warm-up call"""
+    func()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def measure(func: Callable[[], object], repeats: int, items: int = 1) -> Dict[str, float]:
+    """Timing statistics of func() over repeats calls after one warm-up call; items is the work done per call.
+    Garbage collection is paused while timing, as in timeit."""
+    func()
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(max(1, repeats)):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    median = statistics.median(samples)
+    return {
+        'median_s': median,
+        'mean_s': statistics.fmean(samples),
+        'min_s': min(samples),
+        'max_s': max(samples),
+        'repeats': len(samples),
+        'items': items,
+        'items_per_s': items / median if median > 0 else 0.0,
+    }
+
+def benchmark_folded_inference(repeats: int = 200) -> Dict[str, float]:
+    """Per-call model latency with and without folded inference graphs (prediction cache bypassed)"""
+    service = ai_prediction_service
+    record = random_weather(1)[0]
+    fold_models = service.fold_models
+    try:
+        service.fold_models = False
+        service.registry.clear()
+        unfolded = time_per_call(lambda: service._predict_batch([record]), repeats)
+    finally:
+        service.fold_models = fold_models
+        service.registry.clear()
+    folded = time_per_call(lambda: service._predict_batch([record]), repeats)
+    return {'unfolded_us': unfolded, 'folded_us': folded, 'speedup': unfolded / folded}
+
+def benchmark_prediction_cache(repeats: int = 200) -> Dict[str, float]:
+    """Per-call latency of predict_disaster_risks on a cache hit versus scoring with the models"""
+    service = ai_prediction_service
+    record = random_weather(1, seed=1)[0]
+    miss = time_per_call(lambda: service._predict_batch([record]), repeats)
+    hit = time_per_call(lambda: service.predict_disaster_risks(record), repeats)
+    return {'miss_us': miss, 'hit_us': hit, 'speedup': miss / hit}
+
+def benchmark_hot_paths(quick: bool = False) -> Dict[str, Dict[str, float]]:
+    """Time the prediction, rule-based, synthetic-data, serialization and analysis paths.
+    The prediction cache is disabled meanwhile so every call does the full work."""
+    import app as backend_app
+
+    service = ai_prediction_service
+    scale = 10 if quick else 1
+    results: Dict[str, Dict[str, float]] = {}
+    cache_capacity = service.prediction_cache.capacity
+    service.prediction_cache.capacity = 0
+    try:
+        records = random_weather(1000 // scale, seed=2)
+        num_records = len(records)
+        results['predict_disaster_risks.single'] = measure(
+            lambda: service.predict_disaster_risks(records[0]), 200 // scale)
+        results[f'predict_disaster_risks.loop_{num_records}'] = measure(
+            lambda: [service.predict_disaster_risks(r) for r in records], 5, num_records)
+        results[f'predict_disaster_risks_batch.{num_records}'] = measure(
+            lambda: service.predict_disaster_risks_batch(records), 20 // scale, num_records)
+
+        hazards = list(HAZARD_FEATURES)
+        results[f'rule_based_risk.{num_records}x{len(hazards)}'] = measure(
+            lambda: [service._rule_based_risk(h, r) for r in records for h in hazards],
+            5, num_records * len(hazards))
+
+        results['generate_synthetic_training_data.10000'] = measure(
+            lambda: service.generate_synthetic_training_data(10000, rng=np.random.default_rng(0)), 10 // scale, 10000)
+
+        size = 10000 // scale
+        locations = random_locations(size, seed=3)
+        coordinates = {'lat': 37.7749, 'lng': -122.4194}
+        serializable = {
+            'DisasterEvent': [
+                backend_app.DisasterEvent(f"event_{i}", f"Event {i}", 'flood', 'San Francisco, CA', 'high',
+                                          'active', coordinates, weather_data=record)
+                for i, record in enumerate(random_weather(size, seed=4))
+            ],
+            'Prediction': [
+                backend_app.Prediction(f"pred_{i}", 'flood', 'San Francisco, CA', 0.5, 'medium', '24-48 hours',
+                                       coordinates, weather_data=record)
+                for i, record in enumerate(random_weather(size, seed=5))
+            ],
+            'SensorData': [backend_app.create_sensor_from_weather(w, 'temperature') for w in locations],
+            'WeatherData': locations,
+        }
+        for name, objects in serializable.items():
+            results[f'to_dict.{name}_{size}'] = measure(lambda: [o.to_dict() for o in objects], 10, size)
+
+        for num_locations in ([10, 1000] if quick else [10, 1000, 100000]):
+            weather = random_locations(num_locations, seed=6)
+            results[f'analyze_weather_for_disasters.{num_locations}'] = measure(
+                lambda: backend_app.analyze_weather_for_disasters(weather), 3 if num_locations >= 100000 else 10,
+                num_locations)
+    finally:
+        service.prediction_cache.capacity = cache_capacity
+    return results
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any],
+                        threshold: float) -> Dict[str, Dict[str, Any]]:
+    """Fastest-call ratio (current / baseline) of every benchmark present in both runs"""
+    comparison = {}
+    for name, current in results.items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous or previous['min_s'] <= 0:
+            continue
+        ratio = current['min_s'] / previous['min_s']
+        comparison[name] = {'ratio': ratio, 'regression': ratio > threshold}
+    return comparison
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the DisastroScope hot paths")
+    parser.add_argument('--output', help="save the results as JSON")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare with")
+    parser.add_argument('--threshold', type=float, default=1.25, help="slowdown ratio reported as a regression")
+    parser.add_argument('--quick', action='store_true', help="smaller inputs and fewer repeats")
+    args = parser.parse_args(argv)
+
+    print("⏱️  DisastroScope Benchmarks")
+    print("=" * 50)
+    print(f"Backend: {ai_prediction_service.inference_backend}")
+
+    folding = benchmark_folded_inference()
+    print("predict_disaster_risks (single record):")
+    print(f"   Unfolded: {folding['unfolded_us']:.1f} µs/call")
+    print(f"   Folded:   {folding['folded_us']:.1f} µs/call ({folding['speedup']:.1f}x)")
+
+    caching = benchmark_prediction_cache()
+    print("predict_disaster_risks prediction cache:")
+    print(f"   Miss: {caching['miss_us']:.1f} µs/call")
+    print(f"   Hit:  {caching['hit_us']:.1f} µs/call ({caching['speedup']:.1f}x)")
+
+    results = benchmark_hot_paths(quick=args.quick)
+    print("Hot paths (median per call, throughput):")
+    for name, result in results.items():
+        print(f"   {name:<45} {result['median_s'] * 1e3:10.3f} ms {result['items_per_s']:12.0f} items/s")
+
+    if args.output:
+        report = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'backend': ai_prediction_service.inference_backend,
+            'quick': args.quick,
+            'folded_inference': folding,
+            'prediction_cache': caching,
+            'benchmarks': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        comparison = compare_to_baseline(results, baseline, args.threshold)
+        print(f"Compared with {args.baseline} (regression above {args.threshold:.2f}x):")
+        for name, entry in comparison.items():
+            marker = "❌" if entry['regression'] else "✅"
+            print(f"   {marker} {name:<45} {entry['ratio']:.2f}x")
+        if any(entry['regression'] for entry in comparison.values()):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
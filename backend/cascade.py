@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Cascade screening: run a hazard model only where the cheap rules indicate risk.
+
+Each cascaded hazard's rule-based risk is evaluated with every rule input pushed
+by a margin in the direction that raises that hazard's risk (a more humid, hotter,
+windier point...). Records whose relaxed rule risk stays below the threshold are
+screened out and keep their plain rule-based risk; the model scores the rest.
+
+The rules are not the function the models learned, so the screen only suits
+hazards where they agree. Run ``python cascade.py`` to see, per hazard, how many
+synthetic records the screen removes and how many of those the model would have
+scored as significant risk. A fraction of the screened records can also be
+scored at serving time (audit rate) to track misses on live traffic.
+"""
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from rule_engine import RULE_HAZARDS, RULE_RISK_DIRECTIONS, hazard_rule_risk, weather_columns
+
+# How far each rule input is pushed towards higher risk before screening
+DEFAULT_CASCADE_MARGINS: Dict[str, float] = {
+    'temperature': 5.0,      # °C
+    'humidity': 10.0,        # % RH
+    'precipitation': 5.0,    # mm
+    'wind_speed': 5.0,       # m/s
+    'pressure': 10.0,        # hPa
+    'cloud_cover': 10.0,     # %
+}
+
+# Smaller batches skip the screen: for a handful of rows the NumPy screen costs more than the
+# folded graphs it would save
+CASCADE_MIN_BATCH: int = 16
+
+# Model risk from which a screened-out record counts as a miss (the app reports risks above it)
+CASCADE_MISS_RISK: float = 0.3
+
+class CascadeScreen:
+    """Per-hazard rule-based pre-screen with screen-out and audit counters"""
+
+    def __init__(self, hazards: List[str], threshold: float = 0.05, margins: Optional[Dict[str, float]] = None,
+                 audit_rate: float = 0.0, seed: Optional[int] = None):
+        self.hazards = [h for h in RULE_HAZARDS if h in hazards]
+        self.threshold = threshold
+        self.margins = dict(DEFAULT_CASCADE_MARGINS)
+        self.margins.update(margins or {})
+        self.audit_rate = audit_rate
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {
+            h: {'records': 0, 'screened': 0, 'audited': 0, 'audit_misses': 0} for h in self.hazards
+        }
+
+    def relaxed_risk(self, disaster_type: str, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Rule-based risk of disaster_type with every input moved by its margin towards higher risk"""
+        relaxed = dict(columns)
+        for name, direction in RULE_RISK_DIRECTIONS[disaster_type].items():
+            if name in relaxed:
+                relaxed[name] = relaxed[name] + direction * self.margins.get(name, 0.0)
+        return hazard_rule_risk(disaster_type, relaxed)
+
+    def screen(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Boolean mask per cascaded hazard: True where the model has to run"""
+        return {h: self.relaxed_risk(h, columns) >= self.threshold for h in self.hazards}
+
+    def audit_sample(self, needs_model: np.ndarray) -> np.ndarray:
+        """Indices of screened-out records to score anyway, drawn at the audit rate"""
+        screened = np.flatnonzero(~needs_model)
+        if self.audit_rate <= 0 or not len(screened):
+            return screened[:0]
+        with self._lock:
+            draws = self._rng.random(len(screened))
+        return screened[draws < self.audit_rate]
+
+    def record(self, disaster_type: str, records: int, screened: int, audited: int = 0, audit_misses: int = 0):
+        with self._lock:
+            counts = self._counts[disaster_type]
+            counts['records'] += records
+            counts['screened'] += screened
+            counts['audited'] += audited
+            counts['audit_misses'] += audit_misses
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hazards = {
+                h: dict(counts,
+                        screen_out_rate=counts['screened'] / counts['records'] if counts['records'] else 0.0,
+                        audit_miss_rate=counts['audit_misses'] / counts['audited'] if counts['audited'] else 0.0)
+                for h, counts in self._counts.items()
+            }
+        return {
+            'threshold': self.threshold,
+            'margins': dict(self.margins),
+            'audit_rate': self.audit_rate,
+            'miss_risk': CASCADE_MISS_RISK,
+            'hazards': hazards,
+        }
+
+def calibrate(service, num_samples: int = 20000, seed: int = 12345,
+              screen: Optional[CascadeScreen] = None) -> Dict[str, Dict[str, float]]:
+    """Screen-out and miss rates of the screen for every rule-screenable hazard on uniform synthetic weather.
+    A miss is a screened-out record that the model scores at CASCADE_MISS_RISK or above."""
+    rng = np.random.default_rng(seed)
+    # Wide uniform ranges: a stress test, not a quiet day
+    low = {'temperature': -20, 'humidity': 10, 'pressure': 900, 'wind_speed': 0, 'wind_direction': 0,
+           'precipitation': 0, 'visibility': 0, 'cloud_cover': 0}
+    high = {'temperature': 50, 'humidity': 100, 'pressure': 1100, 'wind_speed': 60, 'wind_direction': 360,
+            'precipitation': 100, 'visibility': 25, 'cloud_cover': 100}
+    values = {name: rng.uniform(low[name], high[name], num_samples) for name in low}
+    records = [dict(zip(values, row)) for row in zip(*(v.tolist() for v in values.values()))]
+
+    screen = screen or CascadeScreen([h for h in RULE_HAZARDS if RULE_RISK_DIRECTIONS[h]])
+    masks = screen.screen(weather_columns(records))
+    model_risks = service._predict_batch(records, cascade=False)
+    report = {}
+    for disaster_type, needs_model in masks.items():
+        risks = np.array([p[disaster_type] for p in model_risks])
+        screened = ~needs_model
+        report[disaster_type] = {
+            'screen_out_rate': float(screened.mean()),
+            'miss_rate': float((screened & (risks >= CASCADE_MISS_RISK)).mean()),
+            'max_screened_risk': float(risks[screened].max()) if screened.any() else 0.0,
+        }
+    return report
+
+def main(service: Optional[Any] = None):
+    if service is None:
+        from ai_models import ai_prediction_service as service
+    # Every hazard the rules can screen, with the service's threshold and margins when cascading is on
+    configured = service.cascade
+    screen = CascadeScreen([h for h in RULE_HAZARDS if RULE_RISK_DIRECTIONS[h]],
+                           threshold=configured.threshold if configured else 0.05,
+                           margins=configured.margins if configured else None)
+    print("🪜 DisastroScope Cascade Screen Calibration")
+    print("=" * 50)
+    print(f"Threshold: {screen.threshold}, margins: {screen.margins}")
+    print(f"Misses: screened-out records the model scores at {CASCADE_MISS_RISK} or above")
+    for disaster_type, result in calibrate(service, screen=screen).items():
+        print(f"   {disaster_type:<10} screened out {result['screen_out_rate']:6.1%}, "
+              f"missed {result['miss_rate']:6.2%}, max screened risk {result['max_screened_risk']:.2f}")
+
+if __name__ == "__main__":
+    main()
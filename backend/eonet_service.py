@@ -3,6 +3,8 @@ from dataclasses import dataclass, asdict
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+from http_session import http_sessions
+
 EONET_BASE = "https://eonet.gsfc.nasa.gov/api/v3"
 
 @dataclass
@@ -32,7 +34,7 @@ class EONETService:
         if category:
             params.append(f"category={category}")
         url = f"{EONET_BASE}/events?" + "&".join(params)
-        async with aiohttp.ClientSession() as session:
+        async with http_sessions.session() as session:
             data = await self._fetch(session, url)
             items = data.get("events", [])
             results: List[EONETEvent] = []
@@ -0,0 +1,71 @@
+"""Declarative weather feature schema of the hazard models.
+
+WEATHER_FEATURES is the column order of the feature matrix a batch is scored
+from; HAZARD_FEATURES lists the columns each hazard model was trained on. A
+batch is converted once, straight from WeatherData objects or feature dicts,
+into one contiguous float32 matrix, and every hazard gathers its inputs from it
+through a fixed column index instead of rebuilding its own lists. The hazards'
+columns overlap in different orders, so that gather is a small copy, not a view.
+"""
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+# Canonical weather feature order shared by all hazard models
+WEATHER_FEATURES: List[str] = [
+    'temperature', 'humidity', 'pressure', 'wind_speed',
+    'wind_direction', 'precipitation', 'visibility', 'cloud_cover'
+]
+
+# Weather feature columns expected by each hazard model, in training order
+HAZARD_FEATURES: Dict[str, List[str]] = {
+    'flood': ['temperature', 'humidity', 'pressure', 'wind_speed', 'precipitation', 'visibility', 'cloud_cover'],
+    'wildfire': ['temperature', 'humidity', 'wind_speed', 'precipitation', 'visibility'],
+    'storm': ['temperature', 'humidity', 'pressure', 'wind_speed', 'wind_direction', 'cloud_cover'],
+    'earthquake': ['pressure', 'wind_speed', 'temperature', 'humidity', 'cloud_cover'],
+    'tornado': ['temperature', 'humidity', 'pressure', 'wind_speed', 'wind_direction', 'cloud_cover'],
+    'landslide': ['temperature', 'humidity', 'precipitation', 'wind_speed', 'pressure'],
+    'drought': ['temperature', 'humidity', 'precipitation', 'wind_speed', 'pressure'],
+}
+
+# Position of each hazard's columns in the feature matrix
+HAZARD_FEATURE_INDEX: Dict[str, np.ndarray] = {
+    disaster_type: np.array([WEATHER_FEATURES.index(column) for column in columns], dtype=np.intp)
+    for disaster_type, columns in HAZARD_FEATURES.items()
+}
+
+_record_values = itemgetter(*WEATHER_FEATURES)
+_attribute_values = attrgetter(*WEATHER_FEATURES)
+
+def weather_features(weather: Any) -> Dict[str, float]:
+    """The model features of a WeatherData object (or feature dict), in WEATHER_FEATURES order"""
+    values = _record_values(weather) if isinstance(weather, Mapping) else _attribute_values(weather)
+    return dict(zip(WEATHER_FEATURES, values))
+
+def feature_matrix(weather_records: Sequence[Any]) -> np.ndarray:
+    """C-contiguous float32 (N, len(WEATHER_FEATURES)) matrix of WeatherData objects or feature dicts.
+    A feature a record does not provide (or that is None) is NaN; the hazards that need it are
+    scored for that record by the rule-based fallback."""
+    try:
+        rows = [
+            _record_values(record) if isinstance(record, Mapping) else _attribute_values(record)
+            for record in weather_records
+        ]
+        return np.array(rows, dtype=np.float32).reshape(len(weather_records), len(WEATHER_FEATURES))
+    except (KeyError, AttributeError, TypeError):
+        pass
+    # Incomplete records: look the features up one by one
+    matrix = np.full((len(weather_records), len(WEATHER_FEATURES)), np.nan, dtype=np.float32)
+    for i, record in enumerate(weather_records):
+        source = record if isinstance(record, Mapping) else vars(record)
+        for j, name in enumerate(WEATHER_FEATURES):
+            value = source.get(name)
+            if value is not None:
+                matrix[i, j] = value
+    return matrix
+
+def hazard_features(features: np.ndarray, disaster_type: str) -> np.ndarray:
+    """The columns of one hazard model, in training order, copied out of the feature matrix.
+    (N, k) float32 for a k-input model; the matrix itself is not copied or modified."""
+    return features.take(HAZARD_FEATURE_INDEX[disaster_type], axis=1)
@@ -0,0 +1,83 @@
+"""Spatial bucketing of coordinates for weather cache keys.
+
+Weather lookups are snapped to a cell and fetched at the cell centroid, so
+nearby requests (users a few hundred metres apart, jittery mobile GPS) share
+one cache entry and one upstream fetch. Cells are either a fixed degree grid
+('grid:0.01' is about 1.1 km of latitude) or geohash cells ('geohash:6' is
+about 1.2 x 0.6 km); 'off' keys on the exact coordinates.
+"""
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+# Cache cell for weather lookups: 'grid:<degrees>', 'geohash:<precision>' or 'off'
+WEATHER_CACHE_CELL: str = os.getenv('WEATHER_CACHE_CELL', 'grid:0.01')
+
+_GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+@dataclass(frozen=True)
+class GeoCell:
+    """A cache cell: its key and the centroid weather is fetched for"""
+    id: str
+    lat: float
+    lon: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.id, 'lat': self.lat, 'lng': self.lon}
+
+def geohash(lat: float, lon: float, precision: int) -> Tuple[str, float, float]:
+    """Geohash of a point and the centroid of its cell"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, interval = (lon, lon_range) if even else (lat, lat_range)
+        mid = (interval[0] + interval[1]) / 2
+        bit = value >= mid
+        interval[0 if bit else 1] = mid
+        bits = (bits << 1) | bit
+        bit_count += 1
+        even = not even
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = bit_count = 0
+    return ''.join(chars), (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+class CellSnapper:
+    """Maps coordinates to cache cells according to a 'grid:<deg>' / 'geohash:<n>' / 'off' spec"""
+
+    def __init__(self, spec: str = WEATHER_CACHE_CELL):
+        scheme, _, value = spec.strip().lower().partition(':')
+        if scheme in ('', 'off', 'none'):
+            self.scheme, self.resolution = 'off', None
+        elif scheme == 'grid':
+            self.scheme, self.resolution = 'grid', float(value)
+            if not self.resolution > 0:
+                raise ValueError(f"Grid cell size must be positive: {spec!r}")
+        elif scheme == 'geohash':
+            self.scheme, self.resolution = 'geohash', int(value)
+            if not 1 <= self.resolution <= 12:
+                raise ValueError(f"Geohash precision must be between 1 and 12: {spec!r}")
+        else:
+            raise ValueError(f"Unknown weather cache cell scheme: {spec!r}")
+
+    def snap(self, lat: float, lon: float) -> GeoCell:
+        if self.scheme == 'off':
+            return GeoCell(f"{lat}_{lon}", lat, lon)
+        lat = min(max(float(lat), -90.0), 90.0)
+        lon = (float(lon) + 180.0) % 360.0 - 180.0
+        if self.scheme == 'grid':
+            size = self.resolution
+            # Latitude 90 falls into the top row (longitude 180 already wrapped to -180)
+            row = min(math.floor(lat / size), math.ceil(90.0 / size) - 1)
+            col = math.floor(lon / size)
+            centroid_lat = min((row + 0.5) * size, 90.0)
+            centroid_lon = min((col + 0.5) * size, 180.0)
+            return GeoCell(f"g{size:g}:{row}:{col}", round(centroid_lat, 6), round(centroid_lon, 6))
+        cell_id, centroid_lat, centroid_lon = geohash(lat, lon, self.resolution)
+        return GeoCell(cell_id, round(centroid_lat, 6), round(centroid_lon, 6))
+
+    def stats(self) -> Dict[str, Any]:
+        return {'scheme': self.scheme, 'resolution': self.resolution}
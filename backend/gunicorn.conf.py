@@ -0,0 +1,8 @@
+# gunicorn picks this file up from the working directory (see Procfile)
+
+def post_worker_init(worker):
+    """Startup work of the serving process, after the worker loaded the app (and eventlet patched it).
+    Stale artifacts are only scheduled for retraining here: the job runs in the background, with the
+    training itself on an OS thread, so the worker serves the current models meanwhile."""
+    from app import ai_prediction_service
+    ai_prediction_service.train_on_startup()
@@ -0,0 +1,88 @@
+"""Pooled aiohttp sessions shared by the provider clients.
+
+aiohttp sessions are bound to the event loop they were created on, so the
+manager keeps one ClientSession per loop. In the app all provider calls run on
+the persistent loop of the async bridge, so they share one pool: keep-alive
+connections (no new TCP/TLS handshake) and cached DNS answers are reused across
+requests instead of opening a fresh session per request.
+"""
+import asyncio
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Connection pool per event loop: total and per-host connection limits, idle keep-alive (s),
+# DNS cache TTL (s) and the default total timeout of a request (s)
+HTTP_POOL_LIMIT: int = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '10'))
+HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))
+HTTP_DNS_TTL: int = int(os.getenv('HTTP_DNS_TTL', '300'))
+HTTP_TIMEOUT: float = float(os.getenv('HTTP_TIMEOUT', '30'))
+
+class SessionManager:
+    """One pooled ClientSession per event loop, created on first use on that loop"""
+
+    def __init__(self, limit: int = HTTP_POOL_LIMIT, limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+                 keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT, dns_ttl: int = HTTP_DNS_TTL,
+                 timeout: float = HTTP_TIMEOUT):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_ttl = dns_ttl
+        self.timeout = timeout
+        # A session references its loop, so nothing is released implicitly: each loop's
+        # session is closed explicitly (the async bridge does it when it stops)
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._lock = threading.Lock()
+        self.sessions_created = 0
+
+    async def get(self) -> aiohttp.ClientSession:
+        """The pooled session of the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+        if session is None or session.closed:
+            # Only this loop's thread creates its session, and nothing is awaited in between
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout, ttl_dns_cache=self.dns_ttl
+            )
+            session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+            with self._lock:
+                self._sessions[loop] = session
+                self.sessions_created += 1
+        return session
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """`async with` access to the pooled session; leaving the block keeps it open"""
+        yield await self.get()
+
+    async def close(self):
+        """Close the running loop's session and its connections"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            open_sessions = sum(1 for session in self._sessions.values() if not session.closed)
+        return {
+            'open_sessions': open_sessions,
+            'sessions_created': self.sessions_created,
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host,
+            'keepalive_timeout': self.keepalive_timeout,
+            'dns_ttl': self.dns_ttl,
+        }
+
+# Shared by every provider client
+http_sessions = SessionManager()
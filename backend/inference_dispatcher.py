@@ -0,0 +1,144 @@
+"""Micro-batching of concurrent single-record predictions.
+
+Request threads submit one weather record each and wait on a future. A worker
+thread collects submissions for up to a short window (or until the batch is
+full), scores them with one batched call and resolves every caller's future.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the batch-size histogram buckets
+BATCH_SIZE_BUCKETS: List[int] = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+class MicroBatchDispatcher:
+    """Coalesces concurrent predict() calls into batched predict_batch calls.
+    The worker thread starts on first use. predict() waits at most timeout seconds."""
+
+    def __init__(self, predict_batch: Callable[[List[Dict]], List[Dict]], window_ms: float = 2.0,
+                 max_batch_size: int = 64, timeout: float = 5.0):
+        self.predict_batch = predict_batch
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.timeout = timeout
+        self._queue: "queue.Queue[Optional[Tuple[Dict, Future]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self.requests = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.max_queue_depth = 0
+        self.timeouts = 0
+        self.batch_size_histogram: Dict[str, int] = {f"<={bound}": 0 for bound in BATCH_SIZE_BUCKETS}
+        self.batch_size_histogram[f">{BATCH_SIZE_BUCKETS[-1]}"] = 0
+
+    def submit(self, record: Dict) -> Future:
+        """Queue a record for the next batch; the future resolves to its predictions"""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Dispatcher is closed")
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='inference-dispatcher', daemon=True)
+                self._worker.start()
+            self._queue.put((record, future))
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return future
+
+    def predict(self, record: Dict, timeout: Optional[float] = None) -> Dict:
+        """Predictions for one record; raises concurrent.futures.TimeoutError after timeout seconds
+        (default: the dispatcher's), e.g. if the worker thread died, and withdraws the request"""
+        future = self.submit(record)
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except FuturesTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise
+
+    def close(self):
+        """Stop the worker after it has resolved the queued requests"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            worker = self._worker
+        self._queue.put(None)
+        if worker is not None:
+            worker.join()
+
+    def _collect(self, first: Tuple[Dict, Future]) -> Tuple[List[Tuple[Dict, Future]], bool]:
+        """Gather a batch starting with first; returns (batch, stop)"""
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                # Requests that queued up while the previous batch ran are taken without waiting
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stop = self._collect(first)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Dict, Future]]):
+        batch = [(record, future) for record, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        with self._lock:
+            self.requests += len(batch)
+            self.batches += 1
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            bucket = next((f"<={bound}" for bound in BATCH_SIZE_BUCKETS if len(batch) <= bound),
+                          f">{BATCH_SIZE_BUCKETS[-1]}")
+            self.batch_size_histogram[bucket] += 1
+        try:
+            results = self.predict_batch([record for record, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # One malformed record must not fail its neighbours: score them one by one
+            logger.warning(f"Batched prediction failed for {len(batch)} requests, retrying individually: {e}")
+            for record, future in batch:
+                try:
+                    future.set_result(self.predict_batch([record])[0])
+                except Exception as record_error:
+                    future.set_exception(record_error)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'window_ms': self.window * 1000.0,
+                'max_batch_size': self.max_batch_size,
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'requests': self.requests,
+                'batches': self.batches,
+                'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+                'max_batch_seen': self.max_batch_seen,
+                'timeouts': self.timeouts,
+                'worker_alive': self._worker is not None and self._worker.is_alive(),
+                'batch_size_histogram': dict(self.batch_size_histogram),
+            }
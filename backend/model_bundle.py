@@ -0,0 +1,113 @@
+"""Versioned single-file bundle for the hazard model weights.
+
+Layout::
+
+    MAGIC (8 bytes) | manifest length (uint64, little-endian) | JSON manifest | padding | float32 data
+
+The manifest records the offset and shape of every array in the data section and
+a SHA-256 checksum of that section. The data section is memory-mapped read-only,
+so every worker process on a host shares the same physical pages instead of
+unpickling private copies.
+"""
+import hashlib
+import json
+import os
+import struct
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+BUNDLE_FILENAME = 'hazard_models.bundle'
+BUNDLE_MAGIC = b'DSMODEL\x00'
+BUNDLE_FORMAT_VERSION = 1
+# Data section alignment in bytes
+BUNDLE_ALIGNMENT = 64
+
+def write_bundle(path: str, hazards: Dict[str, Dict[str, np.ndarray]], metadata: Optional[Dict[str, Any]] = None):
+    """Atomically write named float32 arrays per hazard to a bundle file.
+    The bundle is written to a temporary file and renamed over path, so readers never see a partial file."""
+    layout: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    chunks: List[np.ndarray] = []
+    offset = 0
+    for hazard, arrays in hazards.items():
+        layout[hazard] = {}
+        for name, array in arrays.items():
+            data = np.asarray(array, dtype='<f4', order='C')
+            layout[hazard][name] = {'offset': offset, 'shape': list(data.shape)}
+            chunks.append(data.ravel())
+            offset += data.size
+    payload = np.concatenate(chunks).tobytes() if chunks else b''
+
+    manifest = {
+        'format': 'disastroscope-model-bundle',
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'dtype': 'float32',
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'metadata': metadata or {},
+        'checksum': {'algorithm': 'sha256', 'value': hashlib.sha256(payload).hexdigest()},
+        'data_elements': offset,
+        'hazards': layout,
+    }
+    manifest_bytes = json.dumps(manifest, sort_keys=True).encode('utf-8')
+    header_size = len(BUNDLE_MAGIC) + 8 + len(manifest_bytes)
+    padding = -header_size % BUNDLE_ALIGNMENT
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(BUNDLE_MAGIC)
+            f.write(struct.pack('<Q', len(manifest_bytes)))
+            f.write(manifest_bytes)
+            f.write(b'\x00' * padding)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+class ModelBundle:
+    """Read-only, memory-mapped view of a bundle written by write_bundle"""
+
+    def __init__(self, path: str, verify: bool = True):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+                raise ValueError(f"{path} is not a model bundle")
+            (manifest_size,) = struct.unpack('<Q', f.read(8))
+            self.manifest: Dict[str, Any] = json.loads(f.read(manifest_size).decode('utf-8'))
+        if self.manifest.get('format_version') != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported model bundle version {self.manifest.get('format_version')}")
+
+        header_size = len(BUNDLE_MAGIC) + 8 + manifest_size
+        data_offset = header_size + (-header_size % BUNDLE_ALIGNMENT)
+        num_elements = int(self.manifest['data_elements'])
+        if num_elements:
+            self._data = np.memmap(path, dtype='<f4', mode='r', offset=data_offset, shape=(num_elements,))
+        else:
+            self._data = np.zeros(0, dtype='<f4')
+
+        if verify:
+            checksum = hashlib.sha256(self._data).hexdigest()
+            if checksum != self.manifest['checksum']['value']:
+                raise ValueError(f"Checksum mismatch in model bundle {path}")
+
+    @property
+    def hazards(self) -> List[str]:
+        return list(self.manifest['hazards'])
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.manifest.get('metadata', {})
+
+    def arrays(self, hazard: str) -> Dict[str, np.ndarray]:
+        """Zero-copy views of one hazard's arrays"""
+        views = {}
+        for name, spec in self.manifest['hazards'][hazard].items():
+            shape = tuple(spec['shape'])
+            size = int(np.prod(shape)) if shape else 1
+            start = spec['offset']
+            views[name] = self._data[start:start + size].reshape(shape)
+        return views
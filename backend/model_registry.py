@@ -0,0 +1,130 @@
+"""Lazy, memory-bounded store for per-hazard prediction models.
+
+Hazard models are materialized on first use through a loader callback. When the
+resident models exceed the memory budget, the least recently used ones are
+evicted and reloaded the next time they are needed.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+@dataclass
+class ResidentModel:
+    """A materialized hazard model with its scaler, optional folded inference graph and
+    optional int8 version of that graph. model and scaler are None when no trained
+    artifacts exist for the hazard."""
+    model: Any
+    scaler: Any
+    compiled: Any = None
+    quantized: Any = None
+    nbytes: int = 0
+    loaded_at: float = 0.0
+    last_used: float = 0.0
+
+def estimate_nbytes(obj: Any) -> int:
+    """Approximate in-memory size of model weights (torch modules, NumPy models, scalers)"""
+    if obj is None:
+        return 0
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (list, tuple)):
+        return sum(estimate_nbytes(item) for item in obj)
+    if hasattr(obj, 'parameters') and hasattr(obj, 'buffers'):
+        tensors = list(obj.parameters()) + list(obj.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    if hasattr(obj, '__dict__'):
+        return sum(estimate_nbytes(value) for value in vars(obj).values()
+                   if isinstance(value, (np.ndarray, list, tuple)))
+    return 0
+
+class LazyModelRegistry:
+    """Thread-safe registry that loads hazard models on demand and evicts them LRU-first.
+    A memory budget of 0 disables eviction."""
+
+    def __init__(self, loader: Callable[[str], ResidentModel], memory_budget_bytes: int = 0):
+        self._loader = loader
+        self.memory_budget_bytes = memory_budget_bytes
+        self._resident: "OrderedDict[str, ResidentModel]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, hazard: str) -> ResidentModel:
+        """Return the resident model for a hazard, loading it if needed"""
+        with self._lock:
+            entry = self._resident.get(hazard)
+            if entry is None:
+                entry = self._loader(hazard)
+                entry.nbytes = estimate_nbytes(entry.model) + estimate_nbytes(entry.scaler) + estimate_nbytes(entry.compiled)
+                entry.loaded_at = time.time()
+                self._resident[hazard] = entry
+                self.loads += 1
+                self._evict_over_budget(keep=hazard)
+            else:
+                self._resident.move_to_end(hazard)
+            entry.last_used = time.time()
+            return entry
+
+    def is_resident(self, hazard: str) -> bool:
+        with self._lock:
+            return hazard in self._resident
+
+    def resident(self) -> Dict[str, ResidentModel]:
+        """Snapshot of the resident models, least recently used first"""
+        with self._lock:
+            return dict(self._resident)
+
+    def evict(self, hazard: str) -> bool:
+        with self._lock:
+            if self._resident.pop(hazard, None) is None:
+                return False
+            self.evictions += 1
+            return True
+
+    def clear(self):
+        """Drop every resident model, e.g. after retraining replaced the artifacts"""
+        with self._lock:
+            self._resident.clear()
+
+    @property
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.nbytes for entry in self._resident.values())
+
+    def _evict_over_budget(self, keep: str):
+        if self.memory_budget_bytes <= 0:
+            return
+        while self.resident_bytes > self.memory_budget_bytes and len(self._resident) > 1:
+            hazard = next(h for h in self._resident if h != keep)
+            self.evict(hazard)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'resident': {
+                    hazard: {
+                        'bytes': entry.nbytes,
+                        'trained': entry.model is not None,
+                        'folded': entry.compiled is not None,
+                        'quantized': entry.quantized is not None,
+                        'last_used': entry.last_used,
+                    }
+                    for hazard, entry in self._resident.items()
+                },
+                'resident_bytes': self.resident_bytes,
+                'memory_budget_bytes': self.memory_budget_bytes,
+                'loads': self.loads,
+                'evictions': self.evictions,
+            }
+
+@dataclass
+class ServingModels:
+    """One published generation of models: the bundle they load from, their registry and the
+    optional fused model. Replaced as a whole, by a single reference swap, when models are retrained."""
+    registry: LazyModelRegistry
+    bundle: Any = None
+    fused_model: Any = None
@@ -0,0 +1,178 @@
+"""Torch-free inference for the hazard prediction networks.
+
+Each trained PyTorch model is exported, together with its scaler statistics, to
+plain named float32 arrays (stored in the model bundle, see model_bundle).
+NumpyHazardModel evaluates the same eval-mode forward pass (Linear + BatchNorm +
+ReLU, sigmoid output) so inference-only workers never need to import torch or sklearn.
+
+FoldedHazardModel is the compiled form used on the hot path: the input scaler and
+every BatchNorm are folded into the adjacent Linear weights, leaving four affine
+layers applied directly to raw weather features.
+
+Both can also run the network with its dropout active (Monte-Carlo dropout) to
+sample a distribution of risks per record; BatchNorm keeps its running statistics.
+"""
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Layer names of DisasterPredictionModel, in forward order
+LINEAR_LAYERS: List[str] = ['fc1', 'fc2', 'fc3', 'fc4']
+BATCH_NORM_LAYERS: List[str] = ['batch_norm1', 'batch_norm2', 'batch_norm3']
+# Dropout of DisasterPredictionModel: applied after the first DROPOUT_LAYERS hidden layers
+DROPOUT_RATE: float = 0.3
+DROPOUT_LAYERS: int = 2
+
+def _sigmoid(logits: np.ndarray) -> np.ndarray:
+    # Numerically stable sigmoid
+    return np.exp(-np.logaddexp(0.0, -logits))
+
+def mc_dropout_samples(layers: List[Callable[[np.ndarray], np.ndarray]], x: np.ndarray, num_samples: int,
+                       rng: Optional[np.random.Generator] = None, dropout_rate: float = DROPOUT_RATE) -> np.ndarray:
+    """(num_samples, N) risks from stochastic forward passes through affine layers (ReLU after all but
+    the last) with dropout active. The first layer runs once on the N rows; its output is replicated
+    into one (num_samples * N)-row batch for the remaining layers."""
+    rng = rng or np.random.default_rng()
+    keep = 1.0 - dropout_rate
+    x = np.maximum(layers[0](x), 0.0)
+    num_rows = x.shape[0]
+    x = np.tile(x, (num_samples, 1))
+    for i, layer in enumerate(layers[1:], start=1):
+        if i <= DROPOUT_LAYERS and dropout_rate > 0:
+            x *= rng.random(x.shape, dtype=np.float32) < keep
+            x *= np.float32(1.0 / keep)
+        x = layer(x)
+        if i < len(layers) - 1:
+            np.maximum(x, 0.0, out=x)
+    return _sigmoid(x[:, 0]).reshape(num_samples, num_rows)
+
+class NumpyScaler:
+    """Minimal StandardScaler replacement holding only the fitted mean and scale"""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+
+    def transform(self, X) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+class NumpyHazardModel:
+    """Eval-mode forward pass of DisasterPredictionModel implemented with NumPy"""
+
+    def __init__(self, params: Dict[str, np.ndarray]):
+        self.layers: List[Tuple[np.ndarray, np.ndarray]] = []
+        for name in LINEAR_LAYERS:
+            # Transposed views (no copy) so memory-mapped weights stay shared; the forward pass is x @ W
+            weight = np.asarray(params[f'{name}.weight'], dtype=np.float32).T
+            bias = np.asarray(params[f'{name}.bias'], dtype=np.float32)
+            self.layers.append((weight, bias))
+        self.norms: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        for name in BATCH_NORM_LAYERS:
+            eps = float(params[f'{name}.eps'])
+            self.norms.append((
+                np.asarray(params[f'{name}.running_mean'], dtype=np.float32),
+                np.sqrt(np.asarray(params[f'{name}.running_var'], dtype=np.float32) + np.float32(eps)),
+                np.asarray(params[f'{name}.weight'], dtype=np.float32),
+                np.asarray(params[f'{name}.bias'], dtype=np.float32),
+            ))
+
+    def predict(self, features_scaled) -> np.ndarray:
+        """Return one risk per row of already-scaled features"""
+        x = np.asarray(features_scaled, dtype=np.float32)
+        for (weight, bias), (mean, std, gamma, beta) in zip(self.layers, self.norms):
+            x = (x @ weight + bias - mean) / std * gamma + beta
+            np.maximum(x, 0.0, out=x)
+        weight, bias = self.layers[-1]
+        logits = (x @ weight + bias)[:, 0]
+        return _sigmoid(logits)
+
+    def predict_samples(self, features_scaled, num_samples: int, rng: Optional[np.random.Generator] = None,
+                        dropout_rate: float = DROPOUT_RATE) -> np.ndarray:
+        """(num_samples, N) Monte-Carlo dropout risks for rows of already-scaled features"""
+        def hidden(weight, bias, mean, std, gamma, beta):
+            return lambda x: (x @ weight + bias - mean) / std * gamma + beta
+        weight, bias = self.layers[-1]
+        layers = [hidden(*layer, *norm) for layer, norm in zip(self.layers, self.norms)]
+        layers.append(lambda x: x @ weight + bias)
+        x = np.asarray(features_scaled, dtype=np.float32)
+        return mc_dropout_samples(layers, x, num_samples, rng, dropout_rate)
+
+class FoldedHazardModel:
+    """Hazard network compiled to four affine layers over raw (unscaled) features.
+    ReLU follows the first three layers and a sigmoid the last one."""
+
+    def __init__(self, layers: List[Tuple[np.ndarray, np.ndarray]]):
+        self.layers = layers
+
+    def predict(self, features) -> np.ndarray:
+        """Return one risk per row of raw features"""
+        x = np.asarray(features, dtype=np.float32)
+        for weight, bias in self.layers[:-1]:
+            x = x @ weight + bias
+            np.maximum(x, 0.0, out=x)
+        weight, bias = self.layers[-1]
+        logits = (x @ weight + bias)[:, 0]
+        return _sigmoid(logits)
+
+    def predict_samples(self, features, num_samples: int, rng: Optional[np.random.Generator] = None,
+                        dropout_rate: float = DROPOUT_RATE) -> np.ndarray:
+        """(num_samples, N) Monte-Carlo dropout risks for rows of raw features.
+        BatchNorm is folded into the weights, so it stays frozen at its running statistics."""
+        layers = [lambda x, weight=weight, bias=bias: x @ weight + bias for weight, bias in self.layers]
+        x = np.asarray(features, dtype=np.float32)
+        return mc_dropout_samples(layers, x, num_samples, rng, dropout_rate)
+
+def fold_hazard_model(model: NumpyHazardModel, scaler) -> FoldedHazardModel:
+    """Fold the scaler into the first Linear layer and each BatchNorm into the Linear before it.
+    Works with a fitted sklearn StandardScaler or a NumpyScaler. Folding runs in float64."""
+    layers = [(weight.astype(np.float64), bias.astype(np.float64)) for weight, bias in model.layers]
+
+    # (x - mean) / scale @ W + b  ==  x @ (W / scale) + (b - (mean / scale) @ W)
+    mean = np.asarray(scaler.mean_, dtype=np.float64)
+    scale = np.asarray(scaler.scale_, dtype=np.float64)
+    weight, bias = layers[0]
+    layers[0] = (weight / scale[:, None], bias - (mean / scale) @ weight)
+
+    # ((x @ W + b) - rm) / std * gamma + beta  ==  x @ (W * k) + ((b - rm) * k + beta),  k = gamma / std
+    for i, (running_mean, std, gamma, beta) in enumerate(model.norms):
+        k = gamma.astype(np.float64) / std.astype(np.float64)
+        weight, bias = layers[i]
+        layers[i] = (weight * k, (bias - running_mean) * k + beta)
+
+    return FoldedHazardModel([
+        (np.ascontiguousarray(weight, dtype=np.float32), bias.astype(np.float32))
+        for weight, bias in layers
+    ])
+
+def torch_model_params(model) -> Dict[str, np.ndarray]:
+    """Eval-mode parameters of a PyTorch DisasterPredictionModel as NumPy arrays"""
+    params = {
+        key: value.detach().cpu().numpy()
+        for key, value in model.state_dict().items()
+        if not key.endswith('num_batches_tracked')
+    }
+    for name in BATCH_NORM_LAYERS:
+        params[f'{name}.eps'] = np.array(getattr(model, name).eps)
+    return params
+
+def hazard_arrays(params: Dict[str, np.ndarray], scaler) -> Dict[str, np.ndarray]:
+    """Named arrays describing one trained hazard model: network parameters,
+    scaler statistics and the precomputed folded graph"""
+    arrays = dict(params)
+    arrays['scaler.mean'] = np.asarray(scaler.mean_, dtype=np.float64)
+    arrays['scaler.scale'] = np.asarray(scaler.scale_, dtype=np.float64)
+    folded = fold_hazard_model(NumpyHazardModel(params), scaler)
+    for i, (weight, bias) in enumerate(folded.layers):
+        arrays[f'folded.{i}.weight'] = weight
+        arrays[f'folded.{i}.bias'] = bias
+    return arrays
+
+def model_from_arrays(arrays: Dict[str, np.ndarray]) -> Tuple[NumpyHazardModel, NumpyScaler, Optional[FoldedHazardModel]]:
+    """Rebuild a hazard model from hazard_arrays output without copying the weights"""
+    scaler = NumpyScaler(arrays['scaler.mean'], arrays['scaler.scale'])
+    folded = None
+    if f'folded.{len(LINEAR_LAYERS) - 1}.weight' in arrays:
+        folded = FoldedHazardModel([
+            (arrays[f'folded.{i}.weight'], arrays[f'folded.{i}.bias'])
+            for i in range(len(LINEAR_LAYERS))
+        ])
+    return NumpyHazardModel(arrays), scaler, folded
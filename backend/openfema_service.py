@@ -4,6 +4,8 @@ from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 
+from http_session import http_sessions
+
 OPENFEMA_BASE = "https://www.fema.gov/api/open/v2"
 
 @dataclass
@@ -41,7 +43,7 @@ class OpenFEMAService:
             f"{OPENFEMA_BASE}/DisasterDeclarationsSummaries?"
             f"$filter={filter_q}&$orderby=declarationDate desc&$top={top}"
         )
-        async with aiohttp.ClientSession() as session:
+        async with http_sessions.session() as session:
             data = await self._fetch(session, url)
             items = data.get("DisasterDeclarationsSummaries", [])
             results: List[FEMADeclaration] = []
@@ -0,0 +1,116 @@
+"""Memoization of hazard predictions keyed on quantized weather features.
+
+Near-identical weather vectors (e.g. repeated background cycles for a city whose
+conditions have not changed) map to the same key once every feature is snapped to
+its resolution, so they are served from the cache instead of the models.
+"""
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Default quantization step per weather feature, in the units of WeatherData
+DEFAULT_FEATURE_RESOLUTIONS: Dict[str, float] = {
+    'temperature': 0.1,      # °C
+    'humidity': 1.0,         # % RH
+    'pressure': 0.5,         # hPa
+    'wind_speed': 0.5,       # m/s
+    'wind_direction': 5.0,   # degrees
+    'precipitation': 0.1,    # mm
+    'visibility': 0.1,       # km
+    'cloud_cover': 1.0,      # %
+}
+
+def parse_feature_resolutions(spec: str) -> Dict[str, float]:
+    """Parse 'temperature=0.2,humidity=2' into resolution overrides"""
+    resolutions: Dict[str, float] = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        name, _, value = item.partition('=')
+        resolutions[name.strip().lower()] = float(value)
+    return resolutions
+
+class PredictionCache:
+    """Thread-safe LRU cache of per-record hazard predictions.
+    A capacity of 0 disables caching."""
+
+    def __init__(self, feature_names: List[str], capacity: int = 4096,
+                 resolutions: Optional[Dict[str, float]] = None):
+        self.feature_names = list(feature_names)
+        self.capacity = capacity
+        self.resolutions = dict(DEFAULT_FEATURE_RESOLUTIONS)
+        self.resolutions.update(resolutions or {})
+        self._entries: "OrderedDict[Tuple[int, ...], Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on invalidation so predictions computed by the old models are not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def key(self, record: Any) -> Optional[Tuple[int, ...]]:
+        """Quantized feature vector of a record (feature dict or WeatherData), or None if it cannot be cached"""
+        if not isinstance(record, Mapping):
+            record = vars(record)
+        key = []
+        for name in self.feature_names:
+            try:
+                value = float(record[name])
+            except (KeyError, TypeError, ValueError):
+                return None
+            if not math.isfinite(value):
+                return None
+            resolution = self.resolutions.get(name)
+            key.append(round(value / resolution) if resolution else value)
+        return tuple(key)
+
+    def get(self, key: Tuple[int, ...], count_miss: bool = True) -> Optional[Dict[str, float]]:
+        """Cached predictions for key; pass count_miss=False for a probe that is retried on the batch path"""
+        with self._lock:
+            predictions = self._entries.get(key)
+            if predictions is None:
+                if count_miss:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(predictions)
+
+    def put(self, key: Tuple[int, ...], predictions: Dict[str, float], generation: int):
+        """Store predictions computed while the cache was at the given generation"""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = dict(predictions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry, e.g. after the models were retrained"""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'resolutions': dict(self.resolutions),
+            }
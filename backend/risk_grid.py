@@ -0,0 +1,128 @@
+"""Risk rasters for a bounding box.
+
+Weather is fetched at every node of a regular lat/lon grid, all nodes are scored
+in one batched prediction call, and each hazard's risks are returned as a compact
+row-major float32 array (base64 encoded) instead of one request per map point.
+"""
+import asyncio
+import base64
+import logging
+import math
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from feature_schema import HAZARD_FEATURES
+
+logger = logging.getLogger(__name__)
+
+# Largest number of grid nodes served by one request (each node is a weather lookup)
+RISK_GRID_MAX_NODES: int = int(os.getenv('RISK_GRID_MAX_NODES', '400'))
+# Concurrent weather lookups while building a grid
+RISK_GRID_FETCH_CONCURRENCY: int = int(os.getenv('RISK_GRID_FETCH_CONCURRENCY', '16'))
+
+class GridRequestError(ValueError):
+    """Invalid bounding box, resolution or hazard list"""
+
+def parse_bbox(spec: str) -> Tuple[float, float, float, float]:
+    """Parse 'min_lon,min_lat,max_lon,max_lat' (degrees)"""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(value) for value in spec.split(','))
+    except (AttributeError, ValueError):
+        raise GridRequestError("bbox must be 'min_lon,min_lat,max_lon,max_lat'")
+    if not all(math.isfinite(v) for v in (min_lon, min_lat, max_lon, max_lat)):
+        raise GridRequestError("bbox values must be finite")
+    if not (-180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise GridRequestError("bbox must satisfy -180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90")
+    return min_lon, min_lat, max_lon, max_lat
+
+def parse_resolution(spec: Optional[str], default: float = 0.5) -> float:
+    """Parse the grid spacing in degrees; absent means default"""
+    if spec is None or not spec.strip():
+        return default
+    try:
+        resolution = float(spec)
+    except ValueError:
+        raise GridRequestError("resolution must be a number of degrees")
+    if not math.isfinite(resolution) or resolution <= 0:
+        raise GridRequestError("resolution must be a positive number of degrees")
+    return resolution
+
+def parse_hazards(spec: Optional[str]) -> List[str]:
+    """Parse 'flood,storm' into hazard names; empty means every hazard"""
+    hazards = [h.strip().lower() for h in (spec or '').split(',') if h.strip()]
+    unknown = [h for h in hazards if h not in HAZARD_FEATURES]
+    if unknown:
+        raise GridRequestError(f"Unknown hazards: {', '.join(unknown)}")
+    return hazards or list(HAZARD_FEATURES)
+
+def grid_axes(bbox: Tuple[float, float, float, float], resolution: float,
+              max_nodes: int = RISK_GRID_MAX_NODES) -> Tuple[np.ndarray, np.ndarray]:
+    """Node latitudes (south to north) and longitudes (west to east) spaced resolution degrees apart"""
+    if not math.isfinite(resolution) or resolution <= 0:
+        raise GridRequestError("resolution must be a positive number of degrees")
+    min_lon, min_lat, max_lon, max_lat = bbox
+    # Small tolerance so that a bbox edge on a multiple of the resolution is included
+    rows = int(math.floor((max_lat - min_lat) / resolution + 1e-9)) + 1
+    cols = int(math.floor((max_lon - min_lon) / resolution + 1e-9)) + 1
+    if rows * cols > max_nodes:
+        raise GridRequestError(f"Grid of {rows}x{cols} nodes exceeds the limit of {max_nodes}; use a coarser resolution")
+    return min_lat + resolution * np.arange(rows), min_lon + resolution * np.arange(cols)
+
+def encode_array(values: np.ndarray) -> str:
+    """Base64 of the little-endian float32 bytes of values (row-major)"""
+    return base64.b64encode(np.ascontiguousarray(values, dtype='<f4').tobytes()).decode('ascii')
+
+async def fetch_grid_weather(weather_service, lats: Sequence[float], lons: Sequence[float],
+                             concurrency: int = RISK_GRID_FETCH_CONCURRENCY) -> List[Optional[Any]]:
+    """Current weather at every node in row-major order; None where the lookup failed"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(lat: float, lon: float):
+        async with semaphore:
+            try:
+                return await weather_service.get_current_weather(lat, lon)
+            except Exception as e:
+                logger.error(f"Grid weather lookup failed at {lat}, {lon}: {e}")
+                return None
+
+    return await asyncio.gather(*(fetch(float(lat), float(lon)) for lat in lats for lon in lons))
+
+def score_grid(prediction_service, weather: Sequence[Optional[Any]], shape: Tuple[int, int],
+               hazards: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Per-hazard risk rasters of the given shape; nodes without weather are NaN"""
+    available = [i for i, node in enumerate(weather) if node is not None]
+    records = [weather[i] for i in available]
+    predictions = prediction_service.predict_disaster_risks_batch(records) if records else []
+    rasters = {}
+    for disaster_type in hazards:
+        values = np.full(shape[0] * shape[1], np.nan, dtype=np.float32)
+        values[available] = [p[disaster_type] for p in predictions]
+        rasters[disaster_type] = values.reshape(shape)
+    return rasters
+
+def grid_payload(bbox: Tuple[float, float, float, float], resolution: float, lats: np.ndarray, lons: np.ndarray,
+                 rasters: Dict[str, np.ndarray], missing: int = 0) -> Dict[str, Any]:
+    """Compact response: one base64 float32 array per hazard plus the grid geometry needed to decode it"""
+    return {
+        'bbox': list(bbox),
+        'resolution': resolution,
+        'shape': [len(lats), len(lons)],
+        'origin': {'lat': float(lats[0]), 'lng': float(lons[0])},
+        'layout': 'row-major, rows south to north, columns west to east',
+        'dtype': 'float32',
+        'byte_order': 'little',
+        'encoding': 'base64',
+        'missing': missing,
+        'hazards': {disaster_type: encode_array(values) for disaster_type, values in rasters.items()},
+    }
+
+async def build_risk_grid(weather_service, prediction_service, bbox: Tuple[float, float, float, float],
+                          resolution: float, hazards: Sequence[str]) -> Dict[str, Any]:
+    """Fetch weather at every grid node, score all nodes in one batch and return the compact payload"""
+    lats, lons = grid_axes(bbox, resolution)
+    weather = await fetch_grid_weather(weather_service, lats, lons)
+    rasters = score_grid(prediction_service, weather, (len(lats), len(lons)), hazards)
+    missing = sum(1 for node in weather if node is None)
+    return grid_payload(bbox, resolution, lats, lons, rasters, missing)
@@ -0,0 +1,125 @@
+"""Vectorized rule-based hazard risks.
+
+The same rules as DisasterPredictionService._rule_based_risk, evaluated with NumPy
+over column arrays for N points at once. Used by the fallback path when a model
+is unavailable and by callers that screen dense grids or long location lists.
+"""
+import math
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+# Column order of the risk matrix
+RULE_HAZARDS: List[str] = ['flood', 'wildfire', 'storm', 'earthquake', 'tornado', 'landslide', 'drought']
+
+# Value used for a weather input that a record or the columns do not provide
+RULE_INPUT_DEFAULTS: Dict[str, float] = {
+    'temperature': 20.0,
+    'humidity': 50.0,
+    'precipitation': 0.0,
+    'wind_speed': 0.0,
+    'pressure': 1013.0,
+    'cloud_cover': 0.0,
+}
+
+# Direction (+1 / -1) in which each rule input raises a hazard's rule-based risk
+RULE_RISK_DIRECTIONS: Dict[str, Dict[str, int]] = {
+    'flood': {'precipitation': 1, 'cloud_cover': 1},
+    'wildfire': {'temperature': 1, 'humidity': -1},
+    'storm': {'wind_speed': 1, 'pressure': -1, 'cloud_cover': 1},
+    'earthquake': {},
+    'tornado': {'wind_speed': 1, 'humidity': 1, 'cloud_cover': 1},
+    'landslide': {'precipitation': 1, 'humidity': 1},
+    'drought': {'temperature': 1, 'humidity': -1, 'precipitation': -1},
+}
+
+def rule_input(weather_data: Mapping[str, Any], name: str) -> float:
+    """One rule input of a weather dict; missing, None and non-finite values take the default"""
+    default = RULE_INPUT_DEFAULTS[name]
+    value = weather_data.get(name)
+    value = default if value is None else float(value)
+    return value if math.isfinite(value) else default
+
+def weather_columns(weather_records: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """Column arrays of the rule inputs for a list of weather dicts (or WeatherData objects).
+    Missing, None and non-finite values take the defaults, as in rule_input."""
+    sources = [record if isinstance(record, Mapping) else vars(record) for record in weather_records]
+    columns = {}
+    for name, default in RULE_INPUT_DEFAULTS.items():
+        # None converts to NaN in a float array
+        column = np.array([source.get(name, default) for source in sources], dtype=np.float64)
+        columns[name] = np.where(np.isfinite(column), column, default)
+    return columns
+
+def _clamp01(x: np.ndarray) -> np.ndarray:
+    # Same result as max(0.0, min(1.0, x)) element-wise, including NaN -> 1.0
+    return np.where(x < 1.0, np.maximum(x, 0.0), 1.0)
+
+# One function per hazard over the rule input columns (temperature, humidity, precipitation,
+# wind_speed, pressure, cloud_cover), all of the same shape
+
+def _flood_risk(temperature, humidity, precipitation, wind_speed, pressure, cloud_cover):
+    # Heavy precipitation, scaled up by cloud cover
+    return _clamp01((precipitation / 50.0) * (0.5 + cloud_cover / 200.0))
+
+def _wildfire_risk(temperature, humidity, precipitation, wind_speed, pressure, cloud_cover):
+    # Hot and dry
+    return np.where((temperature > 30) & (humidity < 35),
+                    _clamp01(((temperature - 30) / 20.0) * (1.0 - humidity / 100.0)), 0.0)
+
+def _storm_risk(temperature, humidity, precipitation, wind_speed, pressure, cloud_cover):
+    # High wind + lower pressure + high cloud cover
+    return _clamp01((wind_speed / 60.0) * (1.0 - np.minimum(pressure, 1100.0) / 1100.0)
+                    * (0.5 + cloud_cover / 200.0))
+
+def _earthquake_risk(temperature, humidity, precipitation, wind_speed, pressure, cloud_cover):
+    # Base low probability (clamped further by the service)
+    return np.full(temperature.shape, 0.05)
+
+def _tornado_risk(temperature, humidity, precipitation, wind_speed, pressure, cloud_cover):
+    return np.where((wind_speed > 25) & (humidity > 60) & (cloud_cover > 60),
+                    _clamp01(((wind_speed - 25) / 40.0) * (humidity / 100.0)), 0.0)
+
+def _landslide_risk(temperature, humidity, precipitation, wind_speed, pressure, cloud_cover):
+    return np.where((precipitation > 20) & (humidity > 70), _clamp01(precipitation / 100.0), 0.0)
+
+def _drought_risk(temperature, humidity, precipitation, wind_speed, pressure, cloud_cover):
+    return np.where((humidity < 25) & (precipitation < 1) & (temperature > 28),
+                    _clamp01(((28.0 - np.minimum(humidity, 28.0)) / 28.0)
+                             * (1.0 - np.minimum(precipitation, 10.0) / 10.0)), 0.0)
+
+RULE_FUNCTIONS: Dict[str, Callable[..., np.ndarray]] = {
+    'flood': _flood_risk,
+    'wildfire': _wildfire_risk,
+    'storm': _storm_risk,
+    'earthquake': _earthquake_risk,
+    'tornado': _tornado_risk,
+    'landslide': _landslide_risk,
+    'drought': _drought_risk,
+}
+
+def _rule_inputs(columns: Mapping[str, Any], num_points: Optional[int]) -> List[np.ndarray]:
+    """Rule input columns broadcast to one 1-d shape, in RULE_INPUT_DEFAULTS order"""
+    values = [np.asarray(columns.get(name, default), dtype=np.float64)
+              for name, default in RULE_INPUT_DEFAULTS.items()]
+    shapes = {value.shape for value in values}
+    if num_points is not None:
+        shapes.add((num_points,))
+    # Columns that already have the common shape are used as they are (broadcasting has a fixed cost)
+    shape = shapes.pop() if len(shapes) == 1 else np.broadcast_shapes(*shapes)
+    if len(shape) != 1:
+        raise ValueError(f"Rule inputs must be 1-d columns, got shape {shape}")
+    return [value if value.shape == shape else np.broadcast_to(value, shape) for value in values]
+
+def hazard_rule_risk(disaster_type: str, columns: Mapping[str, Any], num_points: Optional[int] = None) -> np.ndarray:
+    """Rule-based risk of one hazard for N points given as column arrays (or scalars)"""
+    return RULE_FUNCTIONS[disaster_type](*_rule_inputs(columns, num_points))
+
+def rule_based_risk_matrix(columns: Mapping[str, Any], num_points: Optional[int] = None) -> np.ndarray:
+    """N x len(RULE_HAZARDS) risk matrix for N points given as column arrays (or scalars).
+    Missing columns take RULE_INPUT_DEFAULTS; num_points is only needed when every column is a scalar."""
+    inputs = _rule_inputs(columns, num_points)
+    risks = np.empty((inputs[0].shape[0], len(RULE_HAZARDS)))
+    for i, disaster_type in enumerate(RULE_HAZARDS):
+        risks[:, i] = RULE_FUNCTIONS[disaster_type](*inputs)
+    return risks
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent event-loop bridge
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from async_bridge import EventLoopBridge
+from http_session import SessionManager, http_sessions
+
+def test_calls_share_one_loop_and_session():
+    bridge = EventLoopBridge(name='test-bridge')
+    manager = SessionManager()
+
+    async def current():
+        return asyncio.get_running_loop(), await manager.get()
+
+    try:
+        assert bridge.run(asyncio.sleep(0, result=42)) == 42
+        loop, session = bridge.run(current())
+        assert bridge.run(current()) == (loop, session)
+        assert bridge.stats()['running'] and bridge.stats()['submitted'] == 3
+        bridge.run(manager.close())
+    finally:
+        bridge.stop()
+    assert loop.is_closed() and not bridge.stats()['running']
+
+    # The next call starts a fresh loop
+    try:
+        assert bridge.run(current())[0] is not loop
+    finally:
+        bridge.stop()
+
+def test_stop_closes_the_pooled_session():
+    bridge = EventLoopBridge(name='test-bridge')
+    open_before = http_sessions.stats()['open_sessions']
+    session = bridge.run(http_sessions.get())
+    assert http_sessions.stats()['open_sessions'] == open_before + 1
+    bridge.stop()
+    assert session.closed and http_sessions.stats()['open_sessions'] == open_before
+
+def test_timeout_cancels_the_coroutine():
+    bridge = EventLoopBridge(name='test-bridge', timeout=0.05)
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    try:
+        start = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            bridge.run(slow())
+        assert time.perf_counter() - start < 1.0
+        for _ in range(100):
+            if cancelled:
+                break
+            time.sleep(0.01)
+        assert cancelled and bridge.stats()['timeouts'] == 1
+
+        # Errors raised by the coroutine reach the caller unchanged
+        async def fail():
+            raise ValueError('boom')
+        with pytest.raises(ValueError):
+            bridge.run(fail(), timeout=1.0)
+    finally:
+        bridge.stop()
+
+def test_blocking_from_the_loop_thread_is_refused():
+    bridge = EventLoopBridge(name='test-bridge')
+
+    async def nested():
+        coro = asyncio.sleep(0)
+        try:
+            bridge.run(coro)
+        finally:
+            coro.close()
+
+    try:
+        with pytest.raises(RuntimeError):
+            bridge.run(nested())
+    finally:
+        bridge.stop()
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for cascade screening of the hazard models
+"""
+
+from ai_models import DisasterPredictionService
+from cascade import CascadeScreen
+from rule_engine import RULE_HAZARDS, weather_columns
+from test_numpy_inference import copy_torch_artifacts, random_weather
+
+def cascading_service(tmp_path, hazards, audit_rate=0.0):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    service.prediction_cache.capacity = 0
+    service.cascade = CascadeScreen(hazards, audit_rate=audit_rate, seed=0)
+    return service
+
+def test_models_only_score_records_the_screen_cannot_clear(tmp_path):
+    service = cascading_service(tmp_path, ['storm', 'tornado'])
+    records = random_weather(500, seed=9)
+    cascaded = service.predict_disaster_risks_batch(records)
+    full = service._predict_batch(records, cascade=False)
+    rules = service.rule_based_risk_matrix(records)
+
+    stats = service.cascade_stats()['hazards']
+    for disaster_type in ('storm', 'tornado'):
+        needs_model = service.cascade.screen(weather_columns(records))[disaster_type]
+        column = RULE_HAZARDS.index(disaster_type)
+        for i, (record_predictions, expected) in enumerate(zip(cascaded, full)):
+            if needs_model[i]:
+                assert record_predictions[disaster_type] == expected[disaster_type]
+            else:
+                assert record_predictions[disaster_type] == rules[i, column]
+        assert stats[disaster_type]['records'] == 500
+        assert stats[disaster_type]['screened'] == int((~needs_model).sum()) > 0
+    # Hazards outside the cascade are untouched
+    assert [p['flood'] for p in cascaded] == [p['flood'] for p in full]
+
+def test_fully_screened_hazard_is_never_loaded(tmp_path):
+    service = cascading_service(tmp_path, ['tornado'])
+    calm = [dict(record, wind_speed=1.0, cloud_cover=10.0) for record in random_weather(20, seed=2)]
+    service.predict_disaster_risks_batch(calm)
+    assert not service.registry.is_resident('tornado')
+    assert service.registry.is_resident('storm')
+    assert service.cascade_stats()['hazards']['tornado']['screen_out_rate'] == 1.0
+    # Small batches go straight to the models
+    service.predict_disaster_risks_batch(calm[:1])
+    assert service.cascade_stats()['hazards']['tornado']['records'] == 20
+    assert service.registry.is_resident('tornado')
+
+def test_audit_scores_screened_records(tmp_path):
+    service = cascading_service(tmp_path, ['storm'], audit_rate=1.0)
+    records = random_weather(300, seed=4)
+    service.predict_disaster_risks_batch(records)
+    storm = service.cascade_stats()['hazards']['storm']
+    assert storm['audited'] == storm['screened'] > 0
+    assert storm['audit_misses'] == 0 and storm['audit_miss_rate'] == 0.0
+
+if __name__ == "__main__":
+    import sys
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
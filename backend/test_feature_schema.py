@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the declarative feature schema and the feature matrix
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from ai_models import DisasterPredictionService
+from feature_schema import (
+    HAZARD_FEATURES, WEATHER_FEATURES, feature_matrix, hazard_features, weather_features
+)
+from test_numpy_inference import copy_torch_artifacts, random_weather
+from weather_service import WeatherData
+
+def as_weather_data(record):
+    return WeatherData(location='Testville', coordinates={'lat': 0.0, 'lng': 0.0}, weather_condition='Clear',
+                       timestamp=datetime.now(timezone.utc), **record)
+
+def test_matrix_from_dicts_and_weather_data():
+    records = random_weather(50, seed=6)
+    features = feature_matrix(records)
+    assert features.dtype == np.float32 and features.flags['C_CONTIGUOUS']
+    assert features.shape == (50, len(WEATHER_FEATURES))
+    np.testing.assert_array_equal(features, feature_matrix([as_weather_data(r) for r in records]))
+    assert weather_features(as_weather_data(records[0])) == records[0]
+
+    for disaster_type, columns in HAZARD_FEATURES.items():
+        expected = np.array([[r[c] for c in columns] for r in records], dtype=np.float32)
+        np.testing.assert_array_equal(hazard_features(features, disaster_type), expected)
+
+    # Missing features are NaN
+    partial = feature_matrix([{'temperature': 20.0, 'humidity': None}])
+    assert partial[0, 0] == 20.0 and np.isnan(partial[0, 1:]).all()
+
+def test_service_scores_weather_data_like_dicts(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    service.prediction_cache.capacity = 0
+    records = random_weather(30, seed=8)
+    assert service.predict_disaster_risks_batch([as_weather_data(r) for r in records]) == \
+        service.predict_disaster_risks_batch(records)
+
+def test_incomplete_records_fall_back_per_hazard(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    service.prediction_cache.capacity = 0
+    records = random_weather(5, seed=1)
+    # Without visibility the flood and wildfire models cannot score; the others still do
+    partial = [{k: v for k, v in r.items() if k != 'visibility'} for r in records]
+    predictions = service.predict_disaster_risks_batch(partial)
+    full = service.predict_disaster_risks_batch(records)
+    for record, record_predictions, expected in zip(partial, predictions, full):
+        for disaster_type in ('flood', 'wildfire'):
+            assert record_predictions[disaster_type] == service._rule_based_risk(disaster_type, record)
+        assert record_predictions['storm'] == expected['storm']
+
+def test_incomplete_record_does_not_change_the_rest_of_the_batch(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    records = random_weather(6, seed=3)
+    partial = {k: v for k, v in records[0].items() if k != 'visibility'}
+    numpy_service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    fused_service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='torch')
+    fused_service.use_fused_model = True
+    fused_service.load_or_initialize_models()
+    assert fused_service.fused_model is not None
+    for service in (numpy_service, fused_service):
+        service.prediction_cache.capacity = 0
+        alone = [service.predict_disaster_risks_batch([r])[0] for r in records[1:]]
+        mixed = service.predict_disaster_risks_batch([partial] + records[1:])
+        for expected, got in zip(alone, mixed[1:]):
+            assert got == pytest.approx(expected, abs=1e-6)
+        assert mixed[0]['flood'] == service._rule_based_risk('flood', partial)
+        assert mixed[0]['storm'] == pytest.approx(service.predict_disaster_risks_batch([records[0]])[0]['storm'], abs=1e-6)
+
+    # Uncertainty: complete records are still sampled by the model
+    uncertainty = numpy_service.predict_uncertainty_batch([partial] + records[1:], num_samples=32, seed=0)
+    assert all(u['flood']['std'] > 0 for u in uncertainty[1:])
+    assert uncertainty[0]['flood'] is None and uncertainty[0]['storm']['std'] > 0
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for spatial cache cells of weather lookups
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+import app as backend_app
+from geo_cells import CellSnapper, geohash
+from weather_service import WeatherData, WeatherService
+
+def test_grid_and_geohash_cells():
+    assert geohash(57.64911, 10.40744, 11)[0] == 'u4pruydqqvj'
+
+    grid = CellSnapper('grid:0.01')
+    # About 70 m apart: same cell, fetched at its centroid
+    cell = grid.snap(48.8566, 2.3522)
+    assert grid.snap(48.8571, 2.3529) == cell
+    assert (cell.lat, cell.lon) == (48.855, 2.355)
+    assert grid.snap(48.8666, 2.3522) != cell
+    assert grid.snap(90.0, 180.0).lat < 90.0 and grid.snap(10.0, 180.0) == grid.snap(10.0, -180.0)
+
+    hashed = CellSnapper('geohash:6')
+    cell = hashed.snap(48.8566, 2.3522)
+    assert cell.id == 'u09tvw' and hashed.snap(48.8570, 2.3530) == cell
+    assert abs(cell.lat - 48.8566) < 0.003 and abs(cell.lon - 2.3522) < 0.006
+
+    exact = CellSnapper('off').snap(48.8566, 2.3522)
+    assert (exact.lat, exact.lon) == (48.8566, 2.3522)
+
+    for spec in ('grid:0', 'geohash:13', 'hex:3'):
+        with pytest.raises(ValueError):
+            CellSnapper(spec)
+
+class CellWeatherService(WeatherService):
+    """Provider calls replaced by a recorder of the coordinates fetched"""
+
+    def __init__(self, spec):
+        super().__init__()
+        self.api_key = 'your-api-key-here'
+        self.cells = CellSnapper(spec)
+        self.fetched = []
+
+    async def _current_from_open_meteo(self, lat, lon, location_name, units='metric'):
+        self.fetched.append(('current', lat, lon))
+        return WeatherData(
+            location=location_name or f"{lat}, {lon}", coordinates={'lat': lat, 'lng': lon}, temperature=20.0,
+            humidity=50.0, pressure=1013.0, wind_speed=3.0, wind_direction=90.0, precipitation=0.0,
+            visibility=10.0, cloud_cover=20.0, weather_condition='Clear', timestamp=datetime.now(timezone.utc)
+        )
+
+    async def _fetch_forecast(self, lat, lon, days=5, units='metric'):
+        self.fetched.append(('forecast', lat, lon))
+        return [{'dt': 0, 'main': {'temp': 20.0}}]
+
+def test_nearby_lookups_share_one_fetch():
+    service = CellWeatherService('grid:0.01')
+
+    async def scenario():
+        first = await service.get_current_weather(48.8566, 2.3522, 'Paris')
+        second = await service.get_current_weather(48.8571, 2.3529)
+        forecasts = [await service.get_weather_forecast(48.8566, 2.3522),
+                     await service.get_weather_forecast(48.8571, 2.3529)]
+        return first, second, forecasts
+
+    first, second, forecasts = asyncio.run(scenario())
+    assert service.fetched == [('current', 48.855, 2.355), ('forecast', 48.855, 2.355)]
+    assert forecasts[0] is forecasts[1]
+    # Each caller gets its own label and coordinates; the centroid used is reported
+    assert first.location == 'Paris' and first.coordinates == {'lat': 48.8566, 'lng': 2.3522}
+    assert second.location == '48.8571, 2.3529' and second.coordinates == {'lat': 48.8571, 'lng': 2.3529}
+    assert first.to_dict()['cell'] == second.cell == {'id': 'g0.01:4885:235', 'lat': 48.855, 'lng': 2.355}
+    assert service.cache_stats()['weather']['hits'] == 1
+
+    exact = CellWeatherService('off')
+    asyncio.run(exact.get_current_weather(48.8566, 2.3522))
+    asyncio.run(exact.get_current_weather(48.8571, 2.3529))
+    assert [f[1:] for f in exact.fetched] == [(48.8566, 2.3522), (48.8571, 2.3529)]
+
+def test_forecast_endpoint_reports_the_cell(monkeypatch):
+    service = CellWeatherService('geohash:6')
+    monkeypatch.setattr(backend_app, 'weather_service', service)
+    response = backend_app.app.test_client().get('/api/weather/forecast?lat=48.8566&lon=2.3522')
+    assert response.status_code == 200 and response.get_json() == [{'dt': 0, 'main': {'temp': 20.0}}]
+    assert response.headers['X-Weather-Cell'] == 'u09tvw'
+    lat, lon = map(float, response.headers['X-Weather-Cell-Centroid'].split(','))
+    assert service.fetched == [('forecast', lat, lon)]
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled per-loop aiohttp sessions
+"""
+
+import asyncio
+
+from aiohttp import test_utils, web
+
+from http_session import SessionManager
+
+class RecordingServer:
+    """Local HTTP server recording the client port of every request and the peak concurrency"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.ports = []
+        self.active = 0
+        self.peak = 0
+        app = web.Application()
+        app.router.add_get('/', self.handle)
+        self.server = test_utils.TestServer(app)
+
+    async def handle(self, request):
+        self.ports.append(request.transport.get_extra_info('peername')[1])
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return web.json_response({'ok': True})
+
+async def fetch(manager, url):
+    async with manager.session() as session:
+        async with session.get(url) as response:
+            return await response.json()
+
+def test_calls_on_one_loop_share_a_keep_alive_connection():
+    manager = SessionManager()
+    recorder = RecordingServer()
+
+    async def scenario():
+        await recorder.server.start_server()
+        url = str(recorder.server.make_url('/'))
+        try:
+            first = await manager.get()
+            for _ in range(3):
+                assert await fetch(manager, url) == {'ok': True}
+            assert await manager.get() is first and not first.closed
+            await manager.close()
+            assert first.closed
+        finally:
+            await recorder.server.close()
+
+    asyncio.run(scenario())
+    assert len(recorder.ports) == 3 and len(set(recorder.ports)) == 1
+    assert manager.sessions_created == 1 and manager.stats()['open_sessions'] == 0
+
+def test_each_loop_gets_its_own_session():
+    manager = SessionManager()
+    loops = [asyncio.new_event_loop() for _ in range(2)]
+    sessions = [loop.run_until_complete(manager.get()) for loop in loops]
+    assert sessions[0] is not sessions[1]
+    assert manager.stats()['open_sessions'] == 2
+    for loop, session in zip(loops, sessions):
+        loop.run_until_complete(manager.close())
+        loop.close()
+        assert session.closed
+    assert manager.stats()['open_sessions'] == 0
+
+def test_per_host_limit_caps_concurrent_connections():
+    manager = SessionManager(limit_per_host=2)
+    recorder = RecordingServer(delay=0.05)
+
+    async def scenario():
+        await recorder.server.start_server()
+        url = str(recorder.server.make_url('/'))
+        try:
+            await asyncio.gather(*(fetch(manager, url) for _ in range(6)))
+        finally:
+            await manager.close()
+            await recorder.server.close()
+
+    asyncio.run(scenario())
+    assert len(recorder.ports) == 6 and recorder.peak == 2 and len(set(recorder.ports)) == 2
+
+if __name__ == "__main__":
+    import sys
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
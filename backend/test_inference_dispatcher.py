@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the micro-batching inference dispatcher
+"""
+
+import threading
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+import pytest
+
+from ai_models import DisasterPredictionService
+from inference_dispatcher import MicroBatchDispatcher
+from test_numpy_inference import copy_torch_artifacts, random_weather
+
+class RecordingModel:
+    """Batched predictor that records the size of every batch it scores"""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def predict_batch(self, records):
+        self.entered.set()
+        self.release.wait()
+        self.batch_sizes.append(len(records))
+        return [{'flood': record['precipitation'] / 100.0} for record in records]
+
+def submit_all(dispatcher, values):
+    return [dispatcher.submit({'precipitation': value}) for value in values]
+
+def test_concurrent_requests_share_batches():
+    model = RecordingModel()
+    dispatcher = MicroBatchDispatcher(model.predict_batch, window_ms=50, max_batch_size=8)
+    futures = submit_all(dispatcher, range(20))
+    assert [f.result(timeout=5)['flood'] for f in futures] == [v / 100.0 for v in range(20)]
+    dispatcher.close()
+    assert sum(model.batch_sizes) == 20 and max(model.batch_sizes) <= 8 and len(model.batch_sizes) < 20
+    stats = dispatcher.stats()
+    assert stats['requests'] == 20 and stats['batches'] == len(model.batch_sizes)
+    assert stats['max_queue_depth'] >= 1 and stats['queue_depth'] == 0
+    assert sum(stats['batch_size_histogram'].values()) == stats['batches']
+
+def test_requests_queued_during_a_batch_are_coalesced():
+    model = RecordingModel()
+    model.release.clear()
+    dispatcher = MicroBatchDispatcher(model.predict_batch, window_ms=0, max_batch_size=64)
+    first = dispatcher.submit({'precipitation': 1})
+    assert model.entered.wait(timeout=5)
+    # While the first batch is blocked, later requests pile up and go out together
+    rest = submit_all(dispatcher, range(10))
+    model.release.set()
+    first.result(timeout=5)
+    assert all(f.result(timeout=5) for f in rest)
+    dispatcher.close()
+    assert model.batch_sizes[0] == 1 and sum(model.batch_sizes) == 11 and len(model.batch_sizes) <= 3
+
+def test_bad_record_fails_only_its_own_future():
+    model = RecordingModel()
+    dispatcher = MicroBatchDispatcher(model.predict_batch, window_ms=50)
+    good = dispatcher.submit({'precipitation': 10})
+    bad = dispatcher.submit({'temperature': 20})
+    assert good.result(timeout=5) == {'flood': 0.1}
+    with pytest.raises(KeyError):
+        bad.result(timeout=5)
+    dispatcher.close()
+
+def test_timeout_withdraws_the_request_and_the_service_scores_directly(tmp_path):
+    model = RecordingModel()
+    model.release.clear()
+    dispatcher = MicroBatchDispatcher(model.predict_batch, window_ms=1, timeout=0.05)
+    blocker = dispatcher.submit({'precipitation': 1})
+    assert model.entered.wait(5)
+    with pytest.raises(FuturesTimeoutError):
+        dispatcher.predict({'precipitation': 2})
+    model.release.set()
+    assert blocker.result(timeout=5) == {'flood': 0.01}
+    dispatcher.close()
+    # The timed-out request was withdrawn, not scored
+    assert model.batch_sizes == [1] and dispatcher.stats()['timeouts'] == 1
+
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    record = random_weather(1)[0]
+    expected = service.predict_disaster_risks_batch([record])[0]
+    service.prediction_cache.invalidate()
+    # A dispatcher whose worker never answers
+    service.dispatcher = MicroBatchDispatcher(lambda records: threading.Event().wait(), timeout=0.05)
+    assert service.predict_disaster_risks(record) == expected
+
+def test_incomplete_record_does_not_change_other_callers_results(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    service.prediction_cache.capacity = 0
+    records = random_weather(8, seed=4)
+    expected = [service.predict_disaster_risks_batch([r])[0] for r in records]
+    partial = {k: v for k, v in records[0].items() if k != 'visibility'}
+    service.dispatcher = MicroBatchDispatcher(service.predict_disaster_risks_batch, window_ms=200, max_batch_size=9)
+    futures = [service.dispatcher.submit(partial)] + [service.dispatcher.submit(r) for r in records[1:]]
+    results = [f.result(timeout=5) for f in futures]
+    service.dispatcher.close()
+    assert service.dispatcher_stats()['batches'] == 1
+    for got, want in zip(results[1:], expected[1:]):
+        assert got == pytest.approx(want, abs=1e-6)
+    assert results[0]['flood'] == service._rule_based_risk('flood', partial)
+
+def test_service_routes_single_predictions_through_dispatcher(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    records = random_weather(40)
+    expected = service.predict_disaster_risks_batch(records)
+    service.prediction_cache.invalidate()
+    service.dispatcher = MicroBatchDispatcher(service.predict_disaster_risks_batch, window_ms=5)
+
+    results = [None] * len(records)
+    def worker(i):
+        results[i] = service.predict_disaster_risks(records[i])
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(records))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == expected
+    assert service.dispatcher_stats()['requests'] == len(records)
+    # Repeats are answered from the prediction cache without queueing
+    service.predict_disaster_risks(records[0])
+    assert service.dispatcher_stats()['requests'] == len(records)
+    service.dispatcher.close()
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, '-q']))
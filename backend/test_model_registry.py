@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy, memory-bounded hazard model registry
+"""
+
+import numpy as np
+
+from model_registry import LazyModelRegistry, ResidentModel
+
+def make_loader(loaded):
+    def loader(hazard):
+        loaded.append(hazard)
+        # 1000 float64 weights = 8000 bytes per model
+        return ResidentModel(model=np.zeros(1000), scaler=None)
+    return loader
+
+def test_models_load_on_first_use():
+    loaded = []
+    registry = LazyModelRegistry(make_loader(loaded))
+    assert registry.resident() == {}
+    registry.get('flood')
+    registry.get('flood')
+    assert loaded == ['flood']
+    assert registry.is_resident('flood')
+    assert registry.stats()['resident']['flood']['bytes'] == 8000
+
+def test_least_recently_used_model_is_evicted_over_budget():
+    loaded = []
+    registry = LazyModelRegistry(make_loader(loaded), memory_budget_bytes=16000)
+    registry.get('flood')
+    registry.get('storm')
+    registry.get('flood')
+    registry.get('drought')
+    assert set(registry.resident()) == {'flood', 'drought'}
+    assert registry.evictions == 1
+    # An evicted model is reloaded on its next use
+    registry.get('storm')
+    assert loaded == ['flood', 'storm', 'drought', 'storm']
+
+if __name__ == "__main__":
+    import sys
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Parity test: the NumPy inference backend must reproduce the PyTorch model outputs
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from ai_models import DisasterPredictionService, FINGERPRINT_FILENAME, WEATHER_FEATURES, HAZARD_FEATURES
+from model_bundle import BUNDLE_FILENAME, ModelBundle, write_bundle
+from numpy_inference import fold_hazard_model
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), 'models')
+
+def copy_torch_artifacts(target_dir):
+    """Copy the shipped .pth/.pkl artifacts and their training fingerprint (but no model bundle) into target_dir"""
+    for name in os.listdir(MODEL_DIR):
+        if name.endswith('.pth') or name.endswith('.pkl') or name == FINGERPRINT_FILENAME:
+            shutil.copy(os.path.join(MODEL_DIR, name), target_dir)
+
+def random_weather(num_records, seed=0):
+    rng = np.random.default_rng(seed)
+    low = np.array([-20, 10, 900, 0, 0, 0, 0, 0])
+    high = np.array([50, 100, 1100, 60, 360, 100, 25, 100])
+    values = rng.uniform(low, high, size=(num_records, len(WEATHER_FEATURES)))
+    return [dict(zip(WEATHER_FEATURES, row.tolist())) for row in values]
+
+def unfolded(service):
+    """Serve from the plain forward passes instead of the folded graphs"""
+    service.fold_models = False
+    service.registry.clear()
+    service.prediction_cache.invalidate()
+    return service
+
+def legacy_torch(service):
+    """Serve from the .pth/.pkl artifacts instead of the model bundle"""
+    service.use_bundle = False
+    service.load_or_initialize_models()
+    return service
+
+def test_numpy_backend_matches_torch(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    torch_service = unfolded(legacy_torch(DisasterPredictionService(model_path=str(tmp_path), inference_backend='torch')))
+    records = random_weather(500)
+    torch_predictions = torch_service.predict_disaster_risks_batch(records)
+
+    numpy_service = unfolded(DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy'))
+    numpy_predictions = numpy_service.predict_disaster_risks_batch(records)
+    assert set(numpy_service.models) == set(torch_service.models)
+    for expected, actual in zip(torch_predictions, numpy_predictions):
+        assert expected.keys() == actual.keys()
+        for hazard in expected:
+            assert abs(expected[hazard] - actual[hazard]) < 1e-5
+
+def test_legacy_artifacts_convert_to_bundle(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    numpy_service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    assert os.path.exists(tmp_path / BUNDLE_FILENAME)
+    assert set(numpy_service.bundle.hazards) == set(HAZARD_FEATURES)
+    numpy_service.predict_disaster_risks(random_weather(1)[0])
+    assert set(numpy_service.models) == set(numpy_service.enabled_hazards)
+    # Weights are served straight from the memory-mapped file
+    layers = numpy_service.models['flood'].layers
+    assert isinstance(layers[0][0].base, np.memmap) or isinstance(layers[0][0].base.base, np.memmap)
+
+def test_torch_backend_serves_weights_from_the_bundle(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    records = random_weather(200)
+    expected = unfolded(legacy_torch(DisasterPredictionService(model_path=str(tmp_path), inference_backend='torch')))
+    service = unfolded(DisasterPredictionService(model_path=str(tmp_path), inference_backend='torch'))
+    for before, after in zip(expected.predict_disaster_risks_batch(records), service.predict_disaster_risks_batch(records)):
+        for hazard in before:
+            assert after[hazard] == pytest.approx(before[hazard], abs=1e-6)
+    # Parameters alias the mapped file instead of private copies
+    model = service.models['flood']
+    arrays = service.bundle.arrays('flood')
+    for key, value in model.state_dict().items():
+        if key in arrays:
+            assert np.shares_memory(value.numpy(), arrays[key])
+    # ...so the model is inference-only: nothing may write to the read-only pages
+    assert not model.training and not any(p.requires_grad for p in model.parameters())
+    for switch_to_training in (model.train, model.batch_norm1.train, lambda: model.load_state_dict({})):
+        with pytest.raises(RuntimeError):
+            switch_to_training()
+    assert model.eval() is model and not model.batch_norm1.training
+
+def test_bundle_rejects_corruption(tmp_path):
+    path = str(tmp_path / BUNDLE_FILENAME)
+    arrays = {'weight': np.arange(6, dtype=np.float32).reshape(2, 3), 'bias': np.ones(2, dtype=np.float32)}
+    write_bundle(path, {'flood': arrays}, metadata={'version': 'test'})
+    bundle = ModelBundle(path)
+    assert bundle.hazards == ['flood'] and bundle.metadata == {'version': 'test'}
+    np.testing.assert_array_equal(bundle.arrays('flood')['weight'], arrays['weight'])
+
+    with open(path, 'r+b') as f:
+        f.seek(-4, os.SEEK_END)
+        f.write(b'\xff\xff\xff\xff')
+    with pytest.raises(ValueError):
+        ModelBundle(path)
+
+def test_folded_models_match_unfolded(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    records = random_weather(500, seed=1)
+    folded_predictions = service.predict_disaster_risks_batch(records)
+    for hazard, model in service.models.items():
+        features = np.array([[r[c] for c in HAZARD_FEATURES[hazard]] for r in records])
+        scaler = service.scalers[hazard]
+        expected = model.predict(scaler.transform(features))
+        folded = fold_hazard_model(model, scaler)
+        assert np.max(np.abs(folded.predict(features) - expected)) < 1e-5
+
+    # The service compiles every trained model and serves the same predictions
+    assert set(service.compiled_models) == set(service.models)
+    unfolded_predictions = unfolded(service).predict_disaster_risks_batch(records)
+    for expected, actual in zip(unfolded_predictions, folded_predictions):
+        for hazard in expected:
+            assert abs(expected[hazard] - actual[hazard]) < 1e-5
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, '-q']))
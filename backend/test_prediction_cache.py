@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the quantized-feature prediction cache
+"""
+
+from ai_models import DisasterPredictionService
+from prediction_cache import PredictionCache
+from test_numpy_inference import copy_torch_artifacts, random_weather
+
+FEATURES = ['temperature', 'humidity', 'wind_speed']
+
+class CountingService:
+    """Stand-in for the model path that records which records were scored"""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.scored = []
+
+    def predict(self, record):
+        key = self.cache.key(record)
+        generation = self.cache.generation
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        self.scored.append(record)
+        predictions = {'flood': record['humidity'] / 100.0}
+        self.cache.put(key, predictions, generation)
+        return predictions
+
+def test_nearby_vectors_share_a_key():
+    cache = PredictionCache(FEATURES, resolutions={'temperature': 0.1, 'humidity': 1.0, 'wind_speed': 0.5})
+    assert cache.key({'temperature': 20.01, 'humidity': 55.2, 'wind_speed': 3.1}) == \
+        cache.key({'temperature': 20.04, 'humidity': 54.9, 'wind_speed': 3.2})
+    assert cache.key({'temperature': 20.2, 'humidity': 55, 'wind_speed': 3}) != \
+        cache.key({'temperature': 20.0, 'humidity': 55, 'wind_speed': 3})
+    # Missing or non-finite features are not cacheable
+    assert cache.key({'temperature': 20, 'humidity': 55}) is None
+    assert cache.key({'temperature': float('nan'), 'humidity': 55, 'wind_speed': 3}) is None
+
+def test_hits_misses_and_lru_eviction():
+    cache = PredictionCache(FEATURES, capacity=2)
+    service = CountingService(cache)
+    first = {'temperature': 20.0, 'humidity': 50, 'wind_speed': 1}
+    second = {'temperature': 25.0, 'humidity': 60, 'wind_speed': 1}
+    third = {'temperature': 30.0, 'humidity': 70, 'wind_speed': 1}
+    service.predict(first)
+    service.predict(second)
+    service.predict(first)
+    service.predict(third)
+    assert cache.stats()['size'] == 2 and cache.evictions == 1
+    # second was least recently used, so it is scored again
+    service.predict(second)
+    assert service.scored == [first, second, third, second]
+    assert (cache.hits, cache.misses) == (1, 4)
+
+def test_invalidation_drops_entries_and_stale_writes():
+    cache = PredictionCache(FEATURES)
+    record = {'temperature': 20.0, 'humidity': 50, 'wind_speed': 1}
+    key = cache.key(record)
+    stale_generation = cache.generation
+    cache.put(key, {'flood': 0.5}, stale_generation)
+    cache.invalidate()
+    assert cache.get(key) is None
+    # A prediction computed by the previous models is not stored
+    cache.put(key, {'flood': 0.5}, stale_generation)
+    assert cache.stats()['size'] == 0
+
+def test_service_serves_repeats_from_cache(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    records = random_weather(20)
+    expected = service.predict_disaster_risks_batch(records)
+    assert service.prediction_cache.misses == 20
+    # Repeats (and duplicates within a batch) come from the cache with the same predictions
+    assert service.predict_disaster_risks_batch(records + records[:5]) == expected + expected[:5]
+    assert service.prediction_cache.hits == 25
+    # Reloading the models, as retraining does, invalidates the cache
+    service.load_or_initialize_models()
+    assert service.prediction_cache_stats()['size'] == 0
+
+if __name__ == "__main__":
+    import sys
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
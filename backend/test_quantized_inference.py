@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Accuracy tests for the opt-in int8 quantized inference path
+"""
+
+import numpy as np
+
+from ai_models import DisasterPredictionService
+from quantized_inference import QuantizedHazardModel, compare_quantized_models
+from test_numpy_inference import copy_torch_artifacts, random_weather
+
+def test_quantized_graph_tracks_float_graph(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    report = compare_quantized_models(service, num_samples=2000, repeats=5)
+    assert set(report) == set(service.enabled_hazards)
+    for result in report.values():
+        assert result['mean_abs_deviation'] < 0.01
+        assert result['max_abs_deviation'] < 0.1
+        assert result['int8_latency_us'] > 0 and result['int8_rows_per_s'] > 0
+
+def test_service_serves_quantized_models(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    records = random_weather(200)
+    expected = service.predict_disaster_risks_batch(records)
+
+    service.quantize_models = True
+    service.load_or_initialize_models(preload=True)
+    quantized = {h: e.quantized for h, e in service.registry.resident().items() if e.quantized is not None}
+    assert quantized and all(isinstance(m, QuantizedHazardModel) for m in quantized.values())
+    actual = service.predict_disaster_risks_batch(records)
+    # Same return contract: every hazard present, plain floats in [0, 1]
+    for before, after in zip(expected, actual):
+        assert before.keys() == after.keys()
+        assert all(isinstance(v, float) and 0.0 <= v <= 1.0 for v in after.values())
+    deviations = [abs(b[h] - a[h]) for b, a in zip(expected, actual) for h in quantized]
+    assert np.mean(deviations) < 0.01
+
+if __name__ == "__main__":
+    import sys
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
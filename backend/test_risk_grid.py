@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounding-box risk grid
+"""
+
+import base64
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+import app as backend_app
+from ai_models import ai_prediction_service, HAZARD_FEATURES
+from risk_grid import GridRequestError, grid_axes, parse_bbox, parse_hazards
+from weather_service import WeatherData
+
+class FakeWeatherService:
+    """Deterministic weather per node; nodes west of -100 have no data"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get_current_weather(self, lat, lon, location_name=None, units='metric'):
+        self.calls += 1
+        if lon < -100:
+            return None
+        return WeatherData(
+            location=f"{lat}, {lon}", coordinates={'lat': lat, 'lng': lon},
+            temperature=20 + lat / 10, humidity=60.0, pressure=1000 + lon / 10, wind_speed=abs(lon) / 10,
+            wind_direction=180.0, precipitation=lat / 2, visibility=10.0, cloud_cover=70.0,
+            weather_condition='Clouds', timestamp=datetime.now(timezone.utc)
+        )
+
+def decode(payload, disaster_type):
+    values = np.frombuffer(base64.b64decode(payload['hazards'][disaster_type]), dtype='<f4')
+    return values.reshape(payload['shape'])
+
+def test_grid_axes_and_validation():
+    lats, lons = grid_axes(parse_bbox('-10,40,-8,41'), 0.5)
+    assert lats.tolist() == [40.0, 40.5, 41.0]
+    assert lons.tolist() == [-10.0, -9.5, -9.0, -8.5, -8.0]
+    with pytest.raises(GridRequestError):
+        parse_bbox('1,2,3')
+    with pytest.raises(GridRequestError):
+        parse_bbox('10,0,5,1')
+    with pytest.raises(GridRequestError):
+        grid_axes(parse_bbox('-180,-90,180,90'), 0.1)
+    with pytest.raises(GridRequestError):
+        parse_hazards('flood,meteor')
+    assert parse_hazards('') == list(HAZARD_FEATURES)
+
+def test_grid_endpoint_scores_nodes_in_one_batch(monkeypatch):
+    weather = FakeWeatherService()
+    monkeypatch.setattr(backend_app, 'weather_service', weather)
+    batches = []
+    predict_batch = ai_prediction_service.predict_disaster_risks_batch
+    monkeypatch.setattr(ai_prediction_service, 'predict_disaster_risks_batch',
+                        lambda records: batches.append(len(records)) or predict_batch(records))
+
+    client = backend_app.app.test_client()
+    response = client.get('/api/risk/grid?bbox=-101,30,-99,32&resolution=1&hazards=flood,storm')
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload['shape'] == [3, 3] and set(payload['hazards']) == {'flood', 'storm'}
+    assert weather.calls == 9 and batches == [6] and payload['missing'] == 3
+
+    flood = decode(payload, 'flood')
+    assert np.isnan(flood[:, 0]).all()
+    for row, lat in enumerate([30.0, 31.0, 32.0]):
+        for col, lon in enumerate([-100.0, -99.0], start=1):
+            node = dict(temperature=20 + lat / 10, humidity=60.0, pressure=1000 + lon / 10, wind_speed=abs(lon) / 10,
+                        wind_direction=180.0, precipitation=lat / 2, visibility=10.0, cloud_cover=70.0)
+            expected = ai_prediction_service.predict_disaster_risks(node)['flood']
+            assert flood[row, col] == pytest.approx(expected, abs=1e-6)
+
+    assert client.get('/api/risk/grid?bbox=oops').status_code == 400
+    assert client.get('/api/risk/grid?bbox=-180,-90,180,90&resolution=0.01').status_code == 400
+    for resolution in ('abc', '0', '-1', 'nan', 'inf'):
+        response = client.get(f'/api/risk/grid?bbox=-101,30,-99,32&resolution={resolution}')
+        assert response.status_code == 400 and 'resolution' in response.get_json()['error']
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, '-q']))
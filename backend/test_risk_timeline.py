@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the forecast-horizon risk timeline
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+import app as backend_app
+from ai_models import ai_prediction_service
+from weather_service import WeatherData, forecast_weather_records
+
+def openweather_forecast(steps):
+    return [
+        {
+            'dt_txt': f"2026-01-0{1 + i // 8} {3 * (i % 8):02d}:00:00",
+            'main': {'temp': 20 + i, 'humidity': 50 + i, 'pressure': 1000 - i},
+            'wind': {'speed': 2.0 * i, 'deg': 10 * i},
+            'clouds': {'all': 5 * i},
+            'visibility': 10000 - 100 * i,
+            **({'rain': {'3h': 6.0 * i}} if i % 2 else {}),
+        }
+        for i in range(steps)
+    ]
+
+def test_forecast_records_from_provider_json():
+    records = forecast_weather_records(openweather_forecast(3))
+    assert records[1] == {'temperature': 21.0, 'humidity': 51.0, 'pressure': 999.0, 'wind_speed': 2.0,
+                          'wind_direction': 10.0, 'precipitation': 2.0, 'visibility': 9.9, 'cloud_cover': 5.0}
+    assert records[2]['precipitation'] == 0.0
+
+    # Open-Meteo fallback entries may lack fields; they take the caller's defaults
+    open_meteo = [{'dt_txt': '2026-01-01T00:00', 'main': {'temp': 12.0}, 'rain': {'1h': 0.4}, 'clouds': {'all': 80.0}}]
+    record = forecast_weather_records(open_meteo, defaults={'humidity': 77.0, 'pressure': 990.0})[0]
+    assert record['temperature'] == 12.0 and record['precipitation'] == 0.4 and record['cloud_cover'] == 80.0
+    assert record['humidity'] == 77.0 and record['pressure'] == 990.0 and record['visibility'] == 10.0
+
+def test_timeline_scores_every_step_in_one_batch(monkeypatch):
+    forecast = openweather_forecast(40)
+    records = forecast_weather_records(forecast)
+    times = [entry['dt_txt'] for entry in forecast]
+    batches = []
+    predict_batch = ai_prediction_service.predict_disaster_risks_batch
+    monkeypatch.setattr(ai_prediction_service, 'predict_disaster_risks_batch',
+                        lambda batch: batches.append(len(batch)) or predict_batch(batch))
+
+    timeline = ai_prediction_service.risk_timeline(records, times)
+    assert batches == [40] and timeline['times'] == times
+    expected = [ai_prediction_service.predict_disaster_risks(record) for record in records]
+    for disaster_type, entry in timeline['hazards'].items():
+        series = [p[disaster_type] for p in expected]
+        assert entry['series'] == pytest.approx(series, abs=1e-6)
+        assert entry['peak'] == pytest.approx(max(series), abs=1e-6)
+        assert entry['series'][times.index(entry['peak_time'])] == entry['peak']
+    assert ai_prediction_service.risk_timeline([], []) == {'times': [], 'hazards': {}}
+
+class FakeWeatherService:
+    async def geocode(self, query, limit=5):
+        return [{'name': 'Testville', 'lat': 10.0, 'lon': 20.0, 'country': 'TV', 'state': 'TS'}]
+
+    async def get_current_weather(self, lat, lon, location_name=None, units='metric'):
+        return WeatherData(
+            location=location_name, coordinates={'lat': lat, 'lng': lon}, temperature=25.0, humidity=60.0,
+            pressure=1005.0, wind_speed=5.0, wind_direction=90.0, precipitation=1.0, visibility=10.0,
+            cloud_cover=40.0, weather_condition='Clouds', timestamp=datetime.now(timezone.utc)
+        )
+
+    async def get_weather_forecast(self, lat, lon, days=5, units='metric'):
+        return openweather_forecast(40)
+
+def test_location_analysis_includes_timeline(monkeypatch):
+    monkeypatch.setattr(backend_app, 'weather_service', FakeWeatherService())
+    response = backend_app.app.test_client().post('/api/location/analyze', json={'query': 'Testville'})
+    assert response.status_code == 200
+    payload = response.get_json()
+    timeline = payload['risk_timeline']
+    assert len(payload['forecast']) == 8 and len(timeline['times']) == 40
+    assert set(timeline['hazards']) == set(payload['disaster_risks'])
+    assert all(len(entry['series']) == 40 for entry in timeline['hazards'].values())
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized rule-based risk engine
+"""
+
+import numpy as np
+import pytest
+
+from ai_models import DisasterPredictionService, ai_prediction_service, HAZARD_FEATURES
+from rule_engine import RULE_HAZARDS, RULE_INPUT_DEFAULTS, rule_based_risk_matrix, weather_columns
+from test_numpy_inference import copy_torch_artifacts, random_weather
+
+def test_matrix_matches_scalar_rules():
+    records = random_weather(5000, seed=11)
+    # Exact threshold values, out-of-range inputs, NaN and missing keys
+    records += [
+        {'temperature': 30.0, 'humidity': 35.0, 'wind_speed': 25.0, 'precipitation': 20.0, 'cloud_cover': 60.0},
+        {'temperature': 50.0, 'humidity': 5.0, 'precipitation': 0.0, 'pressure': 1200.0},
+        {'wind_speed': 200.0, 'humidity': 100.0, 'cloud_cover': 100.0, 'pressure': 800.0},
+        {'precipitation': -5.0, 'temperature': float('nan'), 'humidity': float('nan')},
+        {'precipitation': float('nan'), 'wind_speed': float('inf')},
+        {'precipitation': None, 'humidity': None, 'cloud_cover': float('-inf')},
+        {},
+    ]
+    assert RULE_HAZARDS == list(HAZARD_FEATURES)
+    matrix = ai_prediction_service.rule_based_risk_matrix(records)
+    assert matrix.shape == (len(records), len(RULE_HAZARDS))
+    expected = np.array([
+        [ai_prediction_service._rule_based_risk(disaster_type, record) for disaster_type in RULE_HAZARDS]
+        for record in records
+    ])
+    np.testing.assert_array_equal(matrix, expected)
+
+def test_scalar_and_missing_columns_broadcast():
+    records = random_weather(10, seed=3)
+    columns = weather_columns(records)
+    del columns['cloud_cover']
+    columns['pressure'] = 990.0
+    matrix = rule_based_risk_matrix(columns)
+    for record, row in zip(records, matrix):
+        record = dict(record, pressure=990.0, cloud_cover=RULE_INPUT_DEFAULTS['cloud_cover'])
+        assert row.tolist() == [ai_prediction_service._rule_based_risk(h, record) for h in RULE_HAZARDS]
+    assert rule_based_risk_matrix({}, num_points=3).shape == (3, len(RULE_HAZARDS))
+
+def test_fallback_path_uses_rule_engine(tmp_path, monkeypatch):
+    # No artifacts: every hazard is served by the rule-based fallback
+    monkeypatch.setenv('AI_AUTO_TRAIN_ON_STARTUP', 'false')
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    records = random_weather(20, seed=5)
+    predictions = service.predict_disaster_risks_batch(records)
+    for record, record_predictions in zip(records, predictions):
+        for disaster_type in HAZARD_FEATURES:
+            if disaster_type == 'earthquake' and not service.allow_earthquake_predictions:
+                continue
+            assert record_predictions[disaster_type] == service._rule_based_risk(disaster_type, record)
+
+def test_none_and_non_finite_inputs_take_the_defaults():
+    records = [{'precipitation': None, 'cloud_cover': float('nan'), 'wind_speed': float('inf')}, {}]
+    columns = weather_columns(records)
+    for name, default in RULE_INPUT_DEFAULTS.items():
+        assert columns[name].tolist() == [default, default]
+    np.testing.assert_array_equal(rule_based_risk_matrix(columns)[0], rule_based_risk_matrix(columns)[1])
+
+def test_batch_with_a_none_field_falls_back_for_that_record(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    records = random_weather(4, seed=9)
+    broken = dict(records[0], precipitation=None)
+    predictions = service._predict_batch([broken] + records[1:])
+    expected = service._predict_batch(records[1:])
+    for got, want in zip(predictions[1:], expected):
+        assert got == pytest.approx(want, abs=1e-6)
+    without_precipitation = {k: v for k, v in records[0].items() if k != 'precipitation'}
+    for disaster_type in HAZARD_FEATURES:
+        if 'precipitation' in HAZARD_FEATURES[disaster_type]:
+            assert predictions[0][disaster_type] == service._rule_based_risk(disaster_type, without_precipitation)
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, '-q']))
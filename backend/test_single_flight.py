@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for single-flight coalescing of provider lookups
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from single_flight import SingleFlight
+from weather_service import WeatherService
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    observed = {}
+
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.02)
+        return {'key': key}
+
+    async def scenario():
+        waiters = [flight.do('a', lambda: fetch('a')) for _ in range(10)] + [flight.do('b', lambda: fetch('b'))]
+        gathered = asyncio.gather(*waiters)
+        await asyncio.sleep(0.005)
+        observed.update(flight.in_flight())
+        return await gathered
+
+    results = asyncio.run(scenario())
+    assert calls == ['a', 'b']
+    assert all(r is results[0] for r in results[:10]) and results[10] == {'key': 'b'}
+    assert observed == {'a': 10, 'b': 1}
+    assert flight.stats() == {'executions': 2, 'coalesced': 9, 'in_flight': {}}
+
+    # Once the call finished, the next one fetches again
+    asyncio.run(flight.do('a', lambda: fetch('a')))
+    assert calls == ['a', 'b', 'a']
+
+def test_errors_are_shared_and_cancelled_callers_do_not_cancel_the_call():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError('provider down')
+
+    async def slow():
+        await asyncio.sleep(0.03)
+        return 'done'
+
+    async def scenario():
+        outcomes = await asyncio.gather(*(flight.do('x', fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(o, ValueError) for o in outcomes)
+
+        impatient = asyncio.ensure_future(flight.do('y', slow))
+        patient = asyncio.ensure_future(flight.do('y', slow))
+        await asyncio.sleep(0.005)
+        impatient.cancel()
+        assert await patient == 'done'
+        assert impatient.cancelled()
+
+    asyncio.run(scenario())
+    assert flight.stats()['executions'] == 2 and flight.stats()['in_flight'] == {}
+
+class SlowWeatherService(WeatherService):
+    """Provider calls replaced by slow counters"""
+
+    def __init__(self):
+        super().__init__()
+        self.api_key = 'your-api-key-here'
+        self.calls = {'current': 0, 'forecast': 0, 'geocode': 0}
+
+    async def _current_from_open_meteo(self, lat, lon, location_name, units='metric'):
+        self.calls['current'] += 1
+        await asyncio.sleep(0.02)
+        return SimpleNamespace(location=location_name, lat=lat, lon=lon)
+
+    async def _fetch_forecast(self, lat, lon, days=5, units='metric'):
+        self.calls['forecast'] += 1
+        await asyncio.sleep(0.02)
+        return [{'dt': 0}]
+
+    async def _geocode_uncached(self, query, limit=5):
+        self.calls['geocode'] += 1
+        await asyncio.sleep(0.02)
+        return [{'name': query, 'lat': 1.0, 'lon': 2.0}]
+
+def test_weather_service_coalesces_cache_misses():
+    service = SlowWeatherService()
+
+    async def scenario():
+        lookups = []
+        for _ in range(20):
+            lookups += [
+                service.get_current_weather(48.85, 2.35, 'Paris'),
+                service.get_weather_forecast(48.85, 2.35),
+                service.geocode('Paris'),
+            ]
+        lookups.append(service.get_current_weather(40.71, -74.0, 'New York'))
+        return await asyncio.gather(*lookups)
+
+    results = asyncio.run(scenario())
+    assert service.calls == {'current': 2, 'forecast': 1, 'geocode': 1}
+    assert all(r is results[0] for r in results[0:60:3])
+    stats = service.inflight_stats()
+    assert stats['executions'] == 4 and stats['coalesced'] == 57 and stats['in_flight'] == {}
+    # Shared results were cached by the single fetch
+    assert service.cache_stats()['weather']['size'] == 2
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, '-q']))
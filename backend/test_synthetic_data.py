@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized synthetic training-data generator
+"""
+
+import numpy as np
+
+from ai_models import ai_prediction_service, HAZARD_FEATURES, SYNTHETIC_FEATURE_RANGES
+
+def test_generator_is_reproducible_and_in_range():
+    first = ai_prediction_service.generate_synthetic_training_data(1000, np.random.default_rng(7))
+    second = ai_prediction_service.generate_synthetic_training_data(1000, np.random.default_rng(7))
+    assert set(first) == set(HAZARD_FEATURES)
+    for disaster_type, (features, labels) in first.items():
+        assert features.shape == (1000, len(HAZARD_FEATURES[disaster_type]))
+        assert labels.shape == (1000,)
+        assert np.array_equal(features, second[disaster_type][0])
+        assert np.array_equal(labels, second[disaster_type][1])
+        for i, column in enumerate(HAZARD_FEATURES[disaster_type]):
+            low, high = SYNTHETIC_FEATURE_RANGES[disaster_type][column]
+            assert low <= features[:, i].min() and features[:, i].max() <= high
+        assert labels.max() <= 1.0
+
+def test_labels_match_scalar_formulas():
+    data = ai_prediction_service.generate_synthetic_training_data(200, np.random.default_rng(0))
+    features, labels = data['flood']
+    for (temp, humidity, pressure, wind_speed, precipitation, visibility, cloud_cover), label in zip(features, labels):
+        assert label == min(1.0, (precipitation / 50) * (1 - visibility / 20) * (humidity / 100))
+    features, labels = data['drought']
+    for (temp, humidity, precipitation, wind_speed, pressure), label in zip(features, labels):
+        assert label == min(1.0, (temp / 45) * (1 - humidity / 60) * (1 - precipitation / 15))
+
+if __name__ == "__main__":
+    import sys
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
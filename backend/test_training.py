@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Tests for the mini-batch training pipeline
+"""
+
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from ai_models import (
+    ai_prediction_service, DisasterPredictionService, FINGERPRINT_FILENAME, HAZARD_FEATURES, TORCH_MODEL_CLASSES
+)
+from model_bundle import BUNDLE_FILENAME
+from test_numpy_inference import copy_torch_artifacts, random_weather
+from training import TrainingJobManager, train_all
+
+def synthetic_tasks(hazards, num_samples=400, epochs=3, batch_size=64):
+    data = ai_prediction_service.generate_synthetic_training_data(num_samples, np.random.default_rng(0))
+    return {
+        h: (TORCH_MODEL_CLASSES[h], None, data[h][0], data[h][1], epochs, batch_size, 0)
+        for h in hazards
+    }
+
+def test_mini_batch_training_reports_progress():
+    results = train_all(synthetic_tasks(['flood']))
+    report = results['flood']['report']
+    assert report['train_samples'] == 320 and report['batch_size'] == 64
+    assert report['wall_time_s'] > 0 and report['samples_per_s'] > 0
+    assert 0 < report['final_loss'] < 1 and 0 < report['test_loss'] < 1
+    assert results['flood']['scaler'].mean_.shape == (len(HAZARD_FEATURES['flood']),)
+
+def test_process_pool_matches_in_process_training():
+    tasks = synthetic_tasks(['wildfire', 'drought'], epochs=2)
+    sequential = train_all(tasks)
+    pooled = train_all(tasks, parallel=True, max_workers=2)
+    for hazard in tasks:
+        # Seeded runs are reproducible regardless of where they run
+        for name, tensor in sequential[hazard]['state_dict'].items():
+            assert np.allclose(tensor.numpy(), pooled[hazard]['state_dict'][name].numpy(), atol=1e-5)
+
+def test_train_models_publishes_new_bundle(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    before = service.predict_disaster_risks(random_weather(1)[0])
+    report = service.train_models(epochs=1, seed=0)
+    assert set(report) == set(HAZARD_FEATURES)
+    assert os.path.exists(tmp_path / BUNDLE_FILENAME)
+    after = service.predict_disaster_risks(random_weather(1)[0])
+    assert before.keys() == after.keys() and before != after
+
+def test_training_job_publishes_models_by_swap(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    serving = service.serving
+    records = random_weather(50)
+    jobs = TrainingJobManager(service, list(HAZARD_FEATURES))
+    job, created = jobs.submit(epochs=1, seed=0)
+    assert created
+    # Only one job runs at a time
+    assert jobs.submit(epochs=1) == (job, False)
+
+    # Predictions keep being served while the job trains
+    while job.status in ('queued', 'running'):
+        assert len(service.predict_disaster_risks_batch(records)) == 50
+        time.sleep(0.01)
+    status = jobs.get(job.job_id).to_dict()
+    assert status['status'] == 'succeeded', status['error']
+    assert status['progress'] == 1.0 and set(status['report']) == set(HAZARD_FEATURES)
+    # The new model set replaced the old one as a whole, already loaded
+    assert service.serving is not serving
+    assert set(service.models) == set(service.enabled_hazards)
+
+def test_startup_skips_training_when_fingerprint_matches(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    assert service.artifacts_current()
+    assert service.schedule_training_if_stale() is None
+    assert service.training_jobs.active_job() is None
+
+    # Another batch size changes the training config, so the stored artifacts are stale
+    assert service.training_fingerprint(batch_size=32)['fingerprint'] != service.stored_fingerprint()
+    with open(tmp_path / FINGERPRINT_FILENAME, 'w') as f:
+        json.dump({'fingerprint': 'stale'}, f)
+    assert not service.artifacts_current()
+    job = service.schedule_training_if_stale(epochs=1)
+    assert job is not None
+    while job.status in ('queued', 'running'):
+        time.sleep(0.05)
+    assert job.status == 'succeeded' and service.artifacts_current()
+
+def test_architecture_hash_covers_only_the_hazard_networks():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'torch_models.py')) as f:
+        source = f.read()
+    architecture_hash = DisasterPredictionService._architecture_hash
+    assert architecture_hash(source) == architecture_hash()
+    # Fused inference code, helpers and docstrings do not make the checkpoints stale
+    refactored = source.replace('return torch.cat([group(x) for group in self.groups], dim=1)',
+                                'outputs = [group(x) for group in self.groups]\n        return torch.cat(outputs, dim=1)')
+    refactored = refactored.replace('"""Specialized model for flood prediction"""', '"""Flood network"""')
+    assert refactored != source
+    assert architecture_hash(refactored + '\ndef helper():\n    return 1\n') == architecture_hash(source)
+    # Layer shapes of a hazard network, or of the base class they share, do
+    assert architecture_hash(source.replace('input_size=7, hidden_size=128', 'input_size=7, hidden_size=64')) != \
+        architecture_hash(source)
+    assert architecture_hash(source.replace('nn.Dropout(0.3)', 'nn.Dropout(0.2)')) != architecture_hash(source)
+
+def test_shipped_artifacts_carry_the_current_fingerprint():
+    # The bundle and the fingerprint file are written together by save_models
+    fingerprint = ai_prediction_service.training_fingerprint()['fingerprint']
+    assert ai_prediction_service.stored_fingerprint() == fingerprint
+    assert ai_prediction_service.bundle.metadata['fingerprint'] == fingerprint
+
+def test_training_is_scheduled_by_the_serving_process_only(tmp_path, monkeypatch):
+    copy_torch_artifacts(tmp_path)
+    with open(tmp_path / FINGERPRINT_FILENAME, 'w') as f:
+        json.dump({'fingerprint': 'stale'}, f)
+    # Building the service (as every spawned training worker does on import) never starts a job
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    assert service.training_jobs.active_job() is None
+
+    monkeypatch.setattr(multiprocessing, 'parent_process', lambda: object())
+    assert service.train_on_startup(epochs=1) is None and service.training_jobs.active_job() is None
+    monkeypatch.setattr(multiprocessing, 'parent_process', lambda: None)
+    job = service.train_on_startup(epochs=1)
+    assert job is not None
+    while job.status in ('queued', 'running'):
+        time.sleep(0.05)
+    assert job.status == 'succeeded'
+
+def test_train_endpoint_rejects_invalid_epochs():
+    import app as backend_app
+    client = backend_app.app.test_client()
+    for epochs in ('abc', None, 2.5, True, [3], 0, -1, backend_app.MAX_TRAIN_EPOCHS + 1):
+        response = client.post('/api/ai/train', json={'epochs': epochs})
+        assert response.status_code == 400 and 'epochs' in response.get_json()['error']
+    assert backend_app.training_jobs.active_job() is None
+
+# Runs a training job (submitted directly, or by the startup hook over stale artifacts) under eventlet's
+# monkey-patching, as in the gunicorn eventlet worker, while a green thread ticks every 10 ms
+EVENTLET_JOB_SCRIPT = """
+import eventlet
+eventlet.monkey_patch()
+import json, os, sys, time
+from ai_models import DisasterPredictionService, FINGERPRINT_FILENAME, HAZARD_FEATURES
+from test_numpy_inference import copy_torch_artifacts
+from training import TrainingJobManager
+
+model_path, mode = sys.argv[1:3]
+copy_torch_artifacts(model_path)
+if mode == 'startup':
+    with open(os.path.join(model_path, FINGERPRINT_FILENAME), 'w') as f:
+        json.dump({'fingerprint': 'stale'}, f)
+service = DisasterPredictionService(model_path=model_path, inference_backend='numpy')
+start = time.perf_counter()
+if mode == 'startup':
+    # What gunicorn.conf.py's post_worker_init does in the serving worker
+    job = service.train_on_startup(epochs=2)
+else:
+    job, _ = TrainingJobManager(service, list(HAZARD_FEATURES)).submit(epochs=2, seed=0)
+submitted = time.perf_counter() - start
+gaps, last = [], time.perf_counter()
+while job.status in ('queued', 'running'):
+    eventlet.sleep(0.01)
+    now = time.perf_counter()
+    gaps.append(now - last)
+    last = now
+print(json.dumps({'status': job.status, 'submitted': submitted, 'duration': time.perf_counter() - start,
+                  'ticks': len(gaps), 'max_gap': max(gaps)}))
+"""
+
+@pytest.mark.parametrize('mode', ['job', 'startup'])
+def test_training_job_leaves_the_eventlet_hub_responsive(tmp_path, mode):
+    pytest.importorskip('eventlet')
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, '-c', EVENTLET_JOB_SCRIPT, str(tmp_path), mode], cwd=backend_dir,
+                            capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stderr
+    run = json.loads(result.stdout.strip().splitlines()[-1])
+    assert run['status'] == 'succeeded' and run['submitted'] < 0.5
+    # A green training thread would hold the hub for the whole run (a single tick at the end)
+    assert run['ticks'] > 20 and run['max_gap'] < run['duration'] / 3, run
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded TTL + LRU cache and its use by the weather service
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import app as backend_app
+from ttl_cache import TTLCache
+from weather_service import WeatherService
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_expiry_uses_elapsed_time():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=4, ttl=300, clock=clock)
+    cache.put('a', 1)
+    clock.now += 299
+    assert cache.get('a') == 1
+    clock.now += 1
+    assert cache.get('a') is None
+    # An entry a day and a bit old is expired (timedelta.seconds would have wrapped to a few seconds)
+    cache.put('b', 2)
+    clock.now += 86400 + 5
+    assert cache.get('b') is None
+    assert cache.stats()['expirations'] == 2 and len(cache) == 0
+
+    cache.put('c', 3)
+    cache.put('d', 4)
+    clock.now += 150
+    cache.put('e', 5)
+    clock.now += 200
+    assert cache.purge_expired() == 2 and cache.get('e') == 5
+
+def test_lru_eviction_and_counters():
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None and cache.get('a') == 1 and cache.get('c') == 3
+    stats = cache.stats()
+    assert stats['size'] == 2 and stats['evictions'] == 1
+    assert stats['hits'] == 3 and stats['misses'] == 1 and stats['hit_rate'] == 0.75
+
+    disabled = TTLCache(max_entries=0)
+    disabled.put('a', 1)
+    assert disabled.get('a') is None and len(disabled) == 0
+
+def test_bounded_under_concurrent_writers():
+    cache = TTLCache(max_entries=50, ttl=60)
+
+    def writer(offset):
+        for i in range(500):
+            cache.put((offset, i), i)
+            cache.get((offset, i // 2))
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats['size'] == 50 and stats['evictions'] == 8 * 500 - 50
+    assert stats['hits'] + stats['misses'] == 8 * 500
+
+class CountingWeatherService(WeatherService):
+    """Provider calls replaced by counters"""
+
+    def __init__(self):
+        super().__init__()
+        self.api_key = 'your-api-key-here'
+        self.calls = {'current': 0, 'forecast': 0, 'geocode': 0}
+
+    async def _current_from_open_meteo(self, lat, lon, location_name, units='metric'):
+        self.calls['current'] += 1
+        return SimpleNamespace(location=location_name, lat=lat, lon=lon)
+
+    async def _fetch_forecast(self, lat, lon, days=5, units='metric'):
+        self.calls['forecast'] += 1
+        return [{'dt': 0}] if lat >= 0 else []
+
+    async def _geocode_uncached(self, query, limit=5):
+        self.calls['geocode'] += 1
+        return [{'name': query, 'lat': 1.0, 'lon': 2.0}]
+
+def test_weather_service_caches_every_provider_call():
+    service = CountingWeatherService()
+
+    async def scenario():
+        for _ in range(3):
+            await service.get_current_weather(10.0, 20.0)
+            await service.get_weather_forecast(10.0, 20.0)
+            await service.get_weather_forecast(-10.0, 20.0)
+            await service.geocode('Paris ')
+            await service.geocode('paris')
+
+    asyncio.run(scenario())
+    # Empty forecasts are not cached
+    assert service.calls == {'current': 1, 'forecast': 4, 'geocode': 1}
+    stats = service.cache_stats()
+    assert stats['weather']['hits'] == 2 and stats['geocode']['hits'] == 5
+    assert stats['forecast']['size'] == 1
+
+def test_cache_stats_endpoint(monkeypatch):
+    monkeypatch.setattr(backend_app, 'weather_service', WeatherService())
+    payload = backend_app.app.test_client().get('/api/cache/stats').get_json()
+    assert {'weather', 'forecast', 'geocode', 'prediction'} <= set(payload)
+    assert payload['weather']['max_entries'] > 0 and payload['weather']['hits'] == 0
+
+if __name__ == "__main__":
+    import sys
+    import pytest
+    sys.exit(pytest.main([__file__, '-q']))
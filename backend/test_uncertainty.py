@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for Monte-Carlo dropout uncertainty
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+import torch
+
+import app as backend_app
+from ai_models import DisasterPredictionService
+from feature_schema import feature_matrix, hazard_features
+from numpy_inference import NumpyHazardModel, fold_hazard_model, torch_model_params
+from test_numpy_inference import copy_torch_artifacts, legacy_torch, random_weather, unfolded
+from weather_service import WeatherData
+
+def test_samples_match_torch_dropout(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = unfolded(legacy_torch(DisasterPredictionService(model_path=str(tmp_path), inference_backend='torch')))
+    entry = service.registry.get('flood')
+    features = hazard_features(feature_matrix(random_weather(4, seed=2)), 'flood')
+    scaled = entry.scaler.transform(features)
+    num_samples = 4000
+
+    # Reference: K sequential-equivalent torch passes with dropout active and BatchNorm in eval mode
+    model = entry.model
+    model.eval()
+    for module in model.modules():
+        if isinstance(module, torch.nn.Dropout):
+            module.train()
+    torch.manual_seed(0)
+    with torch.no_grad():
+        expected = model(torch.FloatTensor(np.tile(scaled, (num_samples, 1)))).squeeze(1).numpy()
+    model.eval()
+    expected = expected.reshape(num_samples, len(features))
+
+    folded = fold_hazard_model(NumpyHazardModel(torch_model_params(model)), entry.scaler)
+    for samples in (NumpyHazardModel(torch_model_params(model)).predict_samples(scaled, num_samples, np.random.default_rng(0)),
+                    folded.predict_samples(features, num_samples, np.random.default_rng(0))):
+        assert samples.shape == (num_samples, len(features))
+        np.testing.assert_allclose(samples.mean(axis=0), expected.mean(axis=0), atol=0.01)
+        np.testing.assert_allclose(samples.std(axis=0), expected.std(axis=0), atol=0.01)
+
+    # Without dropout every sample is the point prediction
+    no_dropout = folded.predict_samples(features, 3, dropout_rate=0.0)
+    np.testing.assert_allclose(no_dropout, np.tile(folded.predict(features), (3, 1)), atol=1e-6)
+
+def test_service_intervals(tmp_path):
+    copy_torch_artifacts(tmp_path)
+    service = DisasterPredictionService(model_path=str(tmp_path), inference_backend='numpy')
+    service.disabled_hazards = {'drought'}
+    records = random_weather(10, seed=5)
+    results = service.predict_uncertainty_batch(records, num_samples=64, seed=1)
+    assert results == service.predict_uncertainty_batch(records, num_samples=64, seed=1)
+    for record, record_results in zip(records, results):
+        for disaster_type, summary in record_results.items():
+            if summary is None:
+                continue
+            assert summary['lower'] - 1e-9 <= summary['mean'] <= summary['upper'] + 1e-9
+            assert summary['confidence'] == pytest.approx(1.0 - (summary['upper'] - summary['lower']))
+        assert record_results['flood']['std'] > 0
+        # Rule-based hazards have no model to sample, so no interval and no confidence
+        assert record_results['drought'] is None
+        assert record_results['earthquake']['upper'] <= 0.05
+
+class FakeWeatherService:
+    async def get_current_weather(self, lat, lon, location_name=None, units='metric'):
+        return WeatherData(
+            location='Testville', coordinates={'lat': lat, 'lng': lon}, temperature=30.0, humidity=90.0,
+            pressure=960.0, wind_speed=35.0, wind_direction=90.0, precipitation=60.0, visibility=2.0,
+            cloud_cover=95.0, weather_condition='Rain', timestamp=datetime.now(timezone.utc)
+        )
+
+def test_predict_endpoint_reports_confidence(monkeypatch):
+    monkeypatch.setattr(backend_app, 'weather_service', FakeWeatherService())
+    monkeypatch.setattr(backend_app, 'generate_prediction_summary', lambda *args: None)
+    monkeypatch.setattr(backend_app, 'predictions', [])
+    client = backend_app.app.test_client()
+
+    payload = client.post('/api/ai/predict', json={'lat': 10.0, 'lon': 20.0}).get_json()
+    assert 'uncertainty' not in payload
+    assert all(p.confidence_level == p.probability for p in backend_app.predictions)
+
+    monkeypatch.setattr(backend_app, 'predictions', [])
+    payload = client.post('/api/ai/predict', json={'lat': 10.0, 'lon': 20.0, 'uncertainty': True}).get_json()
+    uncertainty = payload['uncertainty']
+    assert set(uncertainty) == set(payload['predictions'])
+    stored = backend_app.predictions
+    assert stored and all(p.confidence_level == uncertainty[p.event_type]['confidence'] for p in stored)
+
+    # String flags are parsed like the env flags
+    for flag in ('false', '0', 'no'):
+        payload = client.post('/api/ai/predict', json={'lat': 10.0, 'lon': 20.0, 'uncertainty': flag}).get_json()
+        assert 'uncertainty' not in payload
+    payload = client.post('/api/ai/predict', json={'lat': 10.0, 'lon': 20.0, 'uncertainty': 'true'}).get_json()
+    assert 'uncertainty' in payload
+
+def test_rule_served_hazards_keep_the_default_confidence(monkeypatch):
+    monkeypatch.setattr(backend_app, 'weather_service', FakeWeatherService())
+    monkeypatch.setattr(backend_app, 'generate_prediction_summary', lambda *args: None)
+    monkeypatch.setattr(backend_app, 'predictions', [])
+    service = backend_app.ai_prediction_service
+    monkeypatch.setattr(service, 'disabled_hazards', set(service.disabled_hazards) | {'flood'})
+    payload = backend_app.app.test_client().post(
+        '/api/ai/predict', json={'lat': 10.0, 'lon': 20.0, 'uncertainty': True}
+    ).get_json()
+    assert payload['uncertainty']['flood'] is None
+    flood = [p for p in backend_app.predictions if p.event_type == 'flood']
+    assert flood and flood[0].confidence_level == flood[0].probability
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, '-q']))
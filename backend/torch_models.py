@@ -0,0 +1,184 @@
+"""PyTorch definitions of the hazard prediction networks.
+
+Kept separate from ai_models so that inference-only workers running the NumPy
+backend never import torch; the service imports this module only when it
+trains or serves with the PyTorch backend.
+"""
+import types
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from typing import Dict, List, Tuple
+
+class DisasterPredictionModel(nn.Module):
+    """Base neural network for disaster prediction"""
+    
+    def __init__(self, input_size: int, hidden_size: int = 128, num_classes: int = 1):
+        super(DisasterPredictionModel, self).__init__()
+        self.fc1 = nn.Linear(input_size, hidden_size)
+        self.fc2 = nn.Linear(hidden_size, hidden_size // 2)
+        self.fc3 = nn.Linear(hidden_size // 2, hidden_size // 4)
+        self.fc4 = nn.Linear(hidden_size // 4, num_classes)
+        self.dropout = nn.Dropout(0.3)
+        self.batch_norm1 = nn.BatchNorm1d(hidden_size)
+        self.batch_norm2 = nn.BatchNorm1d(hidden_size // 2)
+        self.batch_norm3 = nn.BatchNorm1d(hidden_size // 4)
+    
+    def forward(self, x):
+        x = F.relu(self.batch_norm1(self.fc1(x)))
+        x = self.dropout(x)
+        x = F.relu(self.batch_norm2(self.fc2(x)))
+        x = self.dropout(x)
+        x = F.relu(self.batch_norm3(self.fc3(x)))
+        x = torch.sigmoid(self.fc4(x))
+        return x
+
+class FloodPredictionModel(DisasterPredictionModel):
+    """Specialized model for flood prediction"""
+    
+    def __init__(self):
+        # Input features: temperature, humidity, pressure, wind_speed, precipitation, visibility, cloud_cover
+        super().__init__(input_size=7, hidden_size=128, num_classes=1)
+
+class WildfirePredictionModel(DisasterPredictionModel):
+    """Specialized model for wildfire prediction"""
+    
+    def __init__(self):
+        # Input features: temperature, humidity, wind_speed, precipitation, visibility
+        super().__init__(input_size=5, hidden_size=128, num_classes=1)
+
+class StormPredictionModel(DisasterPredictionModel):
+    """Specialized model for storm prediction"""
+    
+    def __init__(self):
+        # Input features: temperature, humidity, pressure, wind_speed, wind_direction, cloud_cover
+        super().__init__(input_size=6, hidden_size=128, num_classes=1)
+
+class EarthquakePredictionModel(DisasterPredictionModel):
+    """Specialized model for earthquake prediction"""
+    
+    def __init__(self):
+        # Input features: pressure, wind_speed, temperature, humidity, cloud_cover
+        super().__init__(input_size=5, hidden_size=128, num_classes=1)
+
+class TornadoPredictionModel(DisasterPredictionModel):
+    """Specialized model for tornado prediction"""
+    
+    def __init__(self):
+        # Input features: temperature, humidity, pressure, wind_speed, wind_direction, cloud_cover
+        super().__init__(input_size=6, hidden_size=128, num_classes=1)
+
+class LandslidePredictionModel(DisasterPredictionModel):
+    """Specialized model for landslide prediction"""
+    
+    def __init__(self):
+        # Input features: temperature, humidity, precipitation, wind_speed, pressure
+        super().__init__(input_size=5, hidden_size=128, num_classes=1)
+
+class DroughtPredictionModel(DisasterPredictionModel):
+    """Specialized model for drought prediction"""
+    
+    def __init__(self):
+        # Input features: temperature, humidity, precipitation, wind_speed, pressure
+        super().__init__(input_size=5, hidden_size=128, num_classes=1)
+
+def _refuse_training(self, mode: bool = True):
+    if mode:
+        raise RuntimeError(f"{type(self).__name__} is inference-only: its tensors are read-only memory")
+    return self
+
+def _refuse_state_load(self, *args, **kwargs):
+    raise RuntimeError(f"{type(self).__name__} is inference-only: its tensors are read-only memory")
+
+def make_inference_only(model: nn.Module) -> nn.Module:
+    """Switch a model whose tensors live in read-only memory (the mapped model bundle) to eval mode
+    without gradients, and make train() and load_state_dict() on it or any submodule raise.
+    Writing to such a tensor (BatchNorm running stats in train mode, an optimizer step, loading a
+    state dict) is a segmentation fault rather than a Python error."""
+    model.requires_grad_(False)
+    model.eval()
+    for module in model.modules():
+        module.train = types.MethodType(_refuse_training, module)
+        module.load_state_dict = types.MethodType(_refuse_state_load, module)
+    return model
+
+class FusedHeadGroup(nn.Module):
+    """Stacked parameters of hazard models that share the same layer shapes.
+    Every layer of the group is evaluated as one batched matmul over all of its hazards."""
+
+    def __init__(self, models: List[DisasterPredictionModel], scalers: List, columns: List[List[str]], feature_names: List[str]):
+        super().__init__()
+        num_features = len(feature_names)
+        hidden_size = models[0].fc1.out_features
+
+        # Per-hazard scaling and column gather over the canonical feature vector.
+        # Columns a hazard does not use get a zero scale and zero first-layer weights.
+        mean = torch.zeros(len(models), num_features)
+        inv_scale = torch.zeros(len(models), num_features)
+        fc1_weight = torch.zeros(len(models), hidden_size, num_features)
+        for i, (model, scaler, hazard_columns) in enumerate(zip(models, scalers, columns)):
+            idx = [feature_names.index(column) for column in hazard_columns]
+            mean[i, idx] = torch.tensor(scaler.mean_, dtype=torch.float32)
+            inv_scale[i, idx] = 1.0 / torch.tensor(scaler.scale_, dtype=torch.float32)
+            fc1_weight[i][:, idx] = model.fc1.weight.detach()
+        self.register_buffer('mean', mean.unsqueeze(1))
+        self.register_buffer('inv_scale', inv_scale.unsqueeze(1))
+
+        # Linear layers as (hazards, in, out) weights and (hazards, 1, out) biases
+        weights = [fc1_weight.transpose(1, 2)] + [
+            torch.stack([getattr(m, name).weight.detach().t() for m in models])
+            for name in ('fc2', 'fc3', 'fc4')
+        ]
+        for i, (weight, name) in enumerate(zip(weights, ('fc1', 'fc2', 'fc3', 'fc4'))):
+            bias = torch.stack([getattr(m, name).bias.detach() for m in models]).unsqueeze(1)
+            self.register_buffer(f'weight{i}', weight.contiguous())
+            self.register_buffer(f'bias{i}', bias)
+
+        # Eval-mode BatchNorm as a per-channel affine transform
+        for i, name in enumerate(('batch_norm1', 'batch_norm2', 'batch_norm3')):
+            norms = [getattr(m, name) for m in models]
+            scale = torch.stack([bn.weight.detach() / torch.sqrt(bn.running_var + bn.eps) for bn in norms])
+            shift = torch.stack([bn.bias.detach() for bn in norms]) - torch.stack([bn.running_mean for bn in norms]) * scale
+            self.register_buffer(f'bn_scale{i}', scale.unsqueeze(1))
+            self.register_buffer(f'bn_shift{i}', shift.unsqueeze(1))
+
+    def forward(self, x):
+        # (N, features) -> (hazards, N, features), scaled per hazard
+        x = (x.unsqueeze(0) - self.mean) * self.inv_scale
+        for i in range(3):
+            x = torch.baddbmm(getattr(self, f'bias{i}'), x, getattr(self, f'weight{i}'))
+            x = F.relu(x * getattr(self, f'bn_scale{i}') + getattr(self, f'bn_shift{i}'))
+        x = torch.sigmoid(torch.baddbmm(self.bias3, x, self.weight3))
+        # (hazards, N, 1) -> (N, hazards)
+        return x.squeeze(2).t()
+
+class FusedHazardModel(nn.Module):
+    """Inference-only fusion of the per-hazard models.
+    Takes one (N, len(feature_names)) tensor of raw weather features and returns an
+    (N, len(hazards)) tensor of risks, evaluating all hazard heads in a single call.
+    hazard_features maps each hazard to the feature columns its model was trained on."""
+
+    def __init__(self, models: Dict[str, DisasterPredictionModel], scalers: Dict,
+                 feature_names: List[str], hazard_features: Dict[str, List[str]]):
+        super().__init__()
+        # Group hazards whose architectures match so their layers can share batched matmuls
+        groups: Dict[Tuple[int, ...], List[str]] = {}
+        for disaster_type, model in models.items():
+            if disaster_type not in scalers:
+                continue
+            shape = tuple(getattr(model, name).out_features for name in ('fc1', 'fc2', 'fc3', 'fc4'))
+            groups.setdefault(shape, []).append(disaster_type)
+
+        self.hazards: List[str] = [hazard for hazards in groups.values() for hazard in hazards]
+        self.groups = nn.ModuleList([
+            FusedHeadGroup(
+                [models[h] for h in hazards],
+                [scalers[h] for h in hazards],
+                [hazard_features[h] for h in hazards],
+                feature_names
+            )
+            for hazards in groups.values()
+        ])
+
+    def forward(self, x):
+        return torch.cat([group(x) for group in self.groups], dim=1)
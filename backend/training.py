@@ -0,0 +1,238 @@
+"""Mini-batch training of the per-hazard models.
+
+train_hazard_model is a top-level function over plain arrays and state dicts, so
+the hazards can be trained one after another in-process or concurrently in a
+process pool (one hazard per worker). TrainingJobManager runs training in the
+background and tracks each job's progress.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Optimizer settings and held-out fraction shared by every hazard (part of the artifact fingerprint)
+LEARNING_RATE = 0.001
+TEST_SIZE = 0.2
+
+def train_hazard_model(disaster_type: str, model_class: str, state_dict: Optional[Dict[str, Any]],
+                       features: np.ndarray, labels: np.ndarray, epochs: int, batch_size: int,
+                       seed: Optional[int] = None, threads: Optional[int] = None) -> Dict[str, Any]:
+    """Train one hazard model with shuffled mini-batches.
+    Returns the trained state dict, the fitted scaler and a report with wall time,
+    throughput (samples/s) and the final train and test losses."""
+    import torch
+    import torch.nn as nn
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.model_selection import train_test_split
+    import torch_models
+
+    if threads:
+        torch.set_num_threads(threads)
+    if seed is not None:
+        torch.manual_seed(seed)
+    model = getattr(torch_models, model_class)()
+    if state_dict is not None:
+        model.load_state_dict(state_dict)
+
+    start = time.perf_counter()
+    # Split data
+    X_train, X_test, y_train, y_test = train_test_split(features, labels, test_size=TEST_SIZE, random_state=42)
+
+    # Scale features
+    scaler = StandardScaler()
+    X_train_tensor = torch.FloatTensor(scaler.fit_transform(X_train))
+    y_train_tensor = torch.FloatTensor(y_train).unsqueeze(1)
+    X_test_tensor = torch.FloatTensor(scaler.transform(X_test))
+    y_test_tensor = torch.FloatTensor(y_test).unsqueeze(1)
+
+    criterion = nn.BCELoss()
+    optimizer = torch.optim.Adam(model.parameters(), lr=LEARNING_RATE)
+    generator = torch.Generator()
+    if seed is not None:
+        generator.manual_seed(seed)
+
+    num_train = len(X_train_tensor)
+    batch_size = max(2, min(batch_size, num_train))
+    epoch_loss = float('nan')
+    model.train()
+    for epoch in range(epochs):
+        permutation = torch.randperm(num_train, generator=generator)
+        total_loss = 0.0
+        for begin in range(0, num_train, batch_size):
+            indices = permutation[begin:begin + batch_size]
+            if len(indices) < 2:
+                # BatchNorm needs more than one sample per training batch
+                continue
+            optimizer.zero_grad()
+            loss = criterion(model(X_train_tensor[indices]), y_train_tensor[indices])
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item() * len(indices)
+        epoch_loss = total_loss / num_train
+
+        if (epoch + 1) % 20 == 0:
+            logger.info(f"{disaster_type} epoch [{epoch+1}/{epochs}], Loss: {epoch_loss:.4f}")
+
+    # Evaluate
+    model.eval()
+    with torch.no_grad():
+        test_loss = criterion(model(X_test_tensor), y_test_tensor).item()
+    wall_time = time.perf_counter() - start
+    logger.info(f"{disaster_type} model test loss: {test_loss:.4f}")
+
+    return {
+        'state_dict': model.state_dict(),
+        'scaler': scaler,
+        'report': {
+            'wall_time_s': wall_time,
+            'samples_per_s': epochs * num_train / wall_time if wall_time > 0 else 0.0,
+            'final_loss': epoch_loss,
+            'test_loss': test_loss,
+            'epochs': epochs,
+            'batch_size': batch_size,
+            'train_samples': num_train,
+        },
+    }
+
+def eventlet_patched() -> bool:
+    """Whether eventlet monkey-patched threading (the gunicorn eventlet worker)"""
+    if 'eventlet' not in sys.modules:
+        return False
+    from eventlet import patcher
+    return patcher.is_monkey_patched('thread')
+
+def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Call fn(*args, **kwargs) and return its result. Under eventlet threading.Thread is a green thread,
+    so the call is made on a real OS thread (eventlet.tpool) and CPU-bound work does not hold the
+    worker's hub while it runs."""
+    if eventlet_patched():
+        from eventlet import tpool
+        return tpool.execute(fn, *args, **kwargs)
+    return fn(*args, **kwargs)
+
+def default_worker_count(num_tasks: int) -> int:
+    return max(1, min(num_tasks, os.cpu_count() or 1))
+
+def train_all(tasks: Dict[str, Tuple], parallel: bool = False, max_workers: Optional[int] = None,
+              on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
+    """Train every hazard; tasks map hazard -> train_hazard_model positional args after disaster_type.
+    With parallel=True each hazard trains in its own process (spawned, single-threaded torch).
+    on_result is called with each hazard's result as soon as it finishes."""
+    results: Dict[str, Dict[str, Any]] = {}
+    if not parallel or len(tasks) <= 1:
+        for disaster_type, args in tasks.items():
+            results[disaster_type] = train_hazard_model(disaster_type, *args)
+            if on_result:
+                on_result(disaster_type, results[disaster_type])
+        return results
+
+    workers = max_workers or default_worker_count(len(tasks))
+    # Spawn rather than fork: forking a process that already initialized torch threads can deadlock
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+        futures = {
+            pool.submit(train_hazard_model, disaster_type, *args, threads=1): disaster_type
+            for disaster_type, args in tasks.items()
+        }
+        for future in as_completed(futures):
+            disaster_type = futures[future]
+            results[disaster_type] = future.result()
+            if on_result:
+                on_result(disaster_type, results[disaster_type])
+    # Keep the task order
+    return {disaster_type: results[disaster_type] for disaster_type in tasks}
+
+@dataclass
+class TrainingJob:
+    """A background training run and its progress"""
+    job_id: str
+    epochs: int
+    status: str = 'queued'  # queued -> running -> succeeded | failed
+    hazards_total: int = 0
+    hazards_done: List[str] = field(default_factory=list)
+    report: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'epochs': self.epochs,
+            'progress': len(self.hazards_done) / self.hazards_total if self.hazards_total else 0.0,
+            'hazards_done': list(self.hazards_done),
+            'hazards_total': self.hazards_total,
+            'report': dict(self.report),
+            'error': self.error,
+            'created_at': datetime.fromtimestamp(self.created_at, timezone.utc).isoformat(),
+            'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).isoformat() if self.started_at else None,
+            'finished_at': datetime.fromtimestamp(self.finished_at, timezone.utc).isoformat() if self.finished_at else None,
+        }
+
+class TrainingJobManager:
+    """Runs train_models in a background thread, one job at a time.
+    The training itself runs through run_blocking, so under eventlet it leaves the hub free for requests.
+    The service trains its own copies of the models and publishes them with an atomic swap,
+    so predictions keep being served from the previous models until the job finishes."""
+
+    def __init__(self, service, hazards: List[str], max_history: int = 20):
+        self.service = service
+        self.hazards = list(hazards)
+        self.max_history = max_history
+        self._jobs: "OrderedDict[str, TrainingJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, epochs: int, **train_kwargs) -> Tuple[TrainingJob, bool]:
+        """Start a training job; returns (job, created). While a job is active it is returned instead."""
+        with self._lock:
+            active = self.active_job()
+            if active is not None:
+                return active, False
+            job = TrainingJob(job_id=uuid.uuid4().hex, epochs=epochs, hazards_total=len(self.hazards))
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self.max_history:
+                self._jobs.popitem(last=False)
+        thread = threading.Thread(target=self._run, args=(job, train_kwargs), daemon=True)
+        thread.start()
+        return job, True
+
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active_job(self) -> Optional[TrainingJob]:
+        for job in self._jobs.values():
+            if job.status in ('queued', 'running'):
+                return job
+        return None
+
+    def _run(self, job: TrainingJob, train_kwargs: Dict[str, Any]):
+        job.status = 'running'
+        job.started_at = time.time()
+
+        def progress(disaster_type: str, report: Dict[str, Any]):
+            job.report[disaster_type] = report
+            job.hazards_done.append(disaster_type)
+
+        try:
+            self.service.train_models(epochs=job.epochs, progress=progress, **train_kwargs)
+            job.status = 'succeeded'
+        except Exception as e:
+            logger.error(f"Training job {job.job_id} failed: {e}")
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.finished_at = time.time()
@@ -1,15 +1,27 @@
 import os
 import asyncio
-import aiohttp
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional, Any
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import time
 
+from geo_cells import CellSnapper, GeoCell
+from http_session import http_sessions
+from single_flight import SingleFlight
+from ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Provider response caches: entry bound and time to live (s) for current weather, forecasts and geocoding
+WEATHER_CACHE_SIZE: int = int(os.getenv('WEATHER_CACHE_SIZE', '1024'))
+WEATHER_CACHE_TTL: float = float(os.getenv('WEATHER_CACHE_TTL', '300'))
+FORECAST_CACHE_SIZE: int = int(os.getenv('FORECAST_CACHE_SIZE', '256'))
+FORECAST_CACHE_TTL: float = float(os.getenv('FORECAST_CACHE_TTL', '1800'))
+GEOCODE_CACHE_SIZE: int = int(os.getenv('GEOCODE_CACHE_SIZE', '1024'))
+GEOCODE_CACHE_TTL: float = float(os.getenv('GEOCODE_CACHE_TTL', '86400'))
+
 @dataclass
 class WeatherData:
     """Weather data structure"""
@@ -26,6 +38,8 @@ class WeatherData:
     weather_condition: str
     timestamp: datetime
     forecast_data: List[Dict[str, Any]] = None
+    # Cache cell the weather was fetched for: its id and centroid ('lat', 'lng')
+    cell: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -42,45 +56,115 @@ class WeatherData:
             'weather_condition': self.weather_condition,
             'timestamp': self.timestamp.isoformat(),
             'forecast_data': self.forecast_data or [],
+            'cell': self.cell,
         }
 
+# Feature values used when neither a forecast entry nor the caller's defaults provide one
+FORECAST_FEATURE_DEFAULTS: Dict[str, float] = {
+    'temperature': 20.0,
+    'humidity': 50.0,
+    'pressure': 1013.0,
+    'wind_speed': 0.0,
+    'wind_direction': 0.0,
+    'precipitation': 0.0,
+    'visibility': 10.0,
+    'cloud_cover': 0.0,
+}
+
+def forecast_weather_records(forecast: List[Dict[str, Any]],
+                             defaults: Optional[Dict[str, float]] = None) -> List[Dict[str, float]]:
+    """Model feature records for OpenWeather-shaped forecast entries.
+    Fields an entry lacks take the value from defaults (e.g. the current weather)."""
+    fallback = dict(FORECAST_FEATURE_DEFAULTS)
+    fallback.update({k: v for k, v in (defaults or {}).items() if k in FORECAST_FEATURE_DEFAULTS and v is not None})
+    records: List[Dict[str, float]] = []
+    for entry in forecast:
+        main = entry.get('main') or {}
+        wind = entry.get('wind') or {}
+        rain = entry.get('rain') or {}
+        if '1h' in rain:
+            precipitation = rain['1h']
+        elif '3h' in rain:
+            # Forecast steps report 3-hour totals; the models take hourly precipitation like current weather
+            precipitation = rain['3h'] / 3.0
+        else:
+            # Both providers omit rain for dry steps
+            precipitation = 0.0
+        visibility = entry.get('visibility')
+        values = {
+            'temperature': main.get('temp'),
+            'humidity': main.get('humidity'),
+            'pressure': main.get('pressure'),
+            'wind_speed': wind.get('speed'),
+            'wind_direction': wind.get('deg'),
+            'precipitation': precipitation,
+            'visibility': visibility / 1000 if visibility is not None else None,  # Convert to km
+            'cloud_cover': (entry.get('clouds') or {}).get('all'),
+        }
+        records.append({k: float(v) if v is not None else float(fallback[k]) for k, v in values.items()})
+    return records
+
 class WeatherService:
     """Service for fetching real-time weather data from OpenWeatherMap API (with robust fallbacks)"""
 
     def __init__(self):
         self.api_key = os.getenv('OPENWEATHER_API_KEY', 'your-api-key-here')
         self.base_url = "https://api.openweathermap.org/data/2.5"
-        self.session = None
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.cache_duration = 300  # 5 minutes
+        self.cache = TTLCache(WEATHER_CACHE_SIZE, WEATHER_CACHE_TTL, name='weather')
+        self.forecast_cache = TTLCache(FORECAST_CACHE_SIZE, FORECAST_CACHE_TTL, name='forecast')
+        self.geocode_cache = TTLCache(GEOCODE_CACHE_SIZE, GEOCODE_CACHE_TTL, name='geocode')
+        # Concurrent cache misses for the same lookup share one upstream fetch
+        self.inflight = SingleFlight()
+        # Nearby coordinates share a cache cell and are fetched at its centroid
+        self.cells = CellSnapper()
 
     async def initialize(self):
-        """Deprecated: no-op (we now use per-call ClientSession to avoid cross-loop issues)."""
-        return
+        """Open the running loop's pooled HTTP session (also opened on first request)."""
+        await http_sessions.get()
 
     async def close(self):
-        """Deprecated: no-op (per-call sessions are context-managed)."""
-        return
+        """Close the running loop's pooled HTTP session and its keep-alive connections."""
+        await http_sessions.close()
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss/eviction counters of the provider response caches"""
+        return {cache.name: cache.stats() for cache in (self.cache, self.forecast_cache, self.geocode_cache)}
 
-    def _is_cache_valid(self, location: str) -> bool:
-        """Check if cached data is still valid"""
-        if location not in self.cache:
-            return False
+    def inflight_stats(self) -> Dict[str, Any]:
+        """Coalesced provider lookups and the callers waiting per in-flight key"""
+        return self.inflight.stats()
 
-        cache_time = self.cache[location]['timestamp']
-        return (datetime.utcnow() - cache_time).seconds < self.cache_duration
+    def weather_cell(self, lat: float, lon: float) -> GeoCell:
+        """Cache cell whose centroid weather lookups for these coordinates are served from"""
+        return self.cells.snap(lat, lon)
+
+    @staticmethod
+    def _for_caller(weather: Optional[WeatherData], lat: float, lon: float,
+                    location_name: Optional[str]) -> Optional[WeatherData]:
+        """Cell weather labelled with the caller's location and coordinates (the centroid stays in cell)"""
+        if not isinstance(weather, WeatherData):
+            return weather
+        return replace(weather, location=location_name or f"{lat}, {lon}", coordinates={'lat': lat, 'lng': lon})
 
     async def get_current_weather(self, lat: float, lon: float, location_name: str = None, units: str = 'metric') -> Optional[WeatherData]:
-        """Get current weather data for a location with OpenWeather first, then Open‑Meteo fallback."""
+        """Get current weather data for a location, from the cache or one shared upstream fetch for its cell."""
+        cell = self.weather_cell(lat, lon)
+        cache_key = f"{cell.id}_{units}"
+        weather = self.cache.get(cache_key)
+        if weather is not None:
+            logger.info(f"Using cached weather data for {location_name or cache_key}")
+        else:
+            weather = await self.inflight.do(
+                f"weather:{cache_key}", lambda: self._fetch_current_weather(cell, units, cache_key)
+            )
+        return self._for_caller(weather, lat, lon, location_name)
+
+    async def _fetch_current_weather(self, cell: GeoCell, units: str, cache_key: str) -> Optional[WeatherData]:
+        """Fetch current weather at the cell centroid with OpenWeather first, then Open‑Meteo fallback, and cache it."""
+        lat, lon, location_name = cell.lat, cell.lon, None
         try:
             await self.initialize()
 
-            # Check cache first
-            cache_key = f"{lat}_{lon}_{units}"
-            if self._is_cache_valid(cache_key):
-                logger.info(f"Using cached weather data for {location_name or cache_key}")
-                return self.cache[cache_key]['data']
-
             weather_data: Optional[WeatherData] = None
 
             # Primary source: OpenWeather (if API key present)
@@ -93,7 +177,7 @@ class WeatherService:
                     'units': units  # 'metric', 'imperial', or 'standard'
                 }
                 try:
-                    async with aiohttp.ClientSession() as session:
+                    async with http_sessions.session() as session:
                         async with session.get(url, params=params) as response:
                             if response.status == 200:
                                 data = await response.json()
@@ -126,10 +210,8 @@ class WeatherService:
 
             # Cache if successful
             if weather_data:
-                self.cache[cache_key] = {
-                    'data': weather_data,
-                    'timestamp': datetime.utcnow()
-                }
+                weather_data.cell = cell.to_dict()
+                self.cache.put(cache_key, weather_data)
                 logger.info(f"Fetched weather data for {weather_data.location}")
                 return weather_data
 
@@ -140,6 +222,20 @@ class WeatherService:
             return None
 
     async def geocode(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Resolve a place name to coordinates; non-empty results are cached"""
+        cache_key = f"{query.strip().lower()}_{limit}"
+        cached = self.geocode_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        return await self.inflight.do(f"geocode:{cache_key}", lambda: self._geocode_and_cache(query, limit, cache_key))
+
+    async def _geocode_and_cache(self, query: str, limit: int, cache_key: str) -> List[Dict[str, Any]]:
+        results = await self._geocode_uncached(query, limit)
+        if results:
+            self.geocode_cache.put(cache_key, results)
+        return results
+
+    async def _geocode_uncached(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Resolve a place name to coordinates with layered fallbacks:
         1) OpenWeather (requires API key)
         2) OpenStreetMap Nominatim (no key)
@@ -156,7 +252,7 @@ class WeatherService:
                     'limit': limit,
                     'appid': self.api_key
                 }
-                async with aiohttp.ClientSession() as session:
+                async with http_sessions.session() as session:
                     async with session.get(geo_url, params=params) as response:
                         if response.status == 200:
                             data = await response.json()
@@ -215,7 +311,7 @@ class WeatherService:
                 # Include contact info in UA per Nominatim policy if possible
                 'User-Agent': 'DisastroScope/1.0 (contact: support@disastroscope.local)'
             }
-            async with aiohttp.ClientSession() as session:
+            async with http_sessions.session() as session:
                 async with session.get(url, params=params, headers=headers) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -248,7 +344,7 @@ class WeatherService:
                 "language": "en",
                 "format": "json",
             }
-            async with aiohttp.ClientSession() as session:
+            async with http_sessions.session() as session:
                 async with session.get(url, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -287,9 +383,7 @@ class WeatherService:
                 "timezone": "auto",
             }
             url = "https://api.open-meteo.com/v1/forecast"
-            # Use a per-call session to avoid relying on a shared loop-bound session
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
+            async with http_sessions.session() as session:
                 async with session.get(url, params=params) as response:
                     if response.status != 200:
                         logger.error(f"Open-Meteo current weather failed: status={response.status}")
@@ -344,7 +438,7 @@ class WeatherService:
             params = {
                 "latitude": lat,
                 "longitude": lon,
-                "hourly": "temperature_2m,precipitation,cloud_cover,wind_speed_10m",
+                "hourly": "temperature_2m,relative_humidity_2m,pressure_msl,precipitation,cloud_cover,wind_speed_10m,wind_direction_10m",
                 "temperature_unit": temp_unit,
                 "windspeed_unit": wind_unit,
                 "precipitation_unit": "mm",
@@ -352,8 +446,7 @@ class WeatherService:
                 "timezone": "auto",
             }
             url = "https://api.open-meteo.com/v1/forecast"
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
+            async with http_sessions.session() as session:
                 async with session.get(url, params=params) as response:
                     if response.status != 200:
                         logger.error(f"Open-Meteo forecast failed: status={response.status}")
@@ -364,6 +457,13 @@ class WeatherService:
                     temps = hourly.get("temperature_2m") or []
                     precs = hourly.get("precipitation") or []
                     clouds = hourly.get("cloud_cover") or []
+                    humidities = hourly.get("relative_humidity_2m") or []
+                    pressures = hourly.get("pressure_msl") or []
+                    winds = hourly.get("wind_speed_10m") or []
+                    directions = hourly.get("wind_direction_10m") or []
+
+                    def value_at(values: List[Any], i: int) -> Optional[float]:
+                        return float(values[i]) if i < len(values) and values[i] is not None else None
                     # Build a list with a familiar shape to the frontend
                     items: List[Dict[str, Any]] = []
                     for i in range(min(len(times), len(temps))):
@@ -372,17 +472,46 @@ class WeatherService:
                         p_val = float(precs[i] if precs[i] is not None else 0.0)
                         c_val = float(clouds[i] if clouds[i] is not None else 0.0)
                         cond = "Rain" if p_val > 0.1 else ("Clouds" if c_val >= 75 else ("Partly Cloudy" if c_val >= 25 else "Clear"))
-                        items.append({
+                        item = {
                             "dt_txt": t_iso,
                             "main": {"temp": t_val},
                             "weather": [{"main": cond}],
-                        })
+                            "clouds": {"all": c_val},
+                            "rain": {"1h": p_val},
+                        }
+                        # Remaining OpenWeather-style fields, when Open-Meteo returned them
+                        if value_at(humidities, i) is not None:
+                            item["main"]["humidity"] = value_at(humidities, i)
+                        if value_at(pressures, i) is not None:
+                            item["main"]["pressure"] = value_at(pressures, i)
+                        wind = {k: v for k, v in (("speed", value_at(winds, i)), ("deg", value_at(directions, i))) if v is not None}
+                        if wind:
+                            item["wind"] = wind
+                        items.append(item)
                     return items
         except Exception as e:
             logger.error(f"Open-Meteo forecast error: {e}")
             return []
 
     async def get_weather_forecast(self, lat: float, lon: float, days: int = 5, units: str = 'metric') -> List[Dict[str, Any]]:
+        """Get weather forecast for a location's cell (fetched at its centroid); non-empty forecasts are cached"""
+        cell = self.weather_cell(lat, lon)
+        cache_key = f"{cell.id}_{days}_{units}"
+        cached = self.forecast_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        return await self.inflight.do(
+            f"forecast:{cache_key}", lambda: self._fetch_and_cache_forecast(cell.lat, cell.lon, days, units, cache_key)
+        )
+
+    async def _fetch_and_cache_forecast(self, lat: float, lon: float, days: int, units: str,
+                                        cache_key: str) -> List[Dict[str, Any]]:
+        forecast = await self._fetch_forecast(lat, lon, days, units)
+        if forecast:
+            self.forecast_cache.put(cache_key, forecast)
+        return forecast
+
+    async def _fetch_forecast(self, lat: float, lon: float, days: int = 5, units: str = 'metric') -> List[Dict[str, Any]]:
         """Get weather forecast for a location. Falls back to Open‑Meteo if OpenWeather fails or API key is missing."""
         try:
             await self.initialize()
@@ -398,7 +527,7 @@ class WeatherService:
                     'cnt': days * 8  # 8 forecasts per day (3-hour intervals)
                 }
                 try:
-                    async with aiohttp.ClientSession() as session:
+                    async with http_sessions.session() as session:
                         async with session.get(url, params=params) as response:
                             if response.status == 200:
                                 data = await response.json()
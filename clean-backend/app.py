@@ -10,7 +10,6 @@ import threading
 import time
 from typing import Dict, List, Any
 import logging
-import asyncio
 from contextlib import suppress
 
 # Load environment variables from .env (must happen BEFORE importing modules that read env)
@@ -20,6 +19,8 @@ from weather_service import weather_service, WeatherData
 from ai_models import ai_prediction_service
 from openfema_service import openfema_service, FEMADeclaration
 from eonet_service import eonet_service, EONETEvent
+from async_bridge import async_bridge, run_async
+from http_session import http_sessions
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -88,6 +89,9 @@ def generate_prediction_summary(event_type: str, location: str, weather: Dict[st
         logger.warning(f"Gemini summary generation failed: {e}")
     return ""
 
+# Time (s) a background thread waits for one provider sweep on the async bridge
+BACKGROUND_FETCH_TIMEOUT = float(os.getenv('BACKGROUND_FETCH_TIMEOUT', '120'))
+
 # Major cities for weather monitoring
 MONITORED_LOCATIONS = [
     {'name': 'San Francisco, CA', 'coords': {'lat': 37.7749, 'lng': -122.4194}},
@@ -207,7 +211,19 @@ def health_check():
         'status': 'healthy',
         'timestamp': datetime.now(timezone.utc).isoformat(),
         'service': 'DisastroScope Backend API',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'async_bridge': async_bridge.stats(),
+        'http_pool': http_sessions.stats()
+    })
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    """Counters of the provider response caches and coalesced provider lookups"""
+    return jsonify({
+        **weather_service.cache_stats(),
+        'single_flight': weather_service.inflight_stats(),
+        'cell': weather_service.cells.stats(),
+        'timestamp': datetime.now(timezone.utc).isoformat()
     })
 
 # Geocoding endpoint for worldwide location search
@@ -221,12 +237,9 @@ def geocode_location():
         return jsonify({'error': 'Query parameter required'}), 400
     
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
         # Fetch multiple candidates to improve worldwide matching
-        results = loop.run_until_complete(weather_service.geocode(query, limit=5))
+        results = run_async(weather_service.geocode(query, limit=5))
         if not results:
-            loop.close()
             return jsonify({'error': 'No results for query'}), 404
 
         # Choose the best candidate: prefer exact (case-insensitive) name match, else first
@@ -252,8 +265,7 @@ def geocode_location():
         lat = best['lat']
         lon = best['lon']
         name = f"{best.get('name')}{', ' + best.get('state') if best.get('state') else ''}{' ' + best.get('country') if best.get('country') else ''}".strip()
-        weather = loop.run_until_complete(weather_service.get_current_weather(lat, lon, name, 'metric'))
-        loop.close()
+        weather = run_async(weather_service.get_current_weather(lat, lon, name, 'metric'))
         if not weather:
             return jsonify({'error': 'Failed to fetch weather'}), 502
         return jsonify(weather.to_dict())
@@ -272,13 +284,9 @@ def analyze_location():
         return jsonify({'error': 'Location query required'}), 400
     
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         # Step 1: Geocode the location
-        results = loop.run_until_complete(weather_service.geocode(query, limit=5))
+        results = run_async(weather_service.geocode(query, limit=5))
         if not results:
-            loop.close()
             return jsonify({'error': 'Location not found'}), 404
 
         # Step 2: Get the best match
@@ -304,9 +312,8 @@ def analyze_location():
         location_name = f"{best.get('name')}{', ' + best.get('state') if best.get('state') else ''}{' ' + best.get('country') if best.get('country') else ''}".strip()
         
         # Step 3: Get current weather
-        weather = loop.run_until_complete(weather_service.get_current_weather(lat, lon, location_name, 'metric'))
+        weather = run_async(weather_service.get_current_weather(lat, lon, location_name, 'metric'))
         if not weather:
-            loop.close()
             return jsonify({'error': 'Could not compute prediction for your location - weather data unavailable'}), 502
         
         # Step 4: Generate AI predictions
@@ -324,8 +331,7 @@ def analyze_location():
         predictions = ai_prediction_service.predict_disaster_risks(weather_dict)
         
         # Step 5: Get weather forecast
-        forecast = loop.run_until_complete(weather_service.get_weather_forecast(lat, lon, 5, 'metric'))
-        loop.close()
+        forecast = run_async(weather_service.get_weather_forecast(lat, lon, 5, 'metric'))
         
         # Step 6: Compile comprehensive analysis
         analysis = {
@@ -435,10 +441,7 @@ def predict_disaster():
     
     try:
         # Fetch weather data for the location
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        weather = loop.run_until_complete(weather_service.get_current_weather(lat, lon, location_name))
-        loop.close()
+        weather = run_async(weather_service.get_current_weather(lat, lon, location_name))
         
         if not weather:
             return jsonify({'error': 'Failed to fetch weather data'}), 500
@@ -565,10 +568,7 @@ def create_event():
 def get_weather_data():
     """Get weather data for monitored locations"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        weather_data = loop.run_until_complete(weather_service.get_multiple_locations_weather(MONITORED_LOCATIONS))
-        loop.close()
+        weather_data = run_async(weather_service.get_multiple_locations_weather(MONITORED_LOCATIONS))
         
         return jsonify([weather.to_dict() for weather in weather_data])
     except Exception as e:
@@ -587,10 +587,7 @@ def get_current_weather():
         return jsonify({'error': 'Latitude and longitude required'}), 400
     
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        weather = loop.run_until_complete(weather_service.get_current_weather(lat, lon, name, units))
-        loop.close()
+        weather = run_async(weather_service.get_current_weather(lat, lon, name, units))
         
         if not weather:
             return jsonify({'error': 'Failed to fetch weather data'}), 500
@@ -610,12 +607,9 @@ def get_weather_by_city():
         return jsonify({'error': 'Query parameter required'}), 400
     
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
         # Fetch multiple candidates to improve worldwide matching
-        results = loop.run_until_complete(weather_service.geocode(query, limit=5))
+        results = run_async(weather_service.geocode(query, limit=5))
         if not results:
-            loop.close()
             return jsonify({'error': 'No results for query'}), 404
 
         # Choose the best candidate: prefer exact (case-insensitive) name match, else first
@@ -641,8 +635,7 @@ def get_weather_by_city():
         lat = best['lat']
         lon = best['lon']
         name = f"{best.get('name')}{', ' + best.get('state') if best.get('state') else ''}{' ' + best.get('country') if best.get('country') else ''}".strip()
-        weather = loop.run_until_complete(weather_service.get_current_weather(lat, lon, name, units))
-        loop.close()
+        weather = run_async(weather_service.get_current_weather(lat, lon, name, units))
         if not weather:
             return jsonify({'error': 'Failed to fetch weather'}), 502
         return jsonify(weather.to_dict())
@@ -662,12 +655,13 @@ def get_weather_forecast():
         return jsonify({'error': 'Latitude and longitude required'}), 400
     
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        forecast = loop.run_until_complete(weather_service.get_weather_forecast(lat, lon, days, units))
-        loop.close()
-        
-        return jsonify(forecast)
+        forecast = run_async(weather_service.get_weather_forecast(lat, lon, days, units))
+        # The forecast is for the centroid of the coordinates' cache cell
+        cell = weather_service.weather_cell(lat, lon)
+        response = jsonify(forecast)
+        response.headers['X-Weather-Cell'] = cell.id
+        response.headers['X-Weather-Cell-Centroid'] = f"{cell.lat},{cell.lon}"
+        return response
     except Exception as e:
         logger.error(f"Error fetching forecast: {e}")
         return jsonify({'error': 'Failed to fetch forecast'}), 500
@@ -681,10 +675,7 @@ def get_weather_for_location(location: str):
         
         if monitored:
             coords = monitored['coords']
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            weather = loop.run_until_complete(weather_service.get_current_weather(coords['lat'], coords['lng'], monitored['name']))
-            loop.close()
+            weather = run_async(weather_service.get_current_weather(coords['lat'], coords['lng'], monitored['name']))
             
             if weather:
                 return jsonify(weather.to_dict())
@@ -698,10 +689,7 @@ def get_weather_for_location(location: str):
 def get_disasters():
     """Get FEMA disaster declarations"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        disasters = loop.run_until_complete(openfema_service.get_disaster_declarations())
-        loop.close()
+        disasters = run_async(openfema_service.get_disaster_declarations())
         
         if disasters:
             fema_disasters.clear()
@@ -717,10 +705,7 @@ def get_disasters():
 def get_disasters_by_state(state_code: str):
     """Get FEMA disaster declarations for a specific state"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        disasters = loop.run_until_complete(openfema_service.get_disasters_by_state(state_code))
-        loop.close()
+        disasters = run_async(openfema_service.get_disasters_by_state(state_code))
         
         return jsonify(disasters)
     except Exception as e:
@@ -731,10 +716,7 @@ def get_disasters_by_state(state_code: str):
 def get_eonet_events():
     """Get NASA EONET events"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        events = loop.run_until_complete(eonet_service.get_eonet_events())
-        loop.close()
+        events = run_async(eonet_service.get_eonet_events())
         
         if events:
             eonet_events.clear()
@@ -750,10 +732,7 @@ def get_eonet_events():
 def get_eonet_by_category(category: str):
     """Get NASA EONET events by category"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        events = loop.run_until_complete(eonet_service.get_events_by_category(category))
-        loop.close()
+        events = run_async(eonet_service.get_events_by_category(category))
         
         return jsonify(events)
     except Exception as e:
@@ -767,11 +746,8 @@ def test_location():
     query = request.args.get('query', 'New York')
     
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         # Test geocoding
-        geocode_results = loop.run_until_complete(weather_service.geocode(query, limit=3))
+        geocode_results = run_async(weather_service.geocode(query, limit=3))
         
         # Test weather if geocoding succeeds
         weather_data = None
@@ -779,9 +755,7 @@ def test_location():
             best = geocode_results[0]
             lat = best['lat']
             lon = best['lon']
-            weather_data = loop.run_until_complete(weather_service.get_current_weather(lat, lon, query))
-        
-        loop.close()
+            weather_data = run_async(weather_service.get_current_weather(lat, lon, query))
         
         return jsonify({
             'query': query,
@@ -805,10 +779,9 @@ def background_weather_update():
     """Background task to update weather data every 5 minutes"""
     while True:
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            weather_data = loop.run_until_complete(weather_service.get_multiple_locations_weather(MONITORED_LOCATIONS))
-            loop.close()
+            weather_data = run_async(
+                weather_service.get_multiple_locations_weather(MONITORED_LOCATIONS), timeout=BACKGROUND_FETCH_TIMEOUT
+            )
             
             if weather_data:
                 weather_data_cache.clear()
@@ -824,10 +797,7 @@ def background_disaster_update():
     """Background task to update disaster data every 30 minutes"""
     while True:
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            disasters = loop.run_until_complete(openfema_service.get_disaster_declarations())
-            loop.close()
+            disasters = run_async(openfema_service.get_disaster_declarations(), timeout=BACKGROUND_FETCH_TIMEOUT)
             
             if disasters:
                 fema_disasters.clear()
@@ -843,10 +813,7 @@ def background_eonet_update():
     """Background task to update EONET data every 15 minutes"""
     while True:
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            events = loop.run_until_complete(eonet_service.get_eonet_events())
-            loop.close()
+            events = run_async(eonet_service.get_eonet_events(), timeout=BACKGROUND_FETCH_TIMEOUT)
             
             if events:
                 eonet_events.clear()
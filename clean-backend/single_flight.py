@@ -0,0 +1,71 @@
+"""Single-flight coalescing of identical concurrent async calls.
+
+When many requests miss the cache for the same key at once (a trending city),
+only the first one starts the upstream fetch; the others await the same task and
+share its result, so the provider sees one request instead of dozens.
+"""
+import asyncio
+import threading
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class _Flight:
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Runs at most one call per key and event loop at a time; concurrent callers share its result"""
+
+    def __init__(self):
+        self._flights: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], _Flight] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn() for key, or the call already in flight for it.
+        A cancelled caller does not cancel the shared call while others still await it."""
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            flight = self._flights.get(flight_key)
+            if flight is None:
+                flight = self._flights[flight_key] = _Flight(loop.create_task(fn()))
+                flight.task.add_done_callback(partial(self._finished, flight_key))
+                self.executions += 1
+            else:
+                self.coalesced += 1
+            flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            with self._lock:
+                flight.waiters -= 1
+
+    def _finished(self, flight_key: Tuple[asyncio.AbstractEventLoop, Hashable], task: asyncio.Task):
+        with self._lock:
+            if self._flights.get(flight_key) is not None and self._flights[flight_key].task is task:
+                del self._flights[flight_key]
+        # Mark the outcome as retrieved even if every caller gave up waiting
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> Dict[str, int]:
+        """Callers currently waiting, per key with a call in flight"""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for (_, key), flight in self._flights.items():
+                counts[str(key)] = counts.get(str(key), 0) + flight.waiters
+            return counts
+
+    def stats(self) -> Dict[str, Any]:
+        in_flight = self.in_flight()
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': in_flight,
+            }
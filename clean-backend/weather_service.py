@@ -1,15 +1,27 @@
 import os
 import asyncio
-import aiohttp
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional, Any
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import time
 
+from geo_cells import CellSnapper, GeoCell
+from http_session import http_sessions
+from single_flight import SingleFlight
+from ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Provider response caches: entry bound and time to live (s) for current weather, forecasts and geocoding
+WEATHER_CACHE_SIZE: int = int(os.getenv('WEATHER_CACHE_SIZE', '1024'))
+WEATHER_CACHE_TTL: float = float(os.getenv('WEATHER_CACHE_TTL', '300'))
+FORECAST_CACHE_SIZE: int = int(os.getenv('FORECAST_CACHE_SIZE', '256'))
+FORECAST_CACHE_TTL: float = float(os.getenv('FORECAST_CACHE_TTL', '1800'))
+GEOCODE_CACHE_SIZE: int = int(os.getenv('GEOCODE_CACHE_SIZE', '1024'))
+GEOCODE_CACHE_TTL: float = float(os.getenv('GEOCODE_CACHE_TTL', '86400'))
+
 @dataclass
 class WeatherData:
     """Weather data structure"""
@@ -26,6 +38,8 @@ class WeatherData:
     weather_condition: str
     timestamp: datetime
     forecast_data: List[Dict[str, Any]] = None
+    # Cache cell the weather was fetched for: its id and centroid ('lat', 'lng')
+    cell: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -42,6 +56,7 @@ class WeatherData:
             'weather_condition': self.weather_condition,
             'timestamp': self.timestamp.isoformat(),
             'forecast_data': self.forecast_data or [],
+            'cell': self.cell,
         }
 
 class WeatherService:
@@ -50,37 +65,61 @@ class WeatherService:
     def __init__(self):
         self.api_key = os.getenv('OPENWEATHER_API_KEY', 'your-api-key-here')
         self.base_url = "https://api.openweathermap.org/data/2.5"
-        self.session = None
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.cache_duration = 300  # 5 minutes
+        self.cache = TTLCache(WEATHER_CACHE_SIZE, WEATHER_CACHE_TTL, name='weather')
+        self.forecast_cache = TTLCache(FORECAST_CACHE_SIZE, FORECAST_CACHE_TTL, name='forecast')
+        self.geocode_cache = TTLCache(GEOCODE_CACHE_SIZE, GEOCODE_CACHE_TTL, name='geocode')
+        # Concurrent cache misses for the same lookup share one upstream fetch
+        self.inflight = SingleFlight()
+        # Nearby coordinates share a cache cell and are fetched at its centroid
+        self.cells = CellSnapper()
 
     async def initialize(self):
-        """Deprecated: no-op (we now use per-call ClientSession to avoid cross-loop issues)."""
-        return
+        """Open the running loop's pooled HTTP session (also opened on first request)."""
+        await http_sessions.get()
 
     async def close(self):
-        """Deprecated: no-op (per-call sessions are context-managed)."""
-        return
+        """Close the running loop's pooled HTTP session and its keep-alive connections."""
+        await http_sessions.close()
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss/eviction counters of the provider response caches"""
+        return {cache.name: cache.stats() for cache in (self.cache, self.forecast_cache, self.geocode_cache)}
 
-    def _is_cache_valid(self, location: str) -> bool:
-        """Check if cached data is still valid"""
-        if location not in self.cache:
-            return False
+    def inflight_stats(self) -> Dict[str, Any]:
+        """Coalesced provider lookups and the callers waiting per in-flight key"""
+        return self.inflight.stats()
 
-        cache_time = self.cache[location]['timestamp']
-        return (datetime.utcnow() - cache_time).seconds < self.cache_duration
+    def weather_cell(self, lat: float, lon: float) -> GeoCell:
+        """Cache cell whose centroid weather lookups for these coordinates are served from"""
+        return self.cells.snap(lat, lon)
+
+    @staticmethod
+    def _for_caller(weather: Optional[WeatherData], lat: float, lon: float,
+                    location_name: Optional[str]) -> Optional[WeatherData]:
+        """Cell weather labelled with the caller's location and coordinates (the centroid stays in cell)"""
+        if not isinstance(weather, WeatherData):
+            return weather
+        return replace(weather, location=location_name or f"{lat}, {lon}", coordinates={'lat': lat, 'lng': lon})
 
     async def get_current_weather(self, lat: float, lon: float, location_name: str = None, units: str = 'metric') -> Optional[WeatherData]:
-        """Get current weather data for a location with OpenWeather first, then Open‑Meteo fallback."""
+        """Get current weather data for a location, from the cache or one shared upstream fetch for its cell."""
+        cell = self.weather_cell(lat, lon)
+        cache_key = f"{cell.id}_{units}"
+        weather = self.cache.get(cache_key)
+        if weather is not None:
+            logger.info(f"Using cached weather data for {location_name or cache_key}")
+        else:
+            weather = await self.inflight.do(
+                f"weather:{cache_key}", lambda: self._fetch_current_weather(cell, units, cache_key)
+            )
+        return self._for_caller(weather, lat, lon, location_name)
+
+    async def _fetch_current_weather(self, cell: GeoCell, units: str, cache_key: str) -> Optional[WeatherData]:
+        """Fetch current weather at the cell centroid with OpenWeather first, then Open‑Meteo fallback, and cache it."""
+        lat, lon, location_name = cell.lat, cell.lon, None
         try:
             await self.initialize()
 
-            # Check cache first
-            cache_key = f"{lat}_{lon}_{units}"
-            if self._is_cache_valid(cache_key):
-                logger.info(f"Using cached weather data for {location_name or cache_key}")
-                return self.cache[cache_key]['data']
-
             weather_data: Optional[WeatherData] = None
 
             # Primary source: OpenWeather (if API key present)
@@ -93,7 +132,7 @@ class WeatherService:
                     'units': units  # 'metric', 'imperial', or 'standard'
                 }
                 try:
-                    async with aiohttp.ClientSession() as session:
+                    async with http_sessions.session() as session:
                         async with session.get(url, params=params) as response:
                             if response.status == 200:
                                 data = await response.json()
@@ -113,10 +152,8 @@ class WeatherService:
                                 )
                                 
                                 # Cache the data
-                                self.cache[cache_key] = {
-                                    'data': weather_data,
-                                    'timestamp': datetime.utcnow()
-                                }
+                                weather_data.cell = cell.to_dict()
+                                self.cache.put(cache_key, weather_data)
                                 
                                 logger.info(f"Successfully fetched weather data from OpenWeather for {location_name or cache_key}")
                                 return weather_data
@@ -131,10 +168,8 @@ class WeatherService:
             
             if weather_data:
                 # Cache the fallback data
-                self.cache[cache_key] = {
-                    'data': weather_data,
-                    'timestamp': datetime.utcnow()
-                }
+                weather_data.cell = cell.to_dict()
+                self.cache.put(cache_key, weather_data)
                 logger.info(f"Successfully fetched weather data from Open‑Meteo for {location_name or cache_key}")
                 return weather_data
             
@@ -146,6 +181,20 @@ class WeatherService:
             return None
 
     async def geocode(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Geocode a location query to get coordinates; non-empty results are cached"""
+        cache_key = f"{query.strip().lower()}_{limit}"
+        cached = self.geocode_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        return await self.inflight.do(f"geocode:{cache_key}", lambda: self._geocode_and_cache(query, limit, cache_key))
+
+    async def _geocode_and_cache(self, query: str, limit: int, cache_key: str) -> List[Dict[str, Any]]:
+        results = await self._geocode_uncached(query, limit)
+        if results:
+            self.geocode_cache.put(cache_key, results)
+        return results
+
+    async def _geocode_uncached(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Geocode a location query to get coordinates. Tries multiple services."""
         try:
             await self.initialize()
@@ -192,7 +241,7 @@ class WeatherService:
             headers = {
                 'User-Agent': 'DisastroScope/1.0 (contact: support@disastroscope.local)'
             }
-            async with aiohttp.ClientSession() as session:
+            async with http_sessions.session() as session:
                 async with session.get(url, params=params, headers=headers) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -228,7 +277,7 @@ class WeatherService:
                 "language": "en",
                 "format": "json",
             }
-            async with aiohttp.ClientSession() as session:
+            async with http_sessions.session() as session:
                 async with session.get(url, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -270,7 +319,7 @@ class WeatherService:
                 "timezone": "auto",
             }
             url = "https://api.open-meteo.com/v1/forecast"
-            async with aiohttp.ClientSession() as session:
+            async with http_sessions.session() as session:
                 async with session.get(url, params=params) as response:
                     if response.status != 200:
                         logger.error(f"Open-Meteo current weather failed: status={response.status}")
@@ -333,7 +382,7 @@ class WeatherService:
                 "timezone": "auto",
             }
             url = "https://api.open-meteo.com/v1/forecast"
-            async with aiohttp.ClientSession() as session:
+            async with http_sessions.session() as session:
                 async with session.get(url, params=params) as response:
                     if response.status != 200:
                         logger.error(f"Open-Meteo forecast failed: status={response.status}")
@@ -363,6 +412,24 @@ class WeatherService:
             return []
 
     async def get_weather_forecast(self, lat: float, lon: float, days: int = 5, units: str = 'metric') -> List[Dict[str, Any]]:
+        """Get weather forecast for a location's cell (fetched at its centroid); non-empty forecasts are cached"""
+        cell = self.weather_cell(lat, lon)
+        cache_key = f"{cell.id}_{days}_{units}"
+        cached = self.forecast_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        return await self.inflight.do(
+            f"forecast:{cache_key}", lambda: self._fetch_and_cache_forecast(cell.lat, cell.lon, days, units, cache_key)
+        )
+
+    async def _fetch_and_cache_forecast(self, lat: float, lon: float, days: int, units: str,
+                                        cache_key: str) -> List[Dict[str, Any]]:
+        forecast = await self._fetch_forecast(lat, lon, days, units)
+        if forecast:
+            self.forecast_cache.put(cache_key, forecast)
+        return forecast
+
+    async def _fetch_forecast(self, lat: float, lon: float, days: int = 5, units: str = 'metric') -> List[Dict[str, Any]]:
         """Get weather forecast for a location. Falls back to Open‑Meteo if OpenWeather fails or API key is missing."""
         try:
             await self.initialize()
@@ -378,7 +445,7 @@ class WeatherService:
                     'cnt': days * 8  # 8 forecasts per day (3-hour intervals)
                 }
                 try:
-                    async with aiohttp.ClientSession() as session:
+                    async with http_sessions.session() as session:
                         async with session.get(url, params=params) as response:
                             if response.status == 200:
                                 data = await response.json()
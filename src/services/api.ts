@@ -102,15 +102,36 @@ export interface Stats {
   last_updated: string;
 }
 
+export interface HazardUncertainty {
+  mean: number;
+  std: number;
+  lower: number;
+  upper: number;
+  confidence: number;
+}
+
 export interface AIPrediction {
   location: string;
   coordinates: { lat: number; lng: number };
   weather_data: any;
   predictions: { [key: string]: number };
   summaries?: { [key: string]: string };
+  // null for hazards served by the rule-based fallback or screened out by the cascade
+  uncertainty?: { [key: string]: HazardUncertainty | null };
   timestamp: string;
 }
 
+export interface RiskGrid {
+  bbox: [number, number, number, number];
+  resolution: number;
+  shape: [number, number];
+  origin: { lat: number; lng: number };
+  missing: number;
+  timestamp: string;
+  // Row-major risks per hazard, rows south to north; NaN where weather was unavailable
+  hazards: { [key: string]: Float32Array };
+}
+
 export interface GlobalRiskAnalysis {
   location: {
     query?: string;
@@ -471,7 +492,7 @@ class ApiService {
   }
 
   // AI Prediction Methods
-  async predictDisaster(lat: number, lon: number, locationName?: string): Promise<AIPrediction | null> {
+  async predictDisaster(lat: number, lon: number, locationName?: string, uncertainty?: boolean): Promise<AIPrediction | null> {
     try {
       const response = await fetch(`${API_BASE_URL}/api/ai/predict`, {
         method: 'POST',
@@ -481,7 +502,8 @@ class ApiService {
         body: JSON.stringify({
           latitude: lat,
           longitude: lon,
-          location_name: locationName
+          location_name: locationName,
+          uncertainty
         }),
       });
       if (!response.ok) throw new Error('Failed to get AI prediction');
@@ -534,6 +556,31 @@ class ApiService {
     }
   }
 
+  // Risk raster for a bounding box: one request instead of one prediction per map point
+  async getRiskGrid(
+    bbox: [number, number, number, number],
+    resolution: number = 0.5,
+    hazards?: string[]
+  ): Promise<RiskGrid | null> {
+    try {
+      const params = new URLSearchParams({ bbox: bbox.join(','), resolution: String(resolution) });
+      if (hazards && hazards.length) params.set('hazards', hazards.join(','));
+      const response = await fetch(`${API_BASE_URL}/api/risk/grid?${params.toString()}`);
+      if (!response.ok) throw new Error('Failed to fetch risk grid');
+      const data = await response.json();
+      const layers: { [key: string]: Float32Array } = {};
+      for (const [hazard, encoded] of Object.entries<string>(data.hazards || {})) {
+        // Little-endian float32 bytes, base64 encoded
+        const bytes = Uint8Array.from(atob(encoded), c => c.charCodeAt(0));
+        layers[hazard] = new Float32Array(bytes.buffer);
+      }
+      return { ...data, hazards: layers };
+    } catch (error) {
+      console.error('Error fetching risk grid:', error);
+      return null;
+    }
+  }
+
   // NEW: Get model registry (for transparency: version, type, metrics placeholder)
   async getModels(): Promise<any> {
     try {
@@ -566,7 +613,8 @@ class ApiService {
           'Content-Type': 'application/json',
         },
       });
-      if (!response.ok) throw new Error('Failed to train models');
+      // Training runs as a background job; 409 means a job is already running
+      if (!response.ok && response.status !== 409) throw new Error('Failed to train models');
       return true;
     } catch (error) {
       console.error('Error training models:', error);